@@ -0,0 +1,355 @@
+""" Compact binary encoding of view payloads and :class:`frameapp.structures.CompactSerializable` objects.
+
+The format is meant for service-to-service calls and is built with the standard library only.
+A payload starts with the ``FAB\\x01`` header followed by a single value. Every value is a one-byte tag
+followed by its data; numbers are fixed-size little-endian, and strings, bytes and containers are prefixed with
+their length:
+
+===========  =====================================================================
+ Tag          Data
+===========  =====================================================================
+ None         -
+ False        -
+ True         -
+ int          8 bytes, signed; larger integers are tagged as BIGINT and length-prefixed
+ float        8 bytes, IEEE 754 double
+ str          u32 length, UTF-8 bytes
+ bytes        u32 length, bytes
+ list         u32 number of items, items (tuples and sets are encoded as lists)
+ dict         u32 number of pairs, keys and values
+ datetime     ISO 8601 string without the str tag; same for date and Decimal
+ object       u32 schema fingerprint, values of ``__slots__`` in their order
+===========  =====================================================================
+
+Objects are encoded from raw values of their slots, output modifiers are not applied.
+The schema fingerprint covers the class name, slot names and their annotated types, so that a decoder with
+a different version of the class rejects the payload instead of misinterpreting it. Everything else is converted
+the same way the JSON encoder does (enums, sum type variants, named tuples etc.).
+"""
+import struct
+import zlib
+from datetime import datetime, date
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, Callable, List, FrozenSet
+
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .configurator.renderers import ExtendedDjangoJSONEncoder
+from .structures import CompactSerializable
+
+
+CONTENT_TYPE = 'application/vnd.frameapp.compact'
+
+HEADER = b'FAB\x01'
+
+NONE = 0x00
+FALSE = 0x01
+TRUE = 0x02
+INT = 0x03
+BIGINT = 0x04
+FLOAT = 0x05
+STR = 0x06
+BYTES = 0x07
+LIST = 0x08
+DICT = 0x09
+DATETIME = 0x0A
+DATE = 0x0B
+DECIMAL = 0x0C
+OBJECT = 0x0D
+
+_tag_length = struct.Struct('<BI')
+_tag_int = struct.Struct('<Bq')
+_tag_float = struct.Struct('<Bd')
+_length = struct.Struct('<I')
+_int = struct.Struct('<q')
+_float = struct.Struct('<d')
+
+MIN_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+
+
+class CodecError(ValueError):
+    """ Raised when a payload cannot be decoded.
+    """
+
+
+def schema_fingerprint(cls: Type[CompactSerializable]) -> int:
+    annotations = {}
+    for klass in reversed(cls.__mro__):
+        annotations.update(getattr(klass, '__annotations__', {}))
+    schema = ','.join(f'{field}:{annotations.get(field, "")}' for field in cls.__slots__)
+    return zlib.crc32(f'{cls.__module__}.{cls.__qualname__}({schema})'.encode('utf-8'))
+
+
+class CompactEncoder:
+    def __init__(self) -> None:
+        self.default = ExtendedDjangoJSONEncoder().default
+        self.writers: Dict[type, Callable[[Any, List[bytes]], None]] = {
+            type(None): self.write_none,
+            bool: self.write_bool,
+            int: self.write_int,
+            float: self.write_float,
+            str: self.write_str,
+            bytes: self.write_bytes,
+            list: self.write_list,
+            tuple: self.write_list,
+            set: self.write_list,
+            frozenset: self.write_list,
+            dict: self.write_dict,
+            datetime: self.write_datetime,
+            date: self.write_date,
+            Decimal: self.write_decimal,
+        }
+
+    def encode(self, value: Any) -> bytes:
+        buf = [HEADER]
+        self.write(value, buf)
+        return b''.join(buf)
+
+    def write(self, value: Any, buf: List[bytes]) -> None:
+        try:
+            writer = self.writers[type(value)]
+        except KeyError:
+            writer = self.writer_for(type(value))
+        writer(value, buf)
+
+    def writer_for(self, cls: type) -> Callable[[Any, List[bytes]], None]:
+        if issubclass(cls, CompactSerializable):
+            writer = self.object_writer(cls)
+        elif issubclass(cls, Enum):
+            writer = self.write_converted
+        else:
+            # subclasses of builtin types (named tuples, SafeText etc.) are encoded as their bases
+            for base in (datetime, date, str, bytes, int, float, dict, list, tuple, set, frozenset):
+                if issubclass(cls, base):
+                    writer = self.writers[base]
+                    break
+            else:
+                writer = self.write_converted
+        self.writers[cls] = writer
+        return writer
+
+    def object_writer(self, cls: Type[CompactSerializable]) -> Callable[[Any, List[bytes]], None]:
+        prefix = _tag_length.pack(OBJECT, schema_fingerprint(cls))
+        fields = cls.__slots__
+        write = self.write
+
+        def write_object(value: CompactSerializable, buf: List[bytes]) -> None:
+            buf.append(prefix)
+            for field in fields:
+                write(getattr(value, field), buf)
+        return write_object
+
+    def write_converted(self, value: Any, buf: List[bytes]) -> None:
+        converted = self.default(value)
+        if converted is value:
+            raise TypeError(f'Object of type {value.__class__.__name__} cannot be encoded')
+        self.write(converted, buf)
+
+    @staticmethod
+    def write_none(value: None, buf: List[bytes]) -> None:
+        buf.append(b'\x00')
+
+    @staticmethod
+    def write_bool(value: bool, buf: List[bytes]) -> None:
+        buf.append(b'\x02' if value else b'\x01')
+
+    @staticmethod
+    def write_int(value: int, buf: List[bytes]) -> None:
+        if MIN_INT <= value <= MAX_INT:
+            buf.append(_tag_int.pack(INT, value))
+        else:
+            data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+            buf.append(_tag_length.pack(BIGINT, len(data)))
+            buf.append(data)
+
+    @staticmethod
+    def write_float(value: float, buf: List[bytes]) -> None:
+        buf.append(_tag_float.pack(FLOAT, value))
+
+    @staticmethod
+    def write_str(value: str, buf: List[bytes], tag: int = STR) -> None:
+        data = value.encode('utf-8')
+        buf.append(_tag_length.pack(tag, len(data)))
+        buf.append(data)
+
+    @staticmethod
+    def write_bytes(value: bytes, buf: List[bytes]) -> None:
+        buf.append(_tag_length.pack(BYTES, len(value)))
+        buf.append(value)
+
+    def write_list(self, value: Iterable[Any], buf: List[bytes]) -> None:
+        if not isinstance(value, (list, tuple)):
+            value = list(value)
+        buf.append(_tag_length.pack(LIST, len(value)))
+        write = self.write
+        for item in value:
+            write(item, buf)
+
+    def write_dict(self, value: Dict[Any, Any], buf: List[bytes]) -> None:
+        buf.append(_tag_length.pack(DICT, len(value)))
+        write = self.write
+        for k, v in value.items():
+            write(k, buf)
+            write(v, buf)
+
+    def write_datetime(self, value: datetime, buf: List[bytes]) -> None:
+        self.write_str(value.isoformat(), buf, DATETIME)
+
+    def write_date(self, value: date, buf: List[bytes]) -> None:
+        self.write_str(value.isoformat(), buf, DATE)
+
+    def write_decimal(self, value: Decimal, buf: List[bytes]) -> None:
+        self.write_str(str(value), buf, DECIMAL)
+
+
+class CompactDecoder:
+    def __init__(self, classes: Optional[Iterable[Type[CompactSerializable]]] = None) -> None:
+        """
+        :param classes: classes of objects that may be present in payloads.
+                        Defaults to all currently defined subclasses of CompactSerializable.
+        """
+        if classes is None:
+            classes = all_subclasses(CompactSerializable)
+        self.classes: Dict[int, Tuple[Type[CompactSerializable], Tuple[str, ...]]] = {
+            schema_fingerprint(cls): (cls, cls.__slots__) for cls in classes
+        }
+
+    def decode(self, data: bytes) -> Any:
+        if data[:len(HEADER)] != HEADER:
+            raise CodecError('Not a compact payload or unsupported version of the format')
+        try:
+            value, pos = self.read(memoryview(data), len(HEADER))
+        except CodecError:
+            raise
+        except RecursionError:
+            raise CodecError('Compact payload is nested too deeply')
+        except (struct.error, IndexError, ValueError, ArithmeticError, TypeError) as e:
+            # TypeError: unhashable dict keys, ArithmeticError: malformed decimals
+            raise CodecError(f'Malformed compact payload: {e}')
+        if pos != len(data):
+            raise CodecError(f'Unexpected trailing data at position {pos}')
+        return value
+
+    def read(self, data: memoryview, pos: int) -> Tuple[Any, int]:
+        tag = data[pos]
+        pos += 1
+        if tag == INT:
+            return _int.unpack_from(data, pos)[0], pos + 8
+        if tag == STR:
+            n = _length.unpack_from(data, pos)[0]
+            pos += 4
+            if pos + n > len(data):
+                raise CodecError(f'Unexpected end of payload at position {pos}')
+            return str(data[pos:pos + n], 'utf-8'), pos + n
+        if tag == OBJECT:
+            return self.read_object(data, pos)
+        if tag == NONE:
+            return None, pos
+        if tag == TRUE:
+            return True, pos
+        if tag == FALSE:
+            return False, pos
+        if tag == FLOAT:
+            return _float.unpack_from(data, pos)[0], pos + 8
+        if tag == LIST:
+            n = _length.unpack_from(data, pos)[0]
+            pos += 4
+            rv = []
+            read = self.read
+            for _ in range(n):
+                item, pos = read(data, pos)
+                rv.append(item)
+            return rv, pos
+        if tag == DICT:
+            n = _length.unpack_from(data, pos)[0]
+            pos += 4
+            rv = {}
+            read = self.read
+            for _ in range(n):
+                k, pos = read(data, pos)
+                rv[k], pos = read(data, pos)
+            return rv, pos
+        if tag in (BYTES, BIGINT, DATETIME, DATE, DECIMAL):
+            n = _length.unpack_from(data, pos)[0]
+            pos += 4
+            chunk = data[pos:pos + n]
+            if len(chunk) != n:
+                raise CodecError(f'Unexpected end of payload at position {pos}')
+            pos += n
+            if tag == BYTES:
+                return bytes(chunk), pos
+            if tag == BIGINT:
+                return int.from_bytes(chunk, 'little', signed=True), pos
+            text = str(chunk, 'utf-8')
+            if tag == DATETIME:
+                return parse_iso_value(parse_datetime, text), pos
+            if tag == DATE:
+                return parse_iso_value(parse_date, text), pos
+            return Decimal(text), pos
+        raise CodecError(f'Unknown tag {tag:#x} at position {pos - 1}')
+
+    def read_object(self, data: memoryview, pos: int) -> Tuple[CompactSerializable, int]:
+        fingerprint = _length.unpack_from(data, pos)[0]
+        pos += 4
+        try:
+            cls, fields = self.classes[fingerprint]
+        except KeyError:
+            raise CodecError(f'Unknown object schema {fingerprint:#010x} at position {pos - 5}')
+        obj = cls.__new__(cls)
+        read = self.read
+        for field in fields:
+            value, pos = read(data, pos)
+            setattr(obj, field, value)
+        return obj, pos
+
+
+def parse_iso_value(parse: Callable[[str], Any], text: str) -> Any:
+    value = parse(text)
+    if value is None:
+        raise CodecError(f'Malformed ISO 8601 value: {text}')
+    return value
+
+
+def all_subclasses(cls: type) -> List[type]:
+    rv = []
+    for subclass in cls.__subclasses__():
+        rv.append(subclass)
+        rv.extend(all_subclasses(subclass))
+    return rv
+
+
+_encoder = CompactEncoder()
+
+
+def encode_compact(value: Any) -> bytes:
+    return _encoder.encode(value)
+
+
+_default_decoder: Optional[CompactDecoder] = None
+_default_decoder_generation = -1
+
+
+def get_decoder(classes: Optional[Iterable[Type[CompactSerializable]]] = None) -> CompactDecoder:
+    """ Returns a shared decoder of the classes. The decoder of all subclasses of CompactSerializable
+    is rebuilt when new subclasses are defined.
+    """
+    global _default_decoder, _default_decoder_generation
+    if classes is not None:
+        return _decoder_of(frozenset(classes))
+    generation = CompactSerializable.SUBCLASSES_GENERATION
+    if _default_decoder is None or _default_decoder_generation != generation:
+        _default_decoder = CompactDecoder()
+        _default_decoder_generation = generation
+    return _default_decoder
+
+
+@lru_cache(maxsize=64)
+def _decoder_of(classes: FrozenSet[Type[CompactSerializable]]) -> CompactDecoder:
+    return CompactDecoder(classes)
+
+
+def decode_compact(data: bytes, classes: Optional[Iterable[Type[CompactSerializable]]] = None) -> Any:
+    return get_decoder(classes).decode(data)
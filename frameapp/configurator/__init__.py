@@ -15,6 +15,8 @@ from ..exceptions import ConfigurationError
 from ..path import caller_package
 
 from .routes import RoutesConfigurator
+from .patterns import compile_url_template
+from .lint import check_routes
 from .views import ViewsConfigurator
 from .renderers import RenderersConfigurator
 from .sums import SumTypesConfigurator
@@ -87,7 +89,11 @@ class Configurator:
         self.routes.change_namespace(old_namespace)
         self.routes.change_route_prefix(old_route_prefix)
 
-    def scan(self, package=None, categories=None, onerror=None, ignore=None, namespace=None):
+    def scan(self, package=None, categories=None, onerror=None, ignore=None, namespace=None, lint=None):
+        """
+        :param lint: either 'warn' or 'fail', enables analysis of route patterns,
+                     see :mod:`frameapp.configurator.lint`
+        """
         if package is None:
             package = caller_package()
 
@@ -105,14 +111,33 @@ class Configurator:
         self._log_caption('Consistency check')
         self.routes.check_routes_consistency(namespace)
         self.sums.check_sum_types_consistency(namespace)
+        if lint:
+            self._log_caption('Route patterns analysis')
+            check_routes(namespace, self.routes.registry[namespace], lint)
 
         self.routes.change_namespace(previous_namespace)
         self._log_caption(f'End scanning {package}')
 
     def freeze(self) -> registry.AppRegistry:
-        self.registry = registry.AppRegistry(*self._registry.as_dict())
+        url_templates = {
+            namespace: {
+                route_name: compile_url_template(route.pattern, route.rules)
+                for route_name, route in routes.items()
+            }
+            for namespace, routes in self.routes.registry.items()
+        }
+        self.registry = registry.AppRegistry(routes=self.routes.registry,
+                                             sums=self.sums.registry,
+                                             url_templates=url_templates)
         return self.registry
 
+    def url_for(self, namespace: str, route_name: str, **kwargs) -> str:
+        """ Shortcut for :meth:`frameapp.registry.AppRegistry.url_for` of the frozen registry.
+        """
+        if self.registry is None:
+            raise ConfigurationError('URLs can only be built after the configuration is frozen')
+        return self.registry.url_for(namespace, route_name, **kwargs)
+
     def _log_caption(self, caption) -> None:
         caption = f' {caption} '
         cap_len = len(caption)
@@ -0,0 +1,86 @@
+""" JSON encoding specialized per type.
+
+Most of the payloads are NamedTuples and :class:`frameapp.structures.CompactSerializable` objects with a fixed
+set of fields. For such types a converter into JSON-native containers is resolved the first time the type is seen,
+so that encoding doesn't go through the generic ``default()`` dispatch and ``as_dict()`` argument handling.
+Everything else is still delegated to C-accelerated encoders: building JSON text field by field in Python
+is slower than that.
+
+When `orjson <https://pypi.org/project/orjson/>`_ is installed, :func:`encode_json_bytes` uses it as a backend
+that writes UTF-8 bytes directly (with the same type extensions as the generic encoder), otherwise it falls back
+to the standard library. Note that orjson emits compact JSON with non-ASCII characters left unescaped.
+"""
+from typing import Any, Callable, Dict, Optional
+
+from .renderers import ExtendedDjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+Converter = Callable[[Any], Any]
+
+
+_compiled: Dict[type, Optional[Converter]] = {}
+
+
+def converter_for(cls: type) -> Optional[Converter]:
+    """ Returns a specialized converter of instances of the type into JSON-native containers,
+    or None if the type should be handled by the generic ``default()`` of the encoder.
+    """
+    try:
+        return _compiled[cls]
+    except KeyError:
+        _compiled[cls] = rv = compile_converter(cls)
+        return rv
+
+
+def compile_converter(cls: type) -> Optional[Converter]:
+    from ..structures import CompactSerializable, compile_as_dict
+
+    if issubclass(cls, tuple) and hasattr(cls, '_fields'):
+        # NamedTuples are encoded as arrays, just like the standard library does
+        return list
+    if (issubclass(cls, CompactSerializable)
+            and cls.__json__ is CompactSerializable.__json__
+            and cls.as_dict is CompactSerializable.as_dict):
+        # the same plan that ``as_dict()`` uses for the default set of fields
+        return compile_as_dict(cls, None, frozenset())
+    return None
+
+
+class CompiledJSONEncoder(ExtendedDjangoJSONEncoder):
+    def default(self, o):
+        convert = converter_for(o.__class__)
+        if convert is None:
+            return super().default(o)
+        return convert(o)
+
+
+_stdlib_encode = CompiledJSONEncoder().encode
+
+
+def encode_json_stdlib(payload: Any) -> bytes:
+    return _stdlib_encode(payload).encode('utf-8')
+
+
+_stdlib_default = CompiledJSONEncoder().default
+
+
+def encode_json_orjson(payload: Any) -> bytes:
+    try:
+        return orjson.dumps(payload, default=_stdlib_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:
+        # orjson.JSONEncodeError is a subclass of TypeError.
+        # Integers beyond 64 bits, non-string dict keys etc. are still supported by the standard library
+        return encode_json_stdlib(payload)
+
+
+if orjson is None:
+    JSON_BACKEND = 'stdlib'
+    encode_json_bytes = encode_json_stdlib
+else:
+    JSON_BACKEND = 'orjson'
+    encode_json_bytes = encode_json_orjson
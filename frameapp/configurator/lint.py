@@ -0,0 +1,397 @@
+""" Analysis of route patterns for the lint mode of :meth:`frameapp.configurator.Configurator.scan`.
+
+Placeholder rules are copied verbatim into URL regexes, therefore a rule that backtracks catastrophically
+lets a single crafted URL pin a CPU core. The analysis reports:
+
+* ``nested-quantifier`` (error): an unbounded repetition of a variable-length repetition that can either
+  continue or let the next iteration begin, e.g. ``(\\w+\\s?)+``;
+* ``ambiguous-alternation`` (error): an unbounded repetition of alternatives that may start with the same
+  character, e.g. ``(a|aa)*``;
+* ``invalid-rule`` (error): a rule that is not a valid regex;
+* ``slow-pattern`` (error): a route regex whose matching time of generated adversarial paths exceeds the budget
+  (see :func:`measure_pattern_costs`);
+* ``slash`` (warning): a rule that may match ``/``, so the placeholder may swallow several path segments
+  and the route cannot be indexed by the radix router;
+* ``overlapping-placeholders`` (warning): adjacent placeholders whose boundary is ambiguous,
+  e.g. ``{name}.{ext}`` where the name may contain dots, which makes matching quadratic.
+
+.. code-block:: python
+
+    config.scan('myapp', lint='warn')  # log findings
+    config.scan('myapp', lint='fail')  # raise ConfigurationError on errors, log warnings
+"""
+import logging
+import re
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple, Iterable, FrozenSet, Any
+
+from .patterns import (
+    parse_route_pattern, render_route_pattern, placeholder_rule, can_match_slash, sum_type_rule,
+    Placeholder, Text, EMBEDDED_SUM_TYPE_RE, sre_parse, sre_constants
+)
+from .routes import Route
+from ..exceptions import ConfigurationError
+from ..util import maybe_dotted
+
+
+log = logging.getLogger(__name__)
+
+
+LINT_MODES = frozenset(('warn', 'fail'))
+
+# Characters that adversarial paths are built from
+PROBE_CHARS = frozenset(chr(i) for i in range(32, 127))
+
+# Lengths of pumped placeholder values, and the time a single match may take
+MAX_PROBE_LENGTH = 64
+PROBE_BUDGET = 0.01
+
+REPORT_SIZE = 10
+
+
+class LintFinding(NamedTuple):
+    namespace: str
+    route_name: str
+    kind: str
+    message: str
+    is_error: bool
+
+    def __str__(self) -> str:
+        return f'[{self.kind}] route "{self.route_name}" in the namespace "{self.namespace}": {self.message}'
+
+
+class PatternCost(NamedTuple):
+    namespace: str
+    route_name: str
+    regex: str
+    placeholder: str
+    """ Placeholder whose value was pumped
+    """
+    length: int
+    """ Length of the longest pumped value that was matched within the budget
+    """
+    seconds: float
+    """ Matching time of the last probe
+    """
+    exceeded: bool
+
+
+def check_routes(namespace: str, routes: Dict[str, Route], mode: str) -> List[LintFinding]:
+    """ Lints routes of the namespace, logs findings and the most expensive patterns.
+    In the 'fail' mode raises ConfigurationError if there are errors.
+    """
+    if mode not in LINT_MODES:
+        raise ConfigurationError(f'Unknown lint mode "{mode}", expected one of {sorted(LINT_MODES)}')
+
+    findings = lint_routes(namespace, routes)
+    costs = measure_pattern_costs(namespace, routes)
+    for cost in costs:
+        if cost.exceeded:
+            findings.append(LintFinding(namespace, cost.route_name, 'slow-pattern',
+                                        f'matching "{cost.regex}" with a {cost.length}-character value of '
+                                        f'"{cost.placeholder}" took {cost.seconds * 1000:.1f} ms',
+                                        is_error=True))
+
+    log.debug(f'The most expensive route patterns in the namespace "{namespace}":')
+    for cost in costs[:REPORT_SIZE]:
+        log.debug(f'    {cost.seconds * 1000000:.0f} us, {cost.length} characters of "{cost.placeholder}": '
+                  f'{cost.route_name} {cost.regex}')
+
+    for finding in findings:
+        log.warning(str(finding))
+    errors = [finding for finding in findings if finding.is_error]
+    if mode == 'fail' and errors:
+        raise ConfigurationError('Route patterns failed the lint check:\n' + '\n'.join(str(e) for e in errors))
+    return findings
+
+
+def lint_routes(namespace: str, routes: Dict[str, Route]) -> List[LintFinding]:
+    findings = []
+    for route in routes.values():
+        nodes = parse_route_pattern(route.pattern)
+        for node in nodes:
+            if isinstance(node, Placeholder):
+                findings.extend(lint_rule(namespace, route.name, node, rule_of(node, route.rules)))
+
+        for first, separator, second in adjacent_placeholders(nodes):
+            try:
+                if boundary_is_ambiguous(rule_of(first, route.rules), separator, rule_of(second, route.rules)):
+                    findings.append(LintFinding(namespace, route.name, 'overlapping-placeholders',
+                                                f'the boundary between "{first.source}" and "{second.source}" '
+                                                f'is ambiguous', is_error=False))
+            except (re.error, OverflowError, RecursionError):
+                # reported as invalid rules
+                pass
+    return findings
+
+
+def rule_of(placeholder: Placeholder, rules: Dict[str, Any]) -> str:
+    embedded_sum_type = placeholder.rule is not None and EMBEDDED_SUM_TYPE_RE.match(placeholder.rule)
+    if embedded_sum_type:
+        return sum_type_rule(maybe_dotted(embedded_sum_type.group('sum_type')))
+    return placeholder_rule(placeholder, rules)
+
+
+def lint_rule(namespace: str, route_name: str, placeholder: Placeholder, rule: str) -> List[LintFinding]:
+    try:
+        parsed = sre_parse.parse(rule)
+    except (re.error, OverflowError, RecursionError) as e:
+        return [LintFinding(namespace, route_name, 'invalid-rule', f'"{placeholder.source}": {e}', is_error=True)]
+
+    findings = []
+    for kind, fragment in backtracking_hazards(parsed):
+        findings.append(LintFinding(namespace, route_name, kind, f'"{placeholder.source}": {fragment}', is_error=True))
+    if can_match_slash(rule):
+        findings.append(LintFinding(namespace, route_name, 'slash',
+                                    f'"{placeholder.source}" may match "/"', is_error=False))
+    return findings
+
+
+def adjacent_placeholders(nodes) -> Iterable[Tuple[Placeholder, str, Placeholder]]:
+    """ Yields pairs of placeholders that are not separated by a slash, along with the text between them.
+    """
+    previous = None
+    separator = ''
+    for node in nodes:
+        if isinstance(node, Text):
+            separator += node.value
+            continue
+        if previous is not None and '/' not in separator:
+            yield previous, separator, node
+        previous = node
+        separator = ''
+
+
+def boundary_is_ambiguous(first: str, separator: str, second: str) -> bool:
+    first_chars = match_chars(sre_parse.parse(first))
+    if separator:
+        return separator[0] in first_chars
+    return bool(first_chars & leading_chars(sre_parse.parse(second))[0])
+
+
+# Analysis of parsed regexes
+# --------------------------
+
+def _is_repeat(op) -> bool:
+    c = sre_constants
+    return op in (c.MAX_REPEAT, c.MIN_REPEAT) or op is getattr(c, 'POSSESSIVE_REPEAT', None)
+
+
+def backtracking_hazards(items) -> List[Tuple[str, str]]:
+    c = sre_constants
+    rv = []
+    for op, av in items:
+        if _is_repeat(op):
+            low, high, body = av
+            if high is c.MAXREPEAT and op is not getattr(c, 'POSSESSIVE_REPEAT', None):
+                rv.extend(repetition_hazards(_ungrouped(body)))
+            rv.extend(backtracking_hazards(body))
+        elif op is c.SUBPATTERN:
+            rv.extend(backtracking_hazards(av[-1]))
+        elif op is c.BRANCH:
+            for branch in av[1]:
+                rv.extend(backtracking_hazards(branch))
+        # atomic groups don't backtrack
+    return rv
+
+
+def repetition_hazards(body: List) -> List[Tuple[str, str]]:
+    """ Checks whether a body of an unbounded repetition can split the same input between iterations
+    in exponentially many ways.
+    """
+    c = sre_constants
+    rv = []
+    starts = leading_chars(body)[0]
+    for i, (op, av) in enumerate(body):
+        if _is_repeat(op) and av[0] != av[1]:
+            # the inner repetition may either consume the next character or end the iteration
+            if leading_chars(body[i + 1:])[1] and starts & match_chars(av[2]):
+                rv.append(('nested-quantifier', 'a variable-length repetition is repeated without a bound'))
+                break
+        elif op is c.BRANCH:
+            follows, rest_nullable = leading_chars(body[i + 1:])
+            if not rest_nullable:
+                continue
+            seen = set()
+            for branch in av[1]:
+                chars, nullable = leading_chars(branch)
+                if nullable:
+                    # an empty alternative lets the next iteration begin
+                    chars = chars | follows | starts
+                if seen & chars:
+                    rv.append(('ambiguous-alternation',
+                               'alternatives of an unbounded repetition may start with the same character'))
+                    break
+                seen |= chars
+    return rv
+
+
+def _ungrouped(items) -> List:
+    rv = []
+    for op, av in items:
+        if op is sre_constants.SUBPATTERN:
+            rv.extend(_ungrouped(av[-1]))
+        else:
+            rv.append((op, av))
+    return rv
+
+
+def leading_chars(items) -> Tuple[FrozenSet[str], bool]:
+    """ Returns the probe characters a match may start with, and whether the match may be empty.
+    """
+    c = sre_constants
+    rv = set()
+    for op, av in items:
+        if _is_repeat(op):
+            chars, nullable = leading_chars(av[2])
+            nullable = nullable or av[0] == 0
+        elif op is c.SUBPATTERN:
+            chars, nullable = leading_chars(av[-1])
+        elif op is getattr(c, 'ATOMIC_GROUP', None):
+            chars, nullable = leading_chars(av)
+        elif op is c.BRANCH:
+            chars, nullable = set(), False
+            for branch in av[1]:
+                branch_chars, branch_nullable = leading_chars(branch)
+                chars |= branch_chars
+                nullable = nullable or branch_nullable
+        elif op in (c.AT, c.ASSERT, c.ASSERT_NOT):
+            continue
+        else:
+            chars = atom_chars(op, av)
+            nullable = op not in (c.LITERAL, c.NOT_LITERAL, c.ANY, c.IN)
+        rv |= chars
+        if not nullable:
+            return frozenset(rv), False
+    return frozenset(rv), True
+
+
+def match_chars(items) -> FrozenSet[str]:
+    """ Returns the probe characters that may appear anywhere in a match.
+    """
+    c = sre_constants
+    rv = set()
+    for op, av in items:
+        if _is_repeat(op):
+            rv |= match_chars(av[2])
+        elif op is c.SUBPATTERN:
+            rv |= match_chars(av[-1])
+        elif op is getattr(c, 'ATOMIC_GROUP', None):
+            rv |= match_chars(av)
+        elif op is c.BRANCH:
+            for branch in av[1]:
+                rv |= match_chars(branch)
+        elif op in (c.AT, c.ASSERT, c.ASSERT_NOT):
+            continue
+        else:
+            rv |= atom_chars(op, av)
+    return frozenset(rv)
+
+
+def atom_chars(op, av) -> FrozenSet[str]:
+    c = sre_constants
+    if op is c.LITERAL:
+        return frozenset((chr(av),)) & PROBE_CHARS
+    if op is c.NOT_LITERAL:
+        return PROBE_CHARS - {chr(av)}
+    if op is c.ANY:
+        return PROBE_CHARS
+    if op is c.IN:
+        return frozenset(char for char in PROBE_CHARS if _set_contains(av, ord(char)))
+    # back references, case-insensitive literals etc.
+    return PROBE_CHARS
+
+
+_CATEGORIES = {
+    'CATEGORY_DIGIT': lambda char: char.isdigit(),
+    'CATEGORY_NOT_DIGIT': lambda char: not char.isdigit(),
+    'CATEGORY_SPACE': lambda char: char.isspace(),
+    'CATEGORY_NOT_SPACE': lambda char: not char.isspace(),
+    'CATEGORY_WORD': lambda char: char.isalnum() or char == '_',
+    'CATEGORY_NOT_WORD': lambda char: not (char.isalnum() or char == '_'),
+    'CATEGORY_LINEBREAK': lambda char: char == '\n',
+    'CATEGORY_NOT_LINEBREAK': lambda char: char != '\n',
+}
+
+
+def _set_contains(items, code: int) -> bool:
+    c = sre_constants
+    negate = False
+    contains = False
+    for op, av in items:
+        if op is c.NEGATE:
+            negate = True
+        elif op is c.LITERAL:
+            contains = contains or av == code
+        elif op is c.RANGE:
+            contains = contains or av[0] <= code <= av[1]
+        elif op is c.CATEGORY:
+            test = _CATEGORIES.get(str(av))
+            contains = contains or test is None or test(chr(code))
+        else:
+            return True
+    return contains != negate
+
+
+# Adversarial timing
+# ------------------
+
+def _regex_format(name: str, rule: str) -> str:
+    return f'(?P<{name}>{rule})'
+
+
+def measure_pattern_costs(namespace: str,
+                          routes: Dict[str, Route],
+                          max_length: int = MAX_PROBE_LENGTH,
+                          budget: float = PROBE_BUDGET) -> List[PatternCost]:
+    """ Matches route regexes against paths where one placeholder value consists of a repeated character
+    that the placeholder accepts, followed by a character that makes the match fail. The value grows
+    one character at a time until ``max_length`` or until a single match takes longer than ``budget`` seconds,
+    so exponential patterns are detected without hanging. Returns the costs, the most expensive first.
+    """
+    rv = []
+    for route in routes.values():
+        nodes = parse_route_pattern(route.pattern)
+        try:
+            rules = {node.name: rule_of(node, route.rules) for node in nodes if isinstance(node, Placeholder)}
+            regex_source = '^{}$'.format(render_route_pattern(nodes, rules, _regex_format))
+            regex = re.compile(regex_source)
+            pumps = {name: pump_char(rule) for name, rule in rules.items()}
+        except (re.error, OverflowError, RecursionError):
+            # reported as invalid rules
+            continue
+
+        for name, char in pumps.items():
+            if char is None:
+                continue
+            length, seconds, exceeded = 0, 0.0, False
+            for length in range(1, max_length + 1):
+                path = ''.join(
+                    node.value if isinstance(node, Text) else (char * length + '\x00' if node.name == name else pumps[node.name] or '')
+                    for node in nodes
+                )
+                seconds = time_match(regex, path, budget)
+                if seconds > budget:
+                    exceeded = True
+                    break
+            rv.append(PatternCost(namespace=namespace, route_name=route.name, regex=regex_source, placeholder=name,
+                                  length=length, seconds=seconds, exceeded=exceeded))
+    rv.sort(key=lambda cost: (not cost.exceeded, -cost.seconds))
+    return rv
+
+
+def time_match(regex: 're.Pattern', path: str, budget: float, attempts: int = 3) -> float:
+    """ Returns the matching time, repeating the match if it exceeds the budget to rule out random pauses.
+    """
+    for _ in range(attempts):
+        started_at = time.perf_counter()
+        regex.match(path)
+        seconds = time.perf_counter() - started_at
+        if seconds <= budget:
+            break
+    return seconds
+
+
+def pump_char(rule: str) -> Optional[str]:
+    chars = leading_chars(sre_parse.parse(rule))[0] or match_chars(sre_parse.parse(rule))
+    return min(chars) if chars else None
@@ -0,0 +1,341 @@
+""" Parser of route patterns.
+
+A route pattern such as ``/users/{user_id:\\d+}/{lang}`` is parsed once into a tuple of nodes:
+
+.. code-block:: python
+
+    (Text('/users/'), Placeholder(name='user_id', rule='\\d+'), Text('/'), Placeholder(name='lang', rule=None))
+
+Django regexes, frameapp patterns and URL templates are all rendered from these nodes.
+Placeholders may contain nested braces, e.g. ``{id:\\d{4}}``.
+
+URL templates are compiled once per route when the configuration is frozen, and then used to build links
+without going through a URL resolver:
+
+.. code-block:: python
+
+    registry = configurator.freeze()
+    registry.url_for('myapp', 'user_profile', user_id=42, lang=Language.ENGLISH)  # '/users/42/en'
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple, Union, Dict, Any, Callable, FrozenSet, Type, List, Iterable, Pattern
+from urllib.parse import quote
+
+from .sums import SumType, SumVariant
+from ..exceptions import ConfigurationError
+from ..util import maybe_dotted
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # pragma: no cover
+    import sre_parse
+    import sre_constants
+
+
+class Text(NamedTuple):
+    value: str
+
+
+class Placeholder(NamedTuple):
+    name: str
+    rule: Optional[str]
+    """ Text after the colon, if any
+    """
+
+    @property
+    def source(self) -> str:
+        if self.rule is None:
+            return f'{{{self.name}}}'
+        return f'{{{self.name}:{self.rule}}}'
+
+
+PatternNode = Union[Text, Placeholder]
+
+DEFAULT_RULE = '[^/]+'
+
+EMBEDDED_SUM_TYPE_RE = re.compile('\\<(?P<sum_type>[a-zA-Z0-9_.:]+)\\>')
+
+# Regex syntax characters that may appear in static parts of route patterns
+REGEX_SYNTAX_CHARS = frozenset('.^$*+?()[]{}|\\')
+
+SLASH = ord('/')
+
+# The same characters are left unquoted by django.urls.reverse()
+URL_SAFE_CHARS = "!$&'()*+,;=/~:@"
+
+
+@lru_cache(maxsize=None)
+def parse_route_pattern(pattern: str) -> Tuple[PatternNode, ...]:
+    nodes = []
+    pos = 0
+    end = len(pattern)
+    while pos < end:
+        start = pattern.find('{', pos)
+        if start < 0:
+            nodes.append(Text(pattern[pos:]))
+            break
+        if start > pos:
+            nodes.append(Text(pattern[pos:start]))
+
+        depth = 0
+        for i in range(start, end):
+            char = pattern[i]
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if not depth:
+                    break
+        else:
+            raise ConfigurationError(f'Unexpected end of a route pattern: {pattern[start:]}')
+
+        name, colon, rule = pattern[start + 1:i].partition(':')
+        nodes.append(Placeholder(name=name, rule=rule if colon else None))
+        pos = i + 1
+    return tuple(nodes)
+
+
+@lru_cache(maxsize=None)
+def sum_type_rule(sum_type: Type[SumType]) -> str:
+    """ Returns a regex that matches string representations of the SumType values and nothing else.
+    Values are escaped and factored by their common prefixes (``en|de|dk`` becomes ``(?:d(?:e|k)|en)``),
+    so that the regex engine doesn't test every alternative one by one.
+    """
+    trie = {}
+    for value in sum_type.values():
+        node = trie
+        for char in str(value):
+            node = node.setdefault(char, {})
+        node[None] = {}
+    rule = _trie_rule(trie)
+    if rule.startswith('(?:') and rule.endswith(')'):
+        # already a group of alternatives
+        return rule
+    return f'(?:{rule})'
+
+
+def _trie_rule(node: Dict[Optional[str], Any]) -> str:
+    """ Keys of trie nodes are characters, the None key marks the end of a value.
+    """
+    branches = []
+    for char in sorted(k for k in node if k is not None):
+        child = node[char]
+        # single-child chains are collapsed into literal runs
+        buf = [char]
+        while len(child) == 1 and None not in child:
+            char, child = next(iter(child.items()))
+            buf.append(char)
+        branches.append(f'{re.escape("".join(buf))}{_trie_rule(child)}')
+
+    if not branches:
+        return ''
+    rule = branches[0] if len(branches) == 1 else f'(?:{"|".join(branches)})'
+    if None in node:
+        return f'(?:{rule})?'
+    return rule
+
+
+def placeholder_rule(placeholder: Placeholder, rules: Dict[str, Any]) -> str:
+    """ Returns a regex of the placeholder: either its explicit rule, a rule registered for it with the route,
+    or the default ``[^/]+``.
+    """
+    if placeholder.rule is not None:
+        return placeholder.rule
+    rule = rules.get(placeholder.name)
+    if not rule:
+        return DEFAULT_RULE
+    if isinstance(rule, str):
+        return rule
+    if issubclass(rule, SumType):
+        return sum_type_rule(rule)
+    return rule
+
+
+def render_route_pattern(nodes: Tuple[PatternNode, ...],
+                         rules: Dict[str, Any],
+                         rule_format: Callable[[str, str], str]) -> str:
+    buf = []
+    for node in nodes:
+        if isinstance(node, Text):
+            buf.append(node.value)
+        else:
+            buf.append(rule_format(node.name, placeholder_rule(node, rules)))
+    return ''.join(buf)
+
+
+def route_segments(pattern: str, rules: Dict[str, SumType]) -> Optional[List[Tuple[bool, str]]]:
+    """ Splits a route pattern into (is_static, value) segments, where value is either a literal segment
+    or a segment regex. Returns None if the pattern cannot be split into independent segments.
+    """
+    segments = []
+    is_static = True
+    buf = []
+    for node in parse_route_pattern(pattern):
+        if isinstance(node, Placeholder):
+            rule = placeholder_rule(node, rules)
+            if can_match_slash(rule):
+                return None
+            is_static = False
+            buf.append(f'(?:{rule})')
+            continue
+
+        if not REGEX_SYNTAX_CHARS.isdisjoint(node.value):
+            return None
+        head, *tail = node.value.split('/')
+        buf.append(head)
+        for part in tail:
+            segments.append((is_static, ''.join(buf)))
+            is_static = True
+            buf = [part]
+    segments.append((is_static, ''.join(buf)))
+    return segments
+
+
+def can_match_slash(rule: str) -> bool:
+    """ Conservatively checks whether a placeholder rule may match a string that contains a slash.
+    """
+    try:
+        parsed = sre_parse.parse(rule)
+    except (re.error, OverflowError, RecursionError):
+        return True
+    return _can_match_slash(parsed)
+
+
+def _can_match_slash(items: Iterable) -> bool:
+    c = sre_constants
+    for op, av in items:
+        if op is c.LITERAL:
+            if av == SLASH:
+                return True
+        elif op is c.NOT_LITERAL:
+            if av != SLASH:
+                return True
+        elif op is c.ANY:
+            return True
+        elif op is c.IN:
+            if _set_contains_slash(av):
+                return True
+        elif op in (c.MAX_REPEAT, c.MIN_REPEAT) or op is getattr(c, 'POSSESSIVE_REPEAT', None):
+            if _can_match_slash(av[2]):
+                return True
+        elif op is c.SUBPATTERN:
+            if _can_match_slash(av[-1]):
+                return True
+        elif op is getattr(c, 'ATOMIC_GROUP', None):
+            if _can_match_slash(av):
+                return True
+        elif op is c.BRANCH:
+            if any(_can_match_slash(branch) for branch in av[1]):
+                return True
+        elif op in (c.AT, c.ASSERT, c.ASSERT_NOT):
+            # zero-width
+            continue
+        else:
+            # back references, conditional groups etc.
+            return True
+    return False
+
+
+def _set_contains_slash(items: Iterable) -> bool:
+    c = sre_constants
+    negate = False
+    contains = False
+    for op, av in items:
+        if op is c.NEGATE:
+            negate = True
+        elif op is c.LITERAL:
+            contains = contains or av == SLASH
+        elif op is c.RANGE:
+            contains = contains or av[0] <= SLASH <= av[1]
+        elif op is c.CATEGORY:
+            contains = contains or av in (c.CATEGORY_NOT_DIGIT, c.CATEGORY_NOT_SPACE, c.CATEGORY_NOT_WORD,
+                                          c.CATEGORY_NOT_LINEBREAK)
+        else:
+            return True
+    return contains != negate
+
+
+class URLTemplate(NamedTuple):
+    template: str
+    """ Route pattern with placeholders replaced by ``str.format`` fields
+    """
+    names: FrozenSet[str]
+    sum_types: Dict[str, Type[SumType]]
+    """ SumType rules of placeholders, their arguments are rendered from variant values
+    """
+    rules: Dict[str, str]
+    """ Regex rules of the other placeholders, their arguments must match them in full
+    """
+
+    def render(self, kwargs: Dict[str, Any]) -> str:
+        if kwargs.keys() != self.names:
+            problems = []
+            missing = self.names - kwargs.keys()
+            if missing:
+                problems.append(f'missing arguments {sorted(missing)}')
+            unexpected = kwargs.keys() - self.names
+            if unexpected:
+                problems.append(f'unexpected arguments {sorted(unexpected)}')
+            raise TypeError(f'URL template "{self.template}" got {" and ".join(problems)}')
+        args = {}
+        for name, value in kwargs.items():
+            sum_type = self.sum_types.get(name)
+            if sum_type is not None:
+                value = str(sum_type_value(sum_type, name, value))
+            else:
+                value = str(value)
+                rule = self.rules[name]
+                if not compiled_rule(rule).fullmatch(value):
+                    # the same check as django.urls.reverse() does before raising NoReverseMatch
+                    raise ConfigurationError(f'Argument "{name}" of URL template "{self.template}" '
+                                             f'does not match its rule "{rule}": {value}')
+            args[name] = quote(value, safe=URL_SAFE_CHARS)
+        url = self.template.format_map(args)
+        if url.startswith('//'):
+            # a leading double slash would be interpreted as a scheme-relative URL
+            url = f'/%2F{url[2:]}'
+        return url
+
+
+@lru_cache(maxsize=None)
+def compiled_rule(rule: str) -> Pattern:
+    # rules are compiled on first use, invalid ones are reported by the route linter
+    return re.compile(rule)
+
+
+def sum_type_value(sum_type: Type[SumType], name: str, value: Any) -> Any:
+    if isinstance(value, SumVariant):
+        if value.variant_of is not sum_type:
+            raise TypeError(f'Argument "{name}" must be a variant of {sum_type.__name__}, got {value.variant_of.__name__}')
+        return value.value
+    if value not in sum_type.__sum_meta__.values:
+        raise TypeError(f'Argument "{name}" is not a value of {sum_type.__name__}: {value}')
+    return value
+
+
+def compile_url_template(pattern: str, rules: Dict[str, Any]) -> URLTemplate:
+    """ Compiles a route pattern into a template of absolute paths of the route.
+    """
+    if not pattern.startswith('/'):
+        pattern = f'/{pattern}'
+    buf = []
+    names = set()
+    sum_types = {}
+    placeholder_rules = {}
+    for node in parse_route_pattern(pattern):
+        if isinstance(node, Text):
+            buf.append(node.value.replace('{', '{{').replace('}', '}}'))
+            continue
+        names.add(node.name)
+        buf.append(f'{{{node.name}}}')
+        embedded_sum_type = node.rule is not None and EMBEDDED_SUM_TYPE_RE.match(node.rule)
+        if embedded_sum_type:
+            sum_types[node.name] = maybe_dotted(embedded_sum_type.group('sum_type'))
+        elif node.rule is None:
+            rule = rules.get(node.name)
+            if isinstance(rule, type) and issubclass(rule, SumType):
+                sum_types[node.name] = rule
+        if node.name not in sum_types:
+            placeholder_rules[node.name] = placeholder_rule(node, rules)
+    return URLTemplate(template=''.join(buf), names=frozenset(names), sum_types=sum_types, rules=placeholder_rules)
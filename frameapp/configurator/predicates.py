@@ -2,19 +2,29 @@
 
 https://github.com/avanov/solo/blob/bf44c527dbe48256d2bd3da463eceeb78d05a38d/solo/configurator/config/predicates.py
 """
+import json
 import operator
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union, Any
 
 import jsonschema
 from django.http import HttpRequest
 from pkg_resources.extern.packaging.version import Version
 from pkg_resources import parse_version
+from rest_framework.exceptions import ParseError
 from rest_framework.request import Request
 
 from ..schemas import json_schema
 from .util import as_sorted_tuple
 
 
+@lru_cache(maxsize=256)
+def parse_api_version(version: str) -> Version:
+    """ Parses an API version once, requests of the same version share the resulting object.
+    """
+    return parse_version(version)
+
+
 class RequestMethodPredicate:
     def __init__(self, val, config, raises: Optional[Exception] = None) -> None:
         """ Predicates are constructed at ``solo.configurator.config.util.PredicateList.make()``
@@ -110,7 +120,7 @@ class ApiVersionPredicate:
                     operation = self.OPERATORS['==']
 
             # evaluate the case
-            matched = operation(request_version, parse_version(compare_with))
+            matched = operation(request_version, parse_api_version(compare_with))
             return matched
         return True
 
@@ -169,10 +179,28 @@ class InputSchemaPredicate:
     __repr__ = text
 
     def __call__(self, context: Optional, request: Request) -> bool:
-        jsonschema.validate(request.data, self.val)
+        try:
+            payload = request_payload(request)
+        except (ValueError, ParseError):
+            # a malformed body can't match any schema
+            return False
+        jsonschema.validate(payload, self.val)
         return True
 
 
+def request_payload(request: Union[HttpRequest, Request]) -> Any:
+    """ Returns parsed data of DRF requests, or the JSON body of plain Django requests.
+
+    :raises ValueError: the body of a plain Django request is not valid JSON
+    :raises rest_framework.exceptions.ParseError: the body of a DRF request cannot be parsed
+    """
+    if isinstance(request, Request):
+        return request.data
+    if not request.body:
+        return None
+    return json.loads(request.body)
+
+
 class OutputSchemaPredicate:
     def __init__(self, val, config, raises: Optional[Exception] = None) -> None:
         """ Predicates are constructed at ``solo.configurator.config.util.PredicateList.make()``
@@ -2,31 +2,93 @@
 
 https://github.com/avanov/solo/blob/bf44c527dbe48256d2bd3da463eceeb78d05a38d/solo/configurator/config/rendering.py
 """
-from typing import Dict, Any, TypeVar, List, Generator
+import gzip
+from io import BytesIO
+from array import array
+from functools import lru_cache
+from typing import Dict, Any, TypeVar, List, Generator, Iterable, Iterator, Callable, Optional, Union, Tuple
 from enum import Enum
 from decimal import Decimal
-from collections import KeysView, ValuesView, ItemsView
+from collections.abc import KeysView, ValuesView, ItemsView
 from datetime import datetime, tzinfo
 
-from pytz.tzinfo import BaseTzInfo
 from wrapt import ObjectProxy
 from django.core.serializers.json import DjangoJSONEncoder
-from django.http import HttpRequest, HttpResponse
+from django.utils.functional import Promise
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_vary_headers
 from rest_framework.utils import encoders
 
+from .sums import SumVariant
+from .routes import CompressionPolicy
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 JsonPayload = TypeVar('JsonApiPayload', Dict[str, Any], List[Dict[str, Any]])
 
 
 class JsonRendererFactory:
+    """ Renders JSON, unless the client explicitly accepts the compact binary format
+    (see :mod:`frameapp.codec`).
+    """
     def __init__(self, name: str) -> None:
+        from .encoders import encode_json_bytes
+        from ..codec import CONTENT_TYPE, encode_compact
+
         self.name = name
+        self.encode = encode_json_bytes
+        self.compact_content_type = CONTENT_TYPE
+        self.encode_compact = encode_compact
 
     def __call__(self, request: HttpRequest, view_response: JsonPayload) -> HttpResponse:
+        if prefers_explicitly(request.META.get('HTTP_ACCEPT', ''), self.compact_content_type, 'application/json'):
+            response = HttpResponse(status=200,
+                                    content=self.encode_compact(view_response),
+                                    content_type=self.compact_content_type)
+        else:
+            response = HttpResponse(status=200,
+                                    content=self.encode(view_response),
+                                    content_type='application/json',
+                                    charset='utf-8')
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+
+class CompactRendererFactory:
+    """ Renders the compact binary format regardless of the Accept header of the request.
+    """
+    def __init__(self, name: str) -> None:
+        from ..codec import CONTENT_TYPE, encode_compact
+
+        self.name = name
+        self.content_type = CONTENT_TYPE
+        self.encode = encode_compact
+
+    def __call__(self, request: HttpRequest, view_response: Any) -> HttpResponse:
         return HttpResponse(status=200,
-                            content=encode_json(view_response).encode('utf-8'),
-                            content_type='application/json',
-                            charset='utf-8')
+                            content=self.encode(view_response),
+                            content_type=self.content_type)
+
+
+class StreamingJsonRendererFactory:
+    """ Encodes responses incrementally, so that generator-backed payloads of any size
+    are rendered with flat memory usage.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __call__(self, request: HttpRequest, view_response: Any) -> StreamingHttpResponse:
+        return StreamingHttpResponse(iter_json_chunks(view_response, self.CHUNK_SIZE),
+                                     status=200,
+                                     content_type='application/json',
+                                     charset='utf-8')
 
 
 class StringRendererFactory:
@@ -40,8 +102,120 @@ class StringRendererFactory:
                      charset='utf-8')
 
 
+def accepts_encoding(request: HttpRequest, encoding: str) -> bool:
+    """ Checks whether the encoding is listed in Accept-Encoding of the request and isn't explicitly refused
+    with ``q=0``.
+    """
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, *params = item.split(';')
+        if coding.strip().lower() != encoding:
+            continue
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def media_range_qualities(accept: str) -> List[Tuple[str, float]]:
+    """ Parses an Accept header into (media range, q value) pairs.
+    """
+    rv = []
+    for item in accept.split(','):
+        media_range, *params = item.split(';')
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        rv.append((media_range, quality))
+    return rv
+
+
+def media_type_quality(ranges: List[Tuple[str, float]], media_type: str) -> float:
+    """ Returns the q value of the most specific media range that matches the media type (RFC 7231, section 5.3.2).
+    """
+    type_wildcard = f'{media_type.partition("/")[0]}/*'
+    specificity = -1
+    rv = 0.0
+    for media_range, quality in ranges:
+        if media_range == media_type:
+            match = 2
+        elif media_range == type_wildcard:
+            match = 1
+        elif media_range == '*/*':
+            match = 0
+        else:
+            continue
+        if match > specificity:
+            specificity = match
+            rv = quality
+    return rv
+
+
+@lru_cache(maxsize=256)
+def prefers_explicitly(accept: str, media_type: str, default_media_type: str) -> bool:
+    """ Checks whether the Accept header lists the media type explicitly, with a q value that is not zero
+    and not lower than the one of the default media type. Wildcards never select the media type.
+    """
+    ranges = media_range_qualities(accept)
+    quality = max((q for media_range, q in ranges if media_range == media_type), default=0.0)
+    return quality > 0 and quality >= media_type_quality(ranges, default_media_type)
+
+
+def gzip_compress(content: bytes, level: int) -> bytes:
+    """ Deterministic equivalent of ``gzip.compress(content, level, mtime=0)``, whose ``mtime`` argument
+    is only available since Python 3.8.
+    """
+    buf = BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=level, mtime=0) as f:
+        f.write(content)
+    return buf.getvalue()
+
+
+def compress_response(request: HttpRequest, response: HttpResponseBase, policy: CompressionPolicy) -> HttpResponseBase:
+    """ Compresses the body of a successful non-streaming response with gzip, if the client accepts it.
+    Compression is deterministic, so that compressed bodies can be cached and validated with ETags.
+    """
+    if response.status_code != 200 or response.streaming or response.has_header('Content-Encoding'):
+        return response
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    content = response.content
+    if len(content) < policy.min_size:
+        return response
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if not accepts_encoding(request, 'gzip'):
+        return response
+
+    compressed = gzip_compress(content, policy.level)
+    if len(compressed) >= len(content):
+        return response
+    response.content = compressed
+    response['Content-Length'] = str(len(compressed))
+    response['Content-Encoding'] = 'gzip'
+    # Compressed representation is not byte-for-byte identical to the original one (RFC 7232, section 2.1)
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = f'W/{etag}'
+    return response
+
+
 BUILTIN_RENDERERS = {
     'json': JsonRendererFactory,
+    'json_stream': StreamingJsonRendererFactory,
+    'compact': CompactRendererFactory,
     'string': StringRendererFactory,
 }
 
@@ -72,42 +246,213 @@ class RenderersConfigurator:
         return rv
 
 
+TypeConverter = Callable[[Any], Any]
+
+
+def _call_json(o: Any) -> Any:
+    return o.__json__()
+
+
+def _variant_value(o: Union[Enum, SumVariant]) -> Any:
+    return o.value
+
+
+def _unwrap_proxy(o: ObjectProxy) -> Any:
+    return o.__wrapped__
+
+
+def _isoformat_datetime(o: datetime) -> str:
+    r = o.isoformat()
+    if r.endswith('+00:00'):
+        r = r[:-6] + 'Z'
+    return r
+
+
+def _isoformat_datetime_without_microseconds(o: datetime) -> str:
+    """ Milliseconds/microseconds are ignored when encoding datetime objects
+    (we don't save them in the database, but some endpoints end up making them -
+    and milliseconds break Jon's iOS JSON Decoder).
+    """
+    if o.microsecond:
+        o = o.replace(microsecond=0)
+    return _isoformat_datetime(o)
+
+
+def resolve_type_converter(converters: Dict[type, TypeConverter], cls: type) -> Optional[TypeConverter]:
+    """ Finds a converter for the type. Objects that define ``__json__()`` take precedence over registered types,
+    then the type's MRO is looked up, and finally registered abstract base classes are checked.
+    """
+    if hasattr(cls, '__json__'):
+        return _call_json
+    for base in cls.__mro__:
+        try:
+            return converters[base]
+        except KeyError:
+            continue
+    for base, converter in converters.items():
+        if issubclass(cls, base):
+            return converter
+    return None
+
+
+def type_converters(encoder_cls: type) -> Dict[type, TypeConverter]:
+    """ Merges ``TYPE_CONVERTERS`` of the encoder class and its bases, converters of subclasses take precedence.
+    """
+    rv: Dict[type, TypeConverter] = {}
+    for base in reversed(encoder_cls.__mro__):
+        rv.update(base.__dict__.get('TYPE_CONVERTERS', {}))
+    return rv
+
+
+def add_type_converter(encoder_cls: type, type: type, converter: TypeConverter) -> None:
+    """ Registers the converter with the encoder class, which makes it available to subclasses
+    that don't register their own converter of the type.
+    """
+    encoder_cls.TYPE_CONVERTERS = {**encoder_cls.__dict__.get('TYPE_CONVERTERS', {}), type: converter}
+    pending = [encoder_cls]
+    while pending:
+        cls = pending.pop()
+        cls._resolved_converters = {}
+        pending.extend(cls.__subclasses__())
+
+
 class ExtendedJSONEncoder(encoders.JSONEncoder):
-    def default(self, obj: Any) -> Any:
-        if hasattr(obj, '__json__'):
-            return obj.__json__()
-        elif isinstance(obj, (BaseTzInfo, tzinfo)):
-            return str(obj)
-        elif isinstance(obj, Enum):
-            return obj.value
-        elif isinstance(obj, ObjectProxy):
-            return obj.__wrapped__
+    """ Every type is resolved against ``TYPE_CONVERTERS`` of the class and its bases only once, subsequent encodings of objects
+    of the same type cost one dict lookup. Types without a converter are delegated to the DRF encoder.
+    """
+    TYPE_CONVERTERS: Dict[type, TypeConverter] = {
+        tzinfo: str,
+        Enum: _variant_value,
+        SumVariant: _variant_value,
+        ObjectProxy: _unwrap_proxy,
+        Decimal: float,
+        datetime: _isoformat_datetime,
+        array: array.tolist,
+    }
+    _resolved_converters: Dict[type, Optional[TypeConverter]] = {}
 
-        return super().default(obj)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # subclasses may override converters, they must not share the cache of their bases
+        cls._resolved_converters = {}
+
+    @classmethod
+    def add_type_converter(cls, type: type, converter: TypeConverter) -> None:
+        add_type_converter(cls, type, converter)
+
+    def default(self, obj: Any) -> Any:
+        cls = type(obj)
+        try:
+            converter = self._resolved_converters[cls]
+        except KeyError:
+            converter = self._resolved_converters[cls] = resolve_type_converter(type_converters(type(self)), cls)
+        if converter is None:
+            return super().default(obj)
+        return converter(obj)
 
 
 class ExtendedDjangoJSONEncoder(DjangoJSONEncoder):
-    def default(self, o):
-        """
-        Check that milliseconds/microseconds are ignored when encoding datetime
-        objects (we don't save them in the database, but some endpoints end up
-        making them - and milliseconds break Jon's iOS JSON Decoder).
-        """
-        if hasattr(o, '__json__'):
-            return o.__json__()
-        elif isinstance(o, datetime) and o.microsecond:
-            return o.replace(microsecond=0)
+    """ Every type is resolved against ``TYPE_CONVERTERS`` of the class and its bases only once, subsequent encodings of objects
+    of the same type cost one dict lookup. Types without a converter are delegated to the Django encoder.
+    """
+    TYPE_CONVERTERS: Dict[type, TypeConverter] = {
+        datetime: _isoformat_datetime_without_microseconds,
         # http://stackoverflow.com/questions/1960516/python-json-serialize-a-decimal-object
-        elif isinstance(o, Decimal):
-            return float(o)
-        elif o.__class__.__name__ is '__proxy__':
-            return str(o)
-        elif isinstance(o, (KeysView, ValuesView, ItemsView, Generator)):
-            return list(o)
-        elif isinstance(o, Enum):
-            return o.value
+        Decimal: float,
+        Promise: str,
+        KeysView: list,
+        ValuesView: list,
+        ItemsView: list,
+        Generator: list,
+        Enum: _variant_value,
+        SumVariant: _variant_value,
+        # the wrapped object is passed back to the encoder
+        ObjectProxy: _unwrap_proxy,
+        array: array.tolist,
+    }
+    _resolved_converters: Dict[type, Optional[TypeConverter]] = {}
 
-        return super().default(o)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # subclasses may override converters, they must not share the cache of their bases
+        cls._resolved_converters = {}
+
+    @classmethod
+    def add_type_converter(cls, type: type, converter: TypeConverter) -> None:
+        add_type_converter(cls, type, converter)
+
+    def default(self, o):
+        cls = type(o)
+        try:
+            converter = self._resolved_converters[cls]
+        except KeyError:
+            converter = self._resolved_converters[cls] = resolve_type_converter(type_converters(type(self)), cls)
+        if converter is None:
+            return super().default(o)
+        return converter(o)
+
+
+if numpy is not None:
+    ExtendedJSONEncoder.add_type_converter(numpy.ndarray, numpy.ndarray.tolist)
+    ExtendedDjangoJSONEncoder.add_type_converter(numpy.ndarray, numpy.ndarray.tolist)
 
 
 encode_json = ExtendedDjangoJSONEncoder().encode
+
+
+class LazyList(list):
+    """ A non-empty list stand-in for the pure-Python JSON encoder that consumes the underlying iterator lazily,
+    instead of materializing it with ``list(o)``.
+    """
+    def __init__(self, first: Any, rest: Iterator) -> None:
+        super().__init__()
+        self.first = first
+        self.rest = rest
+
+    def __iter__(self) -> Iterator:
+        yield self.first
+        yield from self.rest
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def lazy_list(iterable: Iterable) -> List:
+    iterator = iter(iterable)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return []
+    return LazyList(first, iterator)
+
+
+class StreamingDjangoJSONEncoder(ExtendedDjangoJSONEncoder):
+    """ Serializes iterables lazily, other converters are inherited from :class:`ExtendedDjangoJSONEncoder`.
+    """
+    TYPE_CONVERTERS: Dict[type, TypeConverter] = {
+        KeysView: lazy_list,
+        ValuesView: lazy_list,
+        ItemsView: lazy_list,
+        Generator: lazy_list,
+    }
+
+
+def iter_json_chunks(payload: Any, chunk_size: int) -> Iterator[bytes]:
+    """ Yields UTF-8 encoded JSON representation of the payload in chunks of roughly ``chunk_size`` bytes.
+    Note that ``iterencode()`` always uses the pure-Python encoder, which is what allows us to substitute
+    generators with lazy lists.
+    """
+    buf = []
+    buf_size = 0
+    for piece in _streaming_encoder.iterencode(payload):
+        buf.append(piece)
+        buf_size += len(piece)
+        if buf_size >= chunk_size:
+            yield ''.join(buf).encode('utf-8')
+            buf = []
+            buf_size = 0
+    if buf:
+        yield ''.join(buf).encode('utf-8')
+
+
+_streaming_encoder = StreamingDjangoJSONEncoder()
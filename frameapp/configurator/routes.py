@@ -1,7 +1,7 @@
 import os
 import logging
 from collections import OrderedDict
-from typing import Optional, Dict, List, NamedTuple, Any, Callable, Union, Sequence, Set, Tuple
+from typing import Optional, Dict, List, NamedTuple, Any, Callable, Union, Sequence, Set, Tuple, FrozenSet
 
 from .sums import SumType
 from ..util import viewdefaults
@@ -116,6 +116,55 @@ class RoutesConfigurator:
                     )
 
 
+class AdmissionPolicy(NamedTuple):
+    max_concurrency: int
+    """ Max number of requests that can be handled by a view concurrently within one worker
+    """
+    queue_timeout: float
+    """ Max number of seconds a request may wait for a free slot before it is shed
+    """
+    adaptive: bool
+    """ Whether the concurrency limit should be tuned from observed latencies, with ``max_concurrency`` as the upper bound
+    """
+    retry_after: int
+    """ Value of the Retry-After header of shed responses, in seconds
+    """
+
+
+class CachePolicy(NamedTuple):
+    ttl: float
+    """ Number of seconds a rendered response is served from the cache
+    """
+    vary: Tuple[str, ...]
+    """ Names of request headers whose values are a part of the cache key
+    """
+    tags: FrozenSet[str]
+    """ Tags that allow invalidating entries of several routes at once
+    """
+
+    @property
+    def vary_meta_keys(self) -> Tuple[str, ...]:
+        return tuple(header_meta_key(header) for header in self.vary)
+
+
+def header_meta_key(header: str) -> str:
+    """ Returns a key of the header in ``request.META``
+    """
+    key = header.upper().replace('-', '_')
+    if key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+        return key
+    return f'HTTP_{key}'
+
+
+class CompressionPolicy(NamedTuple):
+    min_size: int
+    """ Responses shorter than this number of bytes are not compressed
+    """
+    level: int
+    """ Gzip compression level, from 1 to 9
+    """
+
+
 class ViewMeta(NamedTuple):
     route_name: str
     registered_view: Any
@@ -130,6 +179,19 @@ class ViewMeta(NamedTuple):
     predicates: Any
     is_django_generic_view: bool
     is_drf_model_viewset: bool
+    coalesce: Any
+    """ Either a boolean flag or a key function for single-flight execution of concurrent identical requests
+    """
+    admission: Optional[AdmissionPolicy]
+    deadline: Optional[float]
+    """ Default time budget of a request, in seconds
+    """
+    cache: Optional[CachePolicy]
+    etag: Any
+    """ Either a function that computes an ETag of the requested resource, or True for ETags computed from responses
+    """
+    last_modified: Optional[Callable]
+    compression: Optional[CompressionPolicy]
 
 
 class SchemaIdentifier(NamedTuple):
@@ -166,3 +228,10 @@ class ViewVariant(NamedTuple):
     attr: Optional[str]
     renderer: Any
     predicates: Any
+    coalesce: Any
+    admission: Optional[AdmissionPolicy]
+    deadline: Optional[float]
+    cache: Optional[CachePolicy]
+    etag: Any
+    last_modified: Optional[Callable]
+    compression: Optional[CompressionPolicy]
@@ -4,14 +4,15 @@ https://github.com/avanov/solo/blob/bf44c527dbe48256d2bd3da463eceeb78d05a38d/sol
 """
 import inspect
 import logging
+import sys
 from collections import OrderedDict
-from typing import Optional
+from typing import Optional, Sequence, Callable
 
 from django.views.generic.base import View as DjangoGenericView
 
 from . import predicates as default_predicates
 from ..util import viewdefaults
-from .routes import ViewMeta
+from .routes import ViewMeta, AdmissionPolicy, CachePolicy, CompressionPolicy
 from .util import PredicateList
 from ..exceptions import ConfigurationError
 
@@ -19,6 +20,14 @@ from ..exceptions import ConfigurationError
 log = logging.getLogger(__name__)
 
 
+def is_drf_viewset(view: type) -> bool:
+    """ DRF is not imported here: importing it requires configured Django settings,
+    and a subclass of its ViewSetMixin cannot exist unless the module has already been loaded.
+    """
+    viewsets = sys.modules.get('rest_framework.viewsets')
+    return viewsets is not None and issubclass(view, viewsets.ViewSetMixin)
+
+
 class ViewsConfigurator:
 
     def __init__(self) -> None:
@@ -34,6 +43,20 @@ class ViewsConfigurator:
                  attr=None,
                  decorator=None,
                  renderer=None,
+                 coalesce=None,
+                 max_concurrency: Optional[int] = None,
+                 queue_timeout: Optional[float] = None,
+                 adaptive_concurrency: Optional[bool] = None,
+                 retry_after: Optional[int] = None,
+                 deadline: Optional[float] = None,
+                 cache: Optional[float] = None,
+                 cache_vary: Optional[Sequence[str]] = None,
+                 cache_tags: Optional[Sequence[str]] = None,
+                 etag=None,
+                 last_modified: Optional[Callable] = None,
+                 compress: Optional[bool] = None,
+                 compress_min_size: Optional[int] = None,
+                 compress_level: Optional[int] = None,
                  **predicates) -> ViewMeta:
         """
 
@@ -56,6 +79,38 @@ class ViewsConfigurator:
         :type attr: str
         :param decorator:
         :param renderer:
+        :param coalesce: when set to ``True``, concurrent identical GET/HEAD requests within one worker
+                         wait for a single in-flight execution of the view and share its rendered response.
+                         Requests are considered identical when they share the route, route arguments,
+                         API version, query string, and the Accept, Authorization and Cookie headers.
+                         A callable ``(request, *args, **kwargs) -> Hashable`` may be passed instead of ``True``
+                         to compute a custom key. Custom keys must distinguish users if the view returns
+                         per-user data, otherwise concurrent requests of different users get the same response.
+        :param max_concurrency: max number of requests the view may handle concurrently within one worker.
+                                Requests exceeding the limit are shed with "503 Service Unavailable".
+        :param queue_timeout: number of seconds a request may wait for a free slot before it is shed.
+                              Defaults to 0, i.e. excess requests are shed immediately.
+        :param adaptive_concurrency: tune the concurrency limit from observed latencies,
+                                     with ``max_concurrency`` as the upper bound.
+        :param retry_after: value of the Retry-After header of shed responses, in seconds. Defaults to 1.
+        :param deadline: default time budget of a request, in seconds. A request that exceeds it is aborted
+                         with "504 Gateway Timeout" at the next stage of dispatching.
+                         See :mod:`frameapp.ext.django_integration.deadline`.
+        :param cache: number of seconds successful GET/HEAD responses are served from the process-wide
+                      response cache without calling the view. See :mod:`frameapp.ext.django_integration.cache`.
+        :param cache_vary: names of request headers whose values are a part of the cache key.
+                           Required for DRF views with permissions other than ``AllowAny``.
+        :param cache_tags: tags that allow invalidating cached responses of several routes at once.
+        :param etag: a function ``(request, *args, **kwargs) -> Optional[str]`` that computes an ETag of the requested
+                     resource before the view is called, so that matching conditional requests are answered with
+                     "304 Not Modified" right away. Pass ``True`` to compute strong ETags from rendered responses.
+                     See :mod:`frameapp.ext.django_integration.conditional`.
+        :param last_modified: a function ``(request, *args, **kwargs) -> Optional[datetime]`` that returns
+                              modification time of the requested resource. It is evaluated before the view is called.
+        :param compress: compress successful responses with gzip when clients accept it. Cached responses are stored
+                         compressed, so that repeated responses are not compressed again.
+        :param compress_min_size: responses shorter than this number of bytes are sent uncompressed. Defaults to 1024.
+        :param compress_level: gzip compression level, from 1 to 9. Defaults to 6.
         :param predicates: Pass a key/value pair here to use a third-party predicate
                            registered via
                            :meth:`solo.configurator.config.Configurator.views.add_view_predicate`.
@@ -64,14 +119,13 @@ class ViewsConfigurator:
                            third-party predicates.
         :return: :raise ConfigurationError:
         """
-        from rest_framework.viewsets import ViewSetMixin
-
         # Prepare view object
         # -------------------------------------
-        is_django_generic_view = issubclass(view, DjangoGenericView)
-        is_drf_model_viewset = issubclass(view, ViewSetMixin)
+        is_class_view = inspect.isclass(view)
+        is_django_generic_view = is_class_view and issubclass(view, DjangoGenericView)
+        is_drf_model_viewset = is_class_view and is_drf_viewset(view)
 
-        if inspect.isclass(view):
+        if is_class_view:
             if attr is None:
                 attr = '__call__'
             if not issubclass(view, DjangoGenericView) and not hasattr(view, attr):
@@ -104,6 +158,71 @@ class ViewsConfigurator:
         if renderer is None:
             renderer = 'string'
 
+        # Request coalescing
+        # -------------------------------------
+        if coalesce is not None and not isinstance(coalesce, bool) and not callable(coalesce):
+            raise ConfigurationError(f'View {view} has an invalid coalesce option: {coalesce}. '
+                                     f'Expected a boolean or a key function.')
+
+        # Admission control
+        # -------------------------------------
+        if max_concurrency is None:
+            if any(x is not None for x in (queue_timeout, adaptive_concurrency, retry_after)):
+                raise ConfigurationError(f'View {view} configures admission control without max_concurrency.')
+            admission = None
+        else:
+            if not isinstance(max_concurrency, int) or max_concurrency < 1:
+                raise ConfigurationError(f'View {view} has an invalid max_concurrency: {max_concurrency}. '
+                                         f'Expected a positive integer.')
+            admission = AdmissionPolicy(max_concurrency=max_concurrency,
+                                        queue_timeout=queue_timeout or 0.0,
+                                        adaptive=bool(adaptive_concurrency),
+                                        retry_after=1 if retry_after is None else retry_after)
+
+        # Deadlines
+        # -------------------------------------
+        if deadline is not None and (not isinstance(deadline, (int, float)) or deadline <= 0):
+            raise ConfigurationError(f'View {view} has an invalid deadline: {deadline}. '
+                                     f'Expected a positive number of seconds.')
+
+        # Response cache
+        # -------------------------------------
+        if cache is None:
+            if cache_vary is not None or cache_tags is not None:
+                raise ConfigurationError(f'View {view} configures response cache without a cache TTL.')
+            cache_policy = None
+        else:
+            if isinstance(cache, bool) or not isinstance(cache, (int, float)) or cache <= 0:
+                raise ConfigurationError(f'View {view} has an invalid cache TTL: {cache}. '
+                                         f'Expected a positive number of seconds.')
+            if isinstance(cache_vary, str) or isinstance(cache_tags, str):
+                raise ConfigurationError(f'View {view} expects sequences of strings as cache_vary and cache_tags.')
+            cache_policy = CachePolicy(ttl=cache,
+                                       vary=tuple(cache_vary or ()),
+                                       tags=frozenset(cache_tags or ()))
+
+        # Conditional requests
+        # -------------------------------------
+        if etag is not None and not isinstance(etag, bool) and not callable(etag):
+            raise ConfigurationError(f'View {view} has an invalid etag option: {etag}. '
+                                     f'Expected True or an ETag function.')
+        if last_modified is not None and not callable(last_modified):
+            raise ConfigurationError(f'View {view} has an invalid last_modified option: {last_modified}. '
+                                     f'Expected a function.')
+
+        # Compression
+        # -------------------------------------
+        if not compress:
+            if compress_min_size is not None or compress_level is not None:
+                raise ConfigurationError(f'View {view} configures compression without compress=True.')
+            compression = None
+        else:
+            compression = CompressionPolicy(min_size=1024 if compress_min_size is None else compress_min_size,
+                                            level=6 if compress_level is None else compress_level)
+            if compression.level not in range(1, 10):
+                raise ConfigurationError(f'View {view} has an invalid compress_level: {compress_level}. '
+                                         f'Expected an integer from 1 to 9.')
+
         # Done
         # -------------------------------------
         view_item = ViewMeta(route_name=route_name,
@@ -114,7 +233,14 @@ class ViewsConfigurator:
                              renderer=renderer,
                              predicates=preds,
                              is_django_generic_view=is_django_generic_view,
-                             is_drf_model_viewset=is_drf_model_viewset)
+                             is_drf_model_viewset=is_drf_model_viewset,
+                             coalesce=coalesce or None,
+                             admission=admission,
+                             deadline=deadline,
+                             cache=cache_policy,
+                             etag=etag,
+                             last_modified=last_modified,
+                             compression=compression)
 
         log.debug(f'View added: {view_item}')
         return view_item
@@ -4,7 +4,8 @@ from typing import Dict, List, Optional
 from .configurator import Configurator
 
 
-def setup(package: str, apps: Dict[str, List[Dict[str, str]]], namespace='frameapp', ignore: Optional[List[str]] = None) -> Configurator:
+def setup(package: str, apps: Dict[str, List[Dict[str, str]]], namespace='frameapp', ignore: Optional[List[str]] = None,
+          lint: Optional[str] = None) -> Configurator:
     configurator = Configurator()
 
     for app_name, entry_points in apps.items():
@@ -23,7 +24,8 @@ def setup(package: str, apps: Dict[str, List[Dict[str, str]]], namespace='framea
     configurator.scan(
         package=package,
         namespace=namespace,
-        ignore=ignore
+        ignore=ignore,
+        lint=lint
     )
     registry = configurator.freeze()
     return configurator
@@ -0,0 +1,112 @@
+""" Per-endpoint admission control.
+
+Limiters are consulted by :class:`frameapp.ext.django_integration.view.PredicatedHandler` after predicates
+have matched and before the view handler is called. Requests that cannot be admitted within the queue-time budget
+are shed with "503 Service Unavailable", so that cheap endpoints don't time out behind slow ones.
+"""
+import math
+import threading
+import time
+
+from django.http.response import HttpResponse as DjangoResponse
+
+from frameapp.configurator.routes import AdmissionPolicy
+
+
+class ConcurrencyLimiter:
+    """ A counting semaphore with a bounded waiting time.
+    """
+    __slots__ = ('policy', 'limit', 'active', 'condition')
+
+    def __init__(self, policy: AdmissionPolicy) -> None:
+        self.policy = policy
+        self.limit = policy.max_concurrency
+        self.active = 0
+        self.condition = threading.Condition(threading.Lock())
+
+    def acquire(self, timeout: float) -> bool:
+        """ Returns False if a slot could not be acquired within ``timeout`` seconds.
+        """
+        with self.condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if timeout <= 0:
+                return False
+            expires_at = time.monotonic() + timeout
+            while self.active >= self.limit:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            self.active += 1
+            return True
+
+    def release(self, latency: float) -> None:
+        """
+        :param latency: time in seconds that the admitted request spent in the view handler
+        """
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(limit={self.limit}, active={self.active})'
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    """ A limiter that tunes its limit from observed latencies, within ``[1, policy.max_concurrency]``.
+
+    The limit shrinks proportionally when latency grows relative to the best latency observed recently
+    (which is a sign of queueing somewhere downstream), and grows by a square root of itself
+    while latency stays close to the best one.
+    """
+    __slots__ = ('estimated_limit', 'min_latency', 'samples')
+
+    # Latencies within this ratio of the best observed latency are not considered queueing
+    TOLERANCE = 1.5
+    # The best observed latency is re-probed periodically, so that the limiter adapts to
+    # permanent changes of an endpoint's cost
+    MIN_LATENCY_WINDOW = 1000
+
+    def __init__(self, policy: AdmissionPolicy) -> None:
+        super().__init__(policy)
+        self.estimated_limit = float(policy.max_concurrency)
+        self.min_latency = math.inf
+        self.samples = 0
+
+    def release(self, latency: float) -> None:
+        with self.condition:
+            self.active -= 1
+            self.samples += 1
+            if self.samples >= self.MIN_LATENCY_WINDOW:
+                self.samples = 0
+                self.min_latency = latency
+            elif latency < self.min_latency:
+                self.min_latency = latency
+
+            if latency > 0:
+                gradient = max(0.5, min(1.0, self.TOLERANCE * self.min_latency / latency))
+            else:
+                gradient = 1.0
+            estimated_limit = self.estimated_limit * gradient + math.sqrt(self.estimated_limit)
+            self.estimated_limit = max(1.0, min(float(self.policy.max_concurrency), estimated_limit))
+
+            previous_limit = self.limit
+            self.limit = int(self.estimated_limit)
+            if self.limit > previous_limit:
+                self.condition.notify(self.limit - previous_limit + 1)
+            else:
+                self.condition.notify()
+
+
+def limiter_for(policy: AdmissionPolicy) -> ConcurrencyLimiter:
+    if policy.adaptive:
+        return AdaptiveConcurrencyLimiter(policy)
+    return ConcurrencyLimiter(policy)
+
+
+def service_unavailable_response(policy: AdmissionPolicy) -> DjangoResponse:
+    response = DjangoResponse(status=503)
+    response['Retry-After'] = str(policy.retry_after)
+    return response
@@ -0,0 +1,256 @@
+""" Batch endpoint that dispatches many sub-requests in one HTTP call.
+
+Install it next to the generated URL patterns:
+
+.. code-block:: python
+
+    # urls.py
+    from frameapp.ext.django_integration.url import django_url_patterns
+    from frameapp.ext.django_integration.batch import django_batch_url_pattern
+
+    frameapp_urls = django_url_patterns('myapp', config)
+    urlpatterns = frameapp_urls + [django_batch_url_pattern(frameapp_urls)]
+
+The endpoint accepts a POST request with a JSON body:
+
+.. code-block:: json
+
+    {
+        "parallel": false,
+        "requests": [
+            {"method": "GET", "path": "/v1.0/users/me"},
+            {"method": "POST", "path": "/v1.0/events", "body": {"type": "screen_open"}, "headers": {"X-Foo": "bar"}}
+        ]
+    }
+
+Sub-requests inherit headers, cookies and the authenticated user of the batch request, and go through the same
+predicates and renderers as standalone requests. Middlewares are not re-applied to sub-requests, except for
+the CSRF check: when ``CsrfViewMiddleware`` is installed, sub-requests to views that are not CSRF exempt are
+checked with the CSRF token of the batch request. ``Accept-Encoding`` is not inherited, sub-responses are never
+compressed: they are embedded into the batch response, which can be compressed as a whole instead.
+The batch request itself must be ``application/json``.
+With ``"parallel": true`` sub-requests are dispatched on a thread pool, and the client is responsible for
+them being independent of each other. Responses are returned in the order of sub-requests:
+
+.. code-block:: json
+
+    {"responses": [{"status": 200, "headers": {"Content-Type": "application/json"}, "body": {...}}, ...]}
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import List, NamedTuple, Dict, Any, Optional
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import Http404, QueryDict
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse, HttpResponseBase
+from django.urls import URLPattern, Resolver404
+from django.urls.resolvers import RegexPattern, URLResolver
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.module_loading import import_string
+
+from frameapp.configurator.renderers import encode_json
+from frameapp.configurator.routes import header_meta_key
+from frameapp.ext.django_integration.middleware import assign_api_version
+
+
+log = logging.getLogger(__name__)
+
+
+# Request attributes populated by common middlewares that sub-requests should share with the batch request
+INHERITED_REQUEST_ATTRIBUTES = ('user', 'auth', 'session', 'COOKIES', '_dont_enforce_csrf_checks')
+
+# Bodies of sub-responses are embedded into the JSON envelope, therefore they must not be content-encoded
+UNINHERITED_META_KEYS = ('HTTP_ACCEPT_ENCODING',)
+
+
+class SubRequest(NamedTuple):
+    method: str
+    path: str
+    body: bytes
+    headers: Dict[str, str]
+
+
+class SubResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+    is_json: bool
+
+
+class BatchHandler:
+    def __init__(self, url_patterns: List[URLPattern], max_requests: int = 50, max_workers: Optional[int] = None) -> None:
+        # Frameapp URL patterns are generated without leading slashes
+        self.resolver = URLResolver(RegexPattern(r'^/'), url_patterns)
+        self.max_requests = max_requests
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        # Sub-requests are authenticated and CSRF-checked individually, against their own handlers
+        self.csrf_exempt = True
+        self.csrf_middleware = csrf_middleware()
+
+    def __call__(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        if request.method != 'POST':
+            response = HttpResponse(status=405)
+            response['Allow'] = 'POST'
+            return response
+
+        if request.content_type != 'application/json':
+            # Cross-site forms cannot send JSON, which makes the endpoint safe to exempt from CSRF checks
+            return HttpResponse(status=415, content=b'Batch requests must be application/json',
+                                content_type='text/plain', charset='utf-8')
+
+        try:
+            payload = json.loads(request.body.decode('utf-8'))
+            sub_requests = [parse_sub_request(item) for item in payload['requests']]
+            parallel = bool(payload.get('parallel', False))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            return HttpResponse(status=400, content=f'Malformed batch request: {e}'.encode('utf-8'),
+                                content_type='text/plain', charset='utf-8')
+
+        if len(sub_requests) > self.max_requests:
+            return HttpResponse(status=413, content=f'Too many sub-requests, max is {self.max_requests}'.encode('utf-8'),
+                                content_type='text/plain', charset='utf-8')
+
+        if parallel and len(sub_requests) > 1:
+            executor = self.get_executor()
+            results = list(executor.map(lambda r: self.dispatch_in_thread(request, r), sub_requests))
+        else:
+            results = [self.dispatch(request, r) for r in sub_requests]
+
+        return HttpResponse(status=200,
+                            content=encode_batch_response(results),
+                            content_type='application/json',
+                            charset='utf-8')
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def dispatch_in_thread(self, request: HttpRequest, sub_request: SubRequest) -> SubResponse:
+        try:
+            return self.dispatch(request, sub_request)
+        finally:
+            # Pool threads open their own database connections, they must not outlive the task
+            connections.close_all()
+
+    def dispatch(self, request: HttpRequest, sub_request: SubRequest) -> SubResponse:
+        try:
+            http_request = make_sub_request(request, sub_request)
+            match = self.resolver.resolve(http_request.path_info)
+            http_request.resolver_match = match
+            response = None
+            if self.csrf_middleware is not None:
+                self.csrf_middleware.process_request(http_request)
+                response = self.csrf_middleware.process_view(http_request, match.func, match.args, match.kwargs)
+            if response is None:
+                response = assign_api_version(http_request, match.kwargs)
+            if response is None:
+                response = match.func(http_request, *match.args, **match.kwargs)
+        except (Resolver404, Http404):
+            response = HttpResponse(status=404)
+        except PermissionDenied:
+            response = HttpResponse(status=403)
+        except Exception:
+            log.exception(f'Batch sub-request {sub_request.method} {sub_request.path} has failed')
+            response = HttpResponse(status=500)
+        return sub_response(response)
+
+
+def csrf_middleware() -> Optional[CsrfViewMiddleware]:
+    """ Returns the CSRF middleware of the project, if it's installed.
+    """
+    for path in settings.MIDDLEWARE or ():
+        middleware_cls = import_string(path)
+        if isinstance(middleware_cls, type) and issubclass(middleware_cls, CsrfViewMiddleware):
+            return middleware_cls(lambda request: None)
+    return None
+
+
+def parse_sub_request(item: Dict[str, Any]) -> SubRequest:
+    path = item['path']
+    if not isinstance(path, str) or not path.startswith('/'):
+        raise ValueError(f'sub-request path must be absolute: {path}')
+    body = item.get('body')
+    headers = item.get('headers') or {}
+    return SubRequest(method=item.get('method', 'GET').upper(),
+                      path=path,
+                      body=b'' if body is None else json.dumps(body).encode('utf-8'),
+                      headers={str(k): str(v) for k, v in headers.items()})
+
+
+def make_sub_request(request: HttpRequest, sub_request: SubRequest) -> HttpRequest:
+    path, _, query_string = sub_request.path.partition('?')
+    meta = request.META.copy()
+    meta.update({
+        'REQUEST_METHOD': sub_request.method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query_string,
+        'CONTENT_LENGTH': str(len(sub_request.body)),
+        'CONTENT_TYPE': 'application/json' if sub_request.body else '',
+    })
+    for header, value in sub_request.headers.items():
+        meta[header_meta_key(header)] = value
+    for key in UNINHERITED_META_KEYS:
+        meta.pop(key, None)
+
+    rv = HttpRequest()
+    rv.method = sub_request.method
+    rv.path = rv.path_info = path
+    rv.META = meta
+    rv.GET = QueryDict(query_string)
+    rv._body = sub_request.body
+    rv._stream = BytesIO(sub_request.body)
+    rv._read_started = False
+    for attr in INHERITED_REQUEST_ATTRIBUTES:
+        if hasattr(request, attr):
+            setattr(rv, attr, getattr(request, attr))
+    return rv
+
+
+def sub_response(response: HttpResponseBase) -> SubResponse:
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    headers = dict(response.items())
+    content_type = headers.get('Content-Type', '')
+    return SubResponse(status=response.status_code,
+                       headers=headers,
+                       content=content,
+                       is_json=content_type.startswith('application/json') and bool(content))
+
+
+def encode_batch_response(results: List[SubResponse]) -> bytes:
+    """ JSON bodies of sub-responses are embedded verbatim, without decoding and re-encoding them.
+    """
+    buf = [b'{"responses": [']
+    for i, result in enumerate(results):
+        if i:
+            buf.append(b', ')
+        buf.append(f'{{"status": {result.status}, "headers": {encode_json(result.headers)}, "body": '.encode('utf-8'))
+        if result.is_json:
+            buf.append(result.content)
+        else:
+            buf.append(encode_json(result.content.decode('utf-8', errors='replace')).encode('utf-8'))
+        buf.append(b'}')
+    buf.append(b']}')
+    return b''.join(buf)
+
+
+def django_batch_url_pattern(url_patterns: List[URLPattern],
+                             regex: str = r'^batch$',
+                             name: str = 'frameapp.batch',
+                             max_requests: int = 50,
+                             max_workers: Optional[int] = None) -> URLPattern:
+    """ Creates a URL pattern of the batch endpoint that dispatches sub-requests to ``url_patterns``.
+    """
+    callback = BatchHandler(url_patterns, max_requests=max_requests, max_workers=max_workers)
+    return URLPattern(RegexPattern(regex, is_endpoint=True), callback, None, name)
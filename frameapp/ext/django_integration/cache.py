@@ -0,0 +1,199 @@
+""" Process-wide cache of rendered responses of views that are registered with ``http_endpoint(cache=...)``.
+
+.. code-block:: python
+
+    @http_endpoint(route_name='countries', request_method='GET', cache=300, cache_tags=('geo',))
+    def get(self, request): ...
+
+Successful GET/HEAD responses are stored as immutable snapshots for the given number of seconds.
+The cache key consists of the route, the matched view variant, route arguments, API version, query string,
+the Accept header (responses are content-negotiated) and values of request headers listed in ``cache_vary``.
+Note that cached responses are served before the view is entered, i.e. before DRF authentication and permission
+checks, and that the authenticated user is not a part of the key. Views that return per-user data should list
+the relevant headers (e.g. ``Authorization``) in ``cache_vary``, and DRF views with permissions other than
+``AllowAny`` are refused at configuration time unless they do so.
+Responses that set cookies and streaming responses are never cached. Responses of views that are registered with
+``compress=True`` are stored compressed for clients that accept gzip.
+
+The cache is bounded by the total size of stored response bodies (``FRAMEAPP['RESPONSE_CACHE_MAX_SIZE']``,
+64 MiB by default) and evicts least recently used entries first. Entries can be dropped explicitly:
+
+.. code-block:: python
+
+    from frameapp.ext.django_integration.cache import get_response_cache
+
+    get_response_cache().invalidate_route('myapp', 'countries')
+    get_response_cache().invalidate_tags('geo')
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Tuple, FrozenSet, Hashable, Optional, Dict, Set
+
+from django.conf import settings
+from django.http.request import HttpRequest
+
+from frameapp.configurator.routes import CachePolicy
+from .responses import ResponseSnapshot
+
+
+log = logging.getLogger(__name__)
+
+
+CACHED_METHODS = frozenset(('GET', 'HEAD'))
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+class CacheEntry(NamedTuple):
+    snapshot: ResponseSnapshot
+    expires_at: float
+    size: int
+    route: Tuple[str, str]
+    tags: FrozenSet[str]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """ Size-bounded LRU cache of response snapshots with per-entry TTL.
+    """
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self.route_index: Dict[Tuple[str, str], Set[Hashable]] = {}
+        self.tag_index: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[ResponseSnapshot]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry.snapshot
+
+    def set(self, key: Hashable, snapshot: ResponseSnapshot, ttl: float,
+            route: Tuple[str, str], tags: FrozenSet[str] = frozenset()) -> None:
+        size = len(snapshot.content)
+        if size > self.max_size:
+            log.debug(f'Response of {route} is too large to be cached: {size} bytes')
+            return
+        entry = CacheEntry(snapshot=snapshot, expires_at=time.monotonic() + ttl, size=size, route=route, tags=tags)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = entry
+            self.size += size
+            self.route_index.setdefault(route, set()).add(key)
+            for tag in tags:
+                self.tag_index.setdefault(tag, set()).add(key)
+            while self.size > self.max_size:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate_route(self, namespace: str, route_name: str) -> int:
+        """ Drops all entries of the route, returns the number of dropped entries.
+        """
+        with self.lock:
+            keys = list(self.route_index.get((namespace, route_name), ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """ Drops all entries that have at least one of the tags, returns the number of dropped entries.
+        """
+        with self.lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self.tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.route_index.clear()
+            self.tag_index.clear()
+            self.size = 0
+
+    def stats(self) -> CacheStats:
+        with self.lock:
+            return CacheStats(hits=self.hits,
+                              misses=self.misses,
+                              evictions=self.evictions,
+                              entries=len(self.entries),
+                              size=self.size)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+        route_keys = self.route_index[entry.route]
+        route_keys.discard(key)
+        if not route_keys:
+            del self.route_index[entry.route]
+        for tag in entry.tags:
+            tag_keys = self.tag_index[tag]
+            tag_keys.discard(key)
+            if not tag_keys:
+                del self.tag_index[tag]
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                max_size = getattr(settings, 'FRAMEAPP', {}).get('RESPONSE_CACHE_MAX_SIZE', DEFAULT_MAX_SIZE)
+                _response_cache = ResponseCache(max_size=max_size)
+    return _response_cache
+
+
+def cache_key(policy: CachePolicy,
+              route: Tuple[str, str],
+              variant_index: int,
+              request: HttpRequest,
+              route_args,
+              route_kwargs,
+              content_encoding: Optional[str] = None) -> Hashable:
+    meta = request.META
+    return (
+        route,
+        variant_index,
+        request.method,
+        route_args,
+        tuple(sorted(route_kwargs.items())),
+        getattr(request, 'API_VERSION', None),
+        meta.get('QUERY_STRING', ''),
+        meta.get('HTTP_ACCEPT'),
+        content_encoding,
+        tuple(meta.get(header) for header in policy.vary_meta_keys),
+    )
@@ -0,0 +1,128 @@
+""" Single-flight execution of identical concurrent requests.
+
+Coalesced requests share the response of a single execution of the view, therefore the key must capture
+everything the response depends on. The default key includes the Accept header (responses are content-negotiated)
+and the credentials of the request (``Authorization`` and ``Cookie`` headers): views are entered only once per key,
+so authentication and permission checks of followers are the ones of the leader. Views that depend on other
+request data must be registered with a custom key.
+
+Followers wait on a :class:`threading.Event`, which suits the synchronous handlers of frameapp
+under both WSGI and ASGI, where Django runs synchronous views in threads. There is no coroutine based
+variant because frameapp has no async handlers.
+"""
+import copy
+import logging
+import math
+import threading
+from typing import Dict, Hashable, Callable, Any, Optional
+
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+
+from .responses import ResponseSnapshot
+from .deadline import Deadline, DeadlineExceeded
+
+
+log = logging.getLogger(__name__)
+
+
+COALESCED_METHODS = frozenset(('GET', 'HEAD'))
+
+
+def default_coalesce_key(request: HttpRequest, *route_args, **route_kwargs) -> Hashable:
+    meta = request.META
+    return (
+        request.method,
+        route_args,
+        tuple(sorted(route_kwargs.items())),
+        getattr(request, 'API_VERSION', None),
+        meta.get('QUERY_STRING', ''),
+        meta.get('HTTP_ACCEPT'),
+        meta.get('HTTP_AUTHORIZATION'),
+        meta.get('HTTP_COOKIE'),
+    )
+
+
+class _Flight:
+    __slots__ = ('done', 'snapshot', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.snapshot: Optional[ResponseSnapshot] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """ Makes concurrent calls with the same key wait for a single in-flight execution
+    and share its rendered response. Followers receive their own copies of the leader's response,
+    so that middlewares of different requests never share the same response object.
+    """
+    __slots__ = ('lock', 'flights')
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], HttpResponseBase], deadline: Deadline) -> HttpResponseBase:
+        while True:
+            with self.lock:
+                flight = self.flights.get(key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = self.flights[key] = _Flight()
+
+            if is_leader:
+                return self._lead(key, flight, fn)
+
+            remaining = deadline.remaining()
+            if not flight.done.wait(None if remaining == math.inf else max(remaining, 0)):
+                raise DeadlineExceeded()
+            error = flight.error
+            if error is not None:
+                if isinstance(error, DeadlineExceeded) or not isinstance(error, Exception):
+                    # The leader ran out of its own time or was interrupted,
+                    # the follower takes over if it has time left
+                    deadline.check()
+                    log.debug(f'Retrying a coalesced request for {key} after {error!r} of the leader')
+                    continue
+                raise follower_error(error) from error
+            if flight.snapshot is None:
+                # The leader's response cannot be shared (streaming, or it sets cookies)
+                return fn()
+            log.debug(f'Sharing a coalesced response for {key}')
+            return flight.snapshot.to_response()
+
+    def _lead(self, key: Hashable, flight: _Flight, fn: Callable[[], HttpResponseBase]) -> HttpResponseBase:
+        try:
+            response = fn()
+            flight.snapshot = ResponseSnapshot.from_response(response)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return response
+
+
+class CoalescedRequestFailed(Exception):
+    """ Raised by a follower when the leader's exception cannot be copied.
+    """
+
+
+def follower_error(error: Exception) -> Exception:
+    """ Returns an exception of the same type as the leader's one for a follower to raise.
+    Every follower raises its own instance, so that tracebacks and attributes set by exception handlers
+    of one request never leak into another.
+    """
+    try:
+        return copy.copy(error)
+    except Exception:
+        return CoalescedRequestFailed(f'Coalesced request failed with {error!r}')
+
+
+def coalesce_key(coalesce: Any, request: HttpRequest, route_args, route_kwargs) -> Hashable:
+    if callable(coalesce):
+        return coalesce(request, *route_args, **route_kwargs)
+    return default_coalesce_key(request, *route_args, **route_kwargs)
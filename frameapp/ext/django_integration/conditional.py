@@ -0,0 +1,56 @@
+""" Conditional requests of views that are registered with ``http_endpoint(etag=..., last_modified=...)``.
+
+Validator functions accept the same arguments as the view and are evaluated before the view is called,
+so that polling clients receive "304 Not Modified" without the view and renderer doing any work:
+
+.. code-block:: python
+
+    @http_endpoint(route_name='feed', request_method='GET',
+                   etag=lambda request, *args, **kwargs: str(Feed.objects.latest_revision()))
+    def get(self, request): ...
+
+``etag=True`` computes a strong ETag from the rendered response instead. This saves bandwidth only, but works
+for any view, and the ETag is stored along with cached responses (see :mod:`frameapp.ext.django_integration.cache`).
+"""
+from calendar import timegm
+from typing import Optional, Tuple
+
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import quote_etag, set_response_etag
+
+from frameapp.configurator.routes import ViewVariant
+
+
+SAFE_METHODS = frozenset(('GET', 'HEAD'))
+
+
+def evaluate_validators(view_variant: ViewVariant,
+                        request: HttpRequest,
+                        route_args,
+                        route_kwargs) -> Tuple[Optional[str], Optional[int]]:
+    """ Returns a quoted ETag and a Last-Modified timestamp of the requested resource,
+    either of them is None if it's unknown.
+    """
+    etag = None
+    if callable(view_variant.etag):
+        etag = view_variant.etag(request, *route_args, **route_kwargs)
+        if etag is not None:
+            etag = quote_etag(etag)
+
+    last_modified = None
+    if view_variant.last_modified is not None:
+        dt = view_variant.last_modified(request, *route_args, **route_kwargs)
+        if dt:
+            last_modified = timegm(dt.utctimetuple())
+    return etag, last_modified
+
+
+def with_content_etag(response: HttpResponseBase) -> HttpResponseBase:
+    """ Sets a strong ETag computed from the content of a successful non-streaming response.
+    """
+    if response.status_code != 200 or response.streaming or response.has_header('ETag'):
+        return response
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    return set_response_etag(response)
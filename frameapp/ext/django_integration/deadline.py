@@ -0,0 +1,100 @@
+""" Request deadlines.
+
+A deadline is either propagated by an upstream through the ``X-Request-Deadline`` header,
+which holds an absolute UNIX timestamp in seconds (fractions allowed), or is derived from a per-endpoint budget
+declared with ``http_endpoint(deadline=<seconds>)``. When both are present, the earliest one wins.
+
+:class:`frameapp.ext.django_integration.view.PredicatedHandler` checks the deadline between dispatch stages
+and exposes it to view handlers as ``request.DEADLINE``:
+
+.. code-block:: python
+
+    @http_endpoint(route_name='search', request_method='GET', deadline=2.0)
+    def get(self, request, *args, **kwargs):
+        for shard in shards:
+            request.DEADLINE.check()
+            results.extend(shard.search(timeout=request.DEADLINE.remaining()))
+"""
+import logging
+import math
+import time
+from typing import Optional
+
+from django.http.request import HttpRequest
+from django.http.response import HttpResponse as DjangoResponse
+
+
+log = logging.getLogger(__name__)
+
+
+DEADLINE_HEADER = 'HTTP_X_REQUEST_DEADLINE'
+
+
+class DeadlineExceeded(Exception):
+    """ Raised when a request cannot be completed before its deadline.
+    Handlers may raise it too, it will be turned into "504 Gateway Timeout".
+    """
+
+
+class Deadline:
+    __slots__ = ('expires_at',)
+
+    def __init__(self, expires_at: float) -> None:
+        """
+        :param expires_at: a point in time in terms of :func:`time.monotonic`
+        """
+        self.expires_at = expires_at
+
+    def remaining(self) -> float:
+        """ Number of seconds left before the deadline (may be negative).
+        """
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if time.monotonic() >= self.expires_at:
+            raise DeadlineExceeded()
+
+    def __repr__(self) -> str:
+        return f'Deadline(remaining={self.remaining():.3f}s)'
+
+
+NO_DEADLINE = Deadline(math.inf)
+
+
+def propagated_deadline(request: HttpRequest) -> Deadline:
+    """ Returns a deadline propagated by an upstream, or :data:`NO_DEADLINE`.
+    """
+    value = request.META.get(DEADLINE_HEADER)
+    if not value:
+        return NO_DEADLINE
+    try:
+        timestamp = float(value)
+    except ValueError:
+        log.debug(f'Ignoring malformed request deadline: {value}')
+        return NO_DEADLINE
+    if not math.isfinite(timestamp):
+        # "nan" would never expire, and "-inf" would expire every request
+        log.debug(f'Ignoring non-finite request deadline: {value}')
+        return NO_DEADLINE
+    return Deadline(time.monotonic() + (timestamp - time.time()))
+
+
+def effective_deadline(deadline: Deadline, started_at: float, budget: Optional[float]) -> Deadline:
+    """
+    :param deadline: deadline propagated by an upstream
+    :param started_at: :func:`time.monotonic` value at the moment the request entered dispatching
+    :param budget: per-endpoint budget in seconds
+    """
+    if budget is None:
+        return deadline
+    expires_at = started_at + budget
+    if expires_at < deadline.expires_at:
+        return Deadline(expires_at)
+    return deadline
+
+
+def gateway_timeout_response() -> DjangoResponse:
+    return DjangoResponse(status=504)
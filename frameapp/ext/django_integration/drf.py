@@ -0,0 +1,108 @@
+""" Request handling policies of DRF views, prepared once per view.
+
+DRF instantiates parsers, renderers, authenticators and permissions of a view for every request,
+and negotiates the renderer from scratch every time. Policy classes of a view don't change after the
+configuration is frozen, therefore :func:`policy_overrides` prepares their instances once, and the view
+wrappers pass them to view instances as ``initkwargs``. DRF classes themselves are not modified.
+
+Instances are shared by all requests to the view, which is safe for stock DRF policies. A view that
+overrides ``get_parsers()``, ``get_renderers()`` etc. keeps its own methods, so that's the way to opt out
+for policies that keep request state on their instances. Renderers derived from ``BrowsableAPIRenderer``
+do that, and are still instantiated per request.
+
+Renderers are selected by :class:`PreparedContentNegotiation`, which remembers results of the default
+negotiation per combination of the ``Accept`` header and the requested format.
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer
+from rest_framework.views import APIView
+
+
+log = logging.getLogger(__name__)
+
+
+# (method, attribute with the list of policy classes)
+PREPARED_POLICIES = (
+    ('get_parsers', 'parser_classes'),
+    ('get_renderers', 'renderer_classes'),
+    ('get_authenticators', 'authentication_classes'),
+    ('get_permissions', 'permission_classes'),
+)
+
+# Renderers that keep request state on their instances
+STATEFUL_RENDERERS = (BrowsableAPIRenderer,)
+
+# Different combinations of Accept headers and formats remembered per view
+MAX_NEGOTIATIONS = 256
+
+
+class PreparedContentNegotiation(DefaultContentNegotiation):
+    """ Default content negotiation that remembers its results.
+
+    A selected renderer depends on the list of renderers, the format and the Accept header only.
+    The list of renderers of a view is fixed, so the position of the selected renderer in the list
+    is remembered and looked up in the renderers of the current request.
+    """
+    def __init__(self) -> None:
+        self.selections: Dict[Tuple[Optional[str], Optional[str], str], Tuple[int, str]] = {}
+        self.lock = threading.Lock()
+
+    def select_renderer(self, request, renderers: List[BaseRenderer], format_suffix: Optional[str] = None):
+        key = (format_suffix,
+               request.query_params.get(self.settings.URL_FORMAT_OVERRIDE),
+               request.META.get('HTTP_ACCEPT', '*/*'))
+        try:
+            index, media_type = self.selections[key]
+        except KeyError:
+            # failed negotiations raise and are therefore never remembered
+            renderer, media_type = super().select_renderer(request, renderers, format_suffix)
+            index = next(i for i, r in enumerate(renderers) if r is renderer)
+            with self.lock:
+                if len(self.selections) < MAX_NEGOTIATIONS:
+                    self.selections[key] = (index, media_type)
+            return renderer, media_type
+        return renderers[index], media_type
+
+
+def is_overridden(view_cls: Type[APIView], method: str) -> bool:
+    return getattr(view_cls, method) is not getattr(APIView, method)
+
+
+def policy_overrides(view_cls: Type[APIView]) -> Dict[str, Callable[[], Any]]:
+    """ Returns ``initkwargs`` of the view that replace stock ``get_*`` methods with getters of prepared instances.
+    """
+    rv = {}
+    for method, classes_attr in PREPARED_POLICIES:
+        if is_overridden(view_cls, method):
+            continue
+        classes = list(getattr(view_cls, classes_attr))
+        if method == 'get_renderers' and any(issubclass(cls, STATEFUL_RENDERERS) for cls in classes):
+            rv[method] = mixed_renderers_getter(classes)
+        else:
+            rv[method] = shared_instances_getter([cls() for cls in classes])
+
+    if view_cls.content_negotiation_class is DefaultContentNegotiation \
+            and 'get_renderers' in rv \
+            and not is_overridden(view_cls, 'get_content_negotiator') \
+            and not is_overridden(view_cls, 'perform_content_negotiation'):
+        negotiator = PreparedContentNegotiation()
+        rv['get_content_negotiator'] = lambda: negotiator
+
+    log.debug(f'DRF view {view_cls.__qualname__} uses prepared {sorted(rv)}')
+    return rv
+
+
+def shared_instances_getter(instances: List[Any]) -> Callable[[], List[Any]]:
+    return lambda: instances
+
+
+def mixed_renderers_getter(classes: List[Type[BaseRenderer]]) -> Callable[[], List[BaseRenderer]]:
+    shared = [None if issubclass(cls, STATEFUL_RENDERERS) else cls() for cls in classes]
+
+    def get_renderers() -> List[BaseRenderer]:
+        return [cls() if instance is None else instance for cls, instance in zip(classes, shared)]
+    return get_renderers
@@ -0,0 +1,58 @@
+""" Profile of requested routes for ordering URL patterns with ``django_url_patterns(ordering='hits')``.
+
+Hits are recorded by :class:`frameapp.ext.django_integration.middleware.FrameappMiddleware`
+when ``FRAMEAPP['RECORD_ROUTE_HITS']`` is enabled, and can be saved in a production environment:
+
+.. code-block:: python
+
+    from frameapp.ext.django_integration.hits import get_route_hits
+
+    get_route_hits().dump('/var/lib/myapp/route_hits.json')
+
+and loaded when URL patterns are generated:
+
+.. code-block:: python
+
+    urlpatterns = django_url_patterns('myapp', config, group_by_prefix=True, ordering='hits',
+                                      hits=load_route_hits('/var/lib/myapp/route_hits.json'))
+"""
+import json
+import threading
+from collections import Counter
+from typing import Dict
+
+
+class RouteHits:
+    """ Numbers of requests per Django URL name.
+    """
+    def __init__(self) -> None:
+        self.counter: Counter = Counter()
+        self.lock = threading.Lock()
+
+    def record(self, url_name: str) -> None:
+        with self.lock:
+            self.counter[url_name] += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counter)
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2, sort_keys=True)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.counter.clear()
+
+
+def load_route_hits(path: str) -> Dict[str, int]:
+    with open(path) as f:
+        return json.load(f)
+
+
+_route_hits = RouteHits()
+
+
+def get_route_hits() -> RouteHits:
+    return _route_hits
@@ -1,8 +1,10 @@
 import logging
+from typing import Optional
 
 from django.http import HttpResponse
 from django.conf import settings
-from pkg_resources import parse_version
+from frameapp.configurator.predicates import parse_api_version
+from .hits import get_route_hits
 
 
 log = logging.getLogger(__name__)
@@ -12,6 +14,7 @@ class FrameappMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
         # One-time configuration and initialization.
+        self.route_hits = get_route_hits() if getattr(settings, 'FRAMEAPP', {}).get('RECORD_ROUTE_HITS') else None
 
     def __call__(self, request):
         # Code to be executed for each request before
@@ -27,11 +30,24 @@ class FrameappMiddleware:
     def process_view(self, request, view_func, view_args, view_kwargs):
         """ https://docs.djangoproject.com/en/1.11/topics/http/middleware/#process-view
         """
-        if 'version' in view_kwargs:
-            version = parse_version(view_kwargs['version'])
-            if version < settings.FRAMEAPP['MIN_API_VERSION']:
-                return HttpResponse(status=410)
-        else:
-            log.debug(f"API Version is not specified. Defaulting to {settings.FRAMEAPP['MIN_API_VERSION']}")
-            version = settings.FRAMEAPP['MIN_API_VERSION']
-        setattr(request, 'API_VERSION', version)
+        if self.route_hits is not None and request.resolver_match is not None:
+            self.route_hits.record(request.resolver_match.url_name)
+        return assign_api_version(request, view_kwargs)
+
+
+def assign_api_version(request, view_kwargs) -> Optional[HttpResponse]:
+    """ Sets ``request.API_VERSION`` from resolved view kwargs.
+    Returns "410 Gone" for versions that are not supported anymore.
+    """
+    if 'version' in view_kwargs:
+        # versioned resolvers parse the version while matching the URL
+        version = getattr(view_kwargs['version'], 'api_version', None)
+        if version is None:
+            version = parse_api_version(view_kwargs['version'])
+        if version < settings.FRAMEAPP['MIN_API_VERSION']:
+            return HttpResponse(status=410)
+    else:
+        log.debug(f"API Version is not specified. Defaulting to {settings.FRAMEAPP['MIN_API_VERSION']}")
+        version = settings.FRAMEAPP['MIN_API_VERSION']
+    setattr(request, 'API_VERSION', version)
+    return None
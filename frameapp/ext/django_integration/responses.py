@@ -0,0 +1,34 @@
+from typing import NamedTuple, Tuple, Optional
+
+from django.http.response import HttpResponse as DjangoResponse, HttpResponseBase
+
+
+class ResponseSnapshot(NamedTuple):
+    """ Immutable copy of a rendered response that can be safely shared between requests.
+    """
+    status: int
+    reason: str
+    headers: Tuple[Tuple[str, str], ...]
+    content: bytes
+
+    @classmethod
+    def from_response(cls, response: HttpResponseBase) -> Optional['ResponseSnapshot']:
+        """ Returns None for responses that must not be shared, i.e. streaming responses
+        and responses that set cookies.
+        """
+        if response.streaming or response.cookies:
+            return None
+        if hasattr(response, 'render') and not response.is_rendered:
+            # DRF responses are rendered lazily by Django's request handler,
+            # rendering them earlier is safe since render() is idempotent.
+            response.render()
+        return cls(status=response.status_code,
+                   reason=response.reason_phrase,
+                   headers=tuple(response.items()),
+                   content=response.content)
+
+    def to_response(self) -> DjangoResponse:
+        response = DjangoResponse(content=self.content, status=self.status, reason=self.reason)
+        for header, value in self.headers:
+            response[header] = value
+        return response
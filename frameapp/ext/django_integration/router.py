@@ -0,0 +1,246 @@
+""" Radix-tree resolver of frameapp routes.
+
+Django resolves a path by trying URL patterns one by one, which is linear in the number of routes.
+:class:`RadixURLResolver` installs all routes of a namespace as a single URL entry and finds candidate patterns
+by walking a tree of path segments instead:
+
+.. code-block:: python
+
+    # urls.py
+    from frameapp.ext.django_integration.router import django_radix_url_pattern
+
+    urlpatterns = [django_radix_url_pattern('myapp', config)]
+
+Static segments are looked up in a dictionary, and segments with placeholders are matched with precompiled
+segment regexes (the default ``[^/]+``, SumType alternations and custom rules). Routes that cannot be split
+into segments, i.e. rules that may match ``/`` or static parts with regex syntax in them, are kept in a list
+that is checked for every path. The candidates are verified with their original URL patterns in the order of
+registration, therefore resolution results are the same as with :func:`.url.django_url_patterns`.
+Route names are kept as well, so that ``reverse()`` works as usual.
+
+Paths of routes without placeholders are resolved once when the resolver is built, and requests to them are
+answered with a single dictionary lookup. With ``expand_sum_types=True`` routes whose placeholders all have
+SumType rules (e.g. ``/{lang}/about`` with two languages) are expanded into their finite sets of literal paths
+and resolved upfront as well.
+"""
+import inspect
+import itertools
+import logging
+import re
+from typing import Dict, List, Tuple, Optional, Iterable, Iterator, Any
+
+from django.urls import URLPattern, Resolver404, ResolverMatch
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from frameapp.configurator import Configurator
+from frameapp.configurator.sums import SumType
+from frameapp.configurator.patterns import parse_route_pattern, route_segments, Text, REGEX_SYNTAX_CHARS
+from .url import Dispatcher, django_dispatchers, create_django_route, DRF_ITEM_SEGMENT_RULE
+
+log = logging.getLogger(__name__)
+
+
+# Routes with more literal paths than this are not expanded
+MAX_EXPANDED_PATHS = 1024
+
+# Optional arguments of ResolverMatch differ between versions of Django
+RESOLVER_MATCH_PARAMETERS = frozenset(inspect.signature(ResolverMatch.__init__).parameters)
+
+
+class Node:
+    __slots__ = ('static', 'dynamic', 'endpoints')
+
+    def __init__(self) -> None:
+        self.static: Dict[str, Node] = {}
+        self.dynamic: Dict[str, Tuple['re.Pattern', Node]] = {}
+        self.endpoints: List[Tuple[int, URLPattern]] = []
+
+    def static_child(self, segment: str) -> 'Node':
+        try:
+            return self.static[segment]
+        except KeyError:
+            self.static[segment] = rv = Node()
+            return rv
+
+    def dynamic_child(self, regex: str) -> 'Node':
+        try:
+            return self.dynamic[regex][1]
+        except KeyError:
+            rv = Node()
+            self.dynamic[regex] = (re.compile(regex), rv)
+            return rv
+
+
+class RadixTree:
+    def __init__(self) -> None:
+        self.root = Node()
+        self.fallback: List[Tuple[int, URLPattern]] = []
+        self.size = 0
+        self.static_matches: Dict[str, Tuple[URLPattern, ResolverMatch]] = {}
+
+    def add(self, segments: Optional[List[Tuple[bool, str]]], url_pattern: URLPattern, item_suffix: bool = False) -> None:
+        """
+        :param segments: a list of (is_static, value) pairs, where value is either a literal segment or
+                         a segment regex. None means that the pattern has to be checked for every path.
+        :param item_suffix: whether the pattern optionally accepts one more segment (DRF viewset items)
+        """
+        entry = (self.size, url_pattern)
+        self.size += 1
+        if segments is None:
+            self.fallback.append(entry)
+            return
+        node = self.root
+        for is_static, value in segments:
+            node = node.static_child(value) if is_static else node.dynamic_child(value)
+        node.endpoints.append(entry)
+        if item_suffix:
+            node.dynamic_child(DRF_ITEM_SEGMENT_RULE).endpoints.append(entry)
+
+    def candidates(self, path: str) -> List[URLPattern]:
+        found = list(self.fallback)
+        self._walk(self.root, path.split('/'), 0, found)
+        if path.endswith('\n'):
+            # "$" of Python regexes also matches before a trailing newline
+            self._walk(self.root, path[:-1].split('/'), 0, found)
+        found.sort(key=lambda entry: entry[0])
+        return [url_pattern for _, url_pattern in found]
+
+    def match(self, path: str, tried: List[List[URLPattern]]) -> Optional[Tuple[URLPattern, ResolverMatch]]:
+        static_match = self.static_matches.get(path)
+        if static_match is not None:
+            tried.append([static_match[0]])
+            return static_match
+        for url_pattern in self.candidates(path):
+            tried.append([url_pattern])
+            sub_match = url_pattern.resolve(path)
+            if sub_match:
+                return url_pattern, sub_match
+        return None
+
+    def add_static_path(self, path: str) -> bool:
+        """ Resolves the path upfront, so that it's later matched with a dictionary lookup.
+        Returns False if the path is not resolved by any of the patterns.
+        """
+        static_match = self.match(path, [])
+        if static_match is None:
+            return False
+        self.static_matches[path] = static_match
+        return True
+
+    def _walk(self, node: Node, segments: List[str], i: int, found: List[Tuple[int, URLPattern]]) -> None:
+        if i == len(segments):
+            found.extend(node.endpoints)
+            return
+        segment = segments[i]
+        child = node.static.get(segment)
+        if child is not None:
+            self._walk(child, segments, i + 1, found)
+        for regex, child in node.dynamic.values():
+            if regex.fullmatch(segment):
+                self._walk(child, segments, i + 1, found)
+
+
+class RadixURLResolver(URLResolver):
+    def __init__(self, pattern: RegexPattern, url_patterns: List[URLPattern], tree: RadixTree) -> None:
+        super().__init__(pattern, url_patterns)
+        self.tree = tree
+
+    def resolve(self, path: str) -> ResolverMatch:
+        path = str(path)
+        match = self.pattern.match(path)
+        if not match:
+            raise Resolver404({'path': path})
+
+        new_path, args, kwargs = match
+        tried = []
+        tree_match = self.tree.match(new_path, tried)
+        if tree_match is None:
+            raise Resolver404({'tried': tried, 'path': new_path})
+
+        _, sub_match = tree_match
+        return nested_resolver_match(self, sub_match, args, kwargs, tried)
+
+
+def nested_resolver_match(resolver: URLResolver,
+                          sub_match: ResolverMatch,
+                          args: Tuple,
+                          kwargs: Dict[str, Any],
+                          tried: List[List[URLPattern]]) -> ResolverMatch:
+    """ Combines a match of a nested URL pattern with arguments matched by the resolver,
+    the same way ``URLResolver.resolve()`` does.
+    """
+    sub_match_dict = {**kwargs, **resolver.default_kwargs}
+    sub_match_dict.update(sub_match.kwargs)
+    sub_match_args = sub_match.args
+    if not sub_match_dict:
+        sub_match_args = args + sub_match.args
+    extra = {}
+    if 'route' in RESOLVER_MATCH_PARAMETERS:
+        extra['route'] = sub_match.route
+    if 'tried' in RESOLVER_MATCH_PARAMETERS:
+        extra['tried'] = tried
+    return ResolverMatch(
+        sub_match.func,
+        sub_match_args,
+        sub_match_dict,
+        sub_match.url_name,
+        [resolver.app_name] + sub_match.app_names,
+        [resolver.namespace] + sub_match.namespaces,
+        **extra
+    )
+
+
+def literal_paths(pattern: str, rules: Dict[str, SumType], expand_sum_types: bool) -> Iterator[str]:
+    """ Yields all paths matched by a route pattern, if their number is finite and known upfront.
+    """
+    choices = []
+    for node in parse_route_pattern(pattern):
+        if isinstance(node, Text):
+            if not REGEX_SYNTAX_CHARS.isdisjoint(node.value):
+                return
+            choices.append((node.value,))
+            continue
+        rule = rules.get(node.name)
+        if node.rule is not None or not expand_sum_types or not (isinstance(rule, type) and issubclass(rule, SumType)):
+            return
+        choices.append(sorted(str(value) for value in rule.values()))
+
+    total = 1
+    for values in choices:
+        total *= len(values)
+    if total > MAX_EXPANDED_PATHS:
+        log.debug(f'Route pattern "{pattern}" is not expanded: it has {total} literal paths')
+        return
+    for parts in itertools.product(*choices):
+        yield ''.join(parts)
+
+
+def radix_tree(dispatchers: List[Dispatcher], expand_sum_types: bool = False) -> Tuple[List[URLPattern], RadixTree]:
+    url_patterns = []
+    tree = RadixTree()
+    for dispatcher in dispatchers:
+        segments = route_segments(dispatcher.route_pattern.lstrip('/'), dispatcher.route_rules)
+        for url_pattern in create_django_route(dispatcher):
+            is_viewset = url_pattern.name.endswith('-drf_viewset')
+            tree.add(segments, url_pattern, item_suffix=is_viewset)
+            url_patterns.append(url_pattern)
+    log.debug(f'Radix tree is built for {tree.size} URL patterns, {len(tree.fallback)} of them are checked for every path')
+
+    # Static paths are resolved by the complete tree, so that earlier registered routes take precedence as usual
+    for dispatcher in dispatchers:
+        for path in literal_paths(dispatcher.route_pattern.lstrip('/'), dispatcher.route_rules, expand_sum_types):
+            tree.add_static_path(path)
+    log.debug(f'{len(tree.static_matches)} static paths are resolved upfront')
+    return url_patterns, tree
+
+
+def django_radix_url_pattern(namespace: str,
+                             configurator: Configurator,
+                             regex: str = r'^',
+                             expand_sum_types: bool = False) -> RadixURLResolver:
+    """ Generates a single Django URL entry that resolves all registered routes of the namespace.
+
+    :param expand_sum_types: resolve paths of routes with SumType placeholders upfront
+    """
+    url_patterns, tree = radix_tree(django_dispatchers(namespace, configurator), expand_sum_types)
+    return RadixURLResolver(RegexPattern(regex), url_patterns, tree)
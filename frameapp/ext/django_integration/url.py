@@ -2,35 +2,41 @@
 
 https://github.com/avanov/solo/blob/86695ede6f69a9a162943a4db03dd412ee3419c6/solo/configurator/url.py
 """
-import re
+import heapq
+import inspect
 import logging
-from typing import Dict, List, Tuple, NamedTuple, Any, Optional, Type
+import math
+import re
+from typing import Dict, List, Tuple, NamedTuple, Any, Optional, Type, Union, Mapping, Callable
 
-from django.http import HttpRequest
+from django.http import HttpRequest, Http404
 from django.urls import URLPattern
-from django.urls.resolvers import RegexPattern
+from django.urls.resolvers import RegexPattern, URLResolver
+from django.views.generic.base import View as DjangoGenericView
+from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
-from rest_framework import routers
 
 from frameapp.exceptions import ConfigurationError
 from frameapp.configurator import Configurator
 from frameapp.configurator.sums import SumType
 from frameapp.configurator.routes import ViewVariant
+from frameapp.configurator.patterns import (
+    parse_route_pattern, render_route_pattern, route_segments, Text, EMBEDDED_SUM_TYPE_RE
+)
 from frameapp.util import maybe_dotted
 from frameapp.ext.django_integration.view import PredicatedHandler
+from frameapp.ext.django_integration.drf import policy_overrides
 
 
 log = logging.getLogger(__name__)
 
 
-# A replacement marker in a pattern must begin with an uppercase or
-# lowercase ASCII letter or an underscore, and can be composed only
-# of uppercase or lowercase ASCII letters, underscores, and numbers.
-# For example: a, a_b, and b9 are all valid replacement marker names, but 0a is not.
-ROUTE_PATTERN_OPEN_BRACES_RE = re.compile('(?P<start_brace>\{).*')
-ROUTE_PATTERN_CLOSING_BRACES_RE = re.compile('\}.*')
-EMBEDDED_SUM_TYPE_RE = re.compile('\<(?P<sum_type>[a-zA-Z0-9_.:]+)\>')
+DRF_ITEM_SEGMENT_RULE = '[^/.]+'
+
+ORDERINGS = frozenset(('specificity', 'hits'))
+
+Segments = List[Tuple[bool, str]]
 
 
 class Dispatcher(NamedTuple):
@@ -43,81 +49,23 @@ class Dispatcher(NamedTuple):
     view_variants: List[ViewVariant]
 
 
-def _extract_braces_expression(line: str, starting_braces_re, open_braces_re, closing_braces_re):
-    """ This function is taken from Plim package: https://pypi.python.org/pypi/Plim/
-
-    :param line: may be empty
-    :param starting_braces_re:
-    :param open_braces_re:
-    :param closing_braces_re:
-    """
-    match = starting_braces_re.match(line)
-    if not match:
-        return None
-
-    open_brace = match.group('start_brace')
-    buf = [open_brace]
-    tail = line[len(open_brace):]
-    braces_counter = 1
-
-    while tail:
-        current_char = tail[0]
-        if closing_braces_re.match(current_char):
-            braces_counter -= 1
-            buf.append(current_char)
-            if braces_counter:
-                tail = tail[1:]
-                continue
-            return ''.join(buf), tail[1:]
-
-        if open_braces_re.match(current_char):
-            braces_counter += 1
-            buf.append(current_char)
-            tail = tail[1:]
-            continue
-
-        buf.append(current_char)
-        tail = tail[1:]
-    raise Exception(f"Unexpected end of a route pattern: {line}")
-
-
-extract_pattern = (lambda line: _extract_braces_expression(
-    line,
-    ROUTE_PATTERN_OPEN_BRACES_RE,
-    ROUTE_PATTERN_OPEN_BRACES_RE,
-    ROUTE_PATTERN_CLOSING_BRACES_RE
-))
-
-
 def normalize_route_pattern(pattern: str) -> Tuple[str, Dict[str, SumType]]:
+    """ Replaces embedded SumType rules ``{name:<dotted.path.to.SumType>}`` with plain ``{name}`` placeholders,
+    and returns the SumTypes as route rules.
+    """
     buf = []
     rules = {}
-    while pattern:
-        result = extract_pattern(pattern)
-        if result:
-            extracted, pattern = result
-            if ':' in extracted:
-                # Remove braces from the extracted result "{pattern[:rule]}"
-                pattern_name, rule = extracted[1:-1].split(':', 1)
-                embedded_sum_type = EMBEDDED_SUM_TYPE_RE.match(rule)
-                if embedded_sum_type:
-                    sum_type = maybe_dotted(embedded_sum_type.group('sum_type'))
-                    rules[pattern_name] = sum_type
-                    url_part = '{{{}}}'.format(pattern_name)
-                else:
-                    url_part = extracted
-            else:
-                url_part = extracted
-
-            buf.append(url_part)
+    for node in parse_route_pattern(pattern):
+        if isinstance(node, Text):
+            buf.append(node.value)
             continue
-
-        buf.append(pattern[0])
-        pattern = pattern[1:]
-
-    # Parsing is done. Now join everything together
-    buf = ''.join(buf)
-    return buf, rules
+        embedded_sum_type = node.rule is not None and EMBEDDED_SUM_TYPE_RE.match(node.rule)
+        if embedded_sum_type:
+            rules[node.name] = maybe_dotted(embedded_sum_type.group('sum_type'))
+            buf.append(f'{{{node.name}}}')
+        else:
+            buf.append(node.source)
+    return ''.join(buf), rules
 
 
 _django_rule_format = (lambda match_group_name, rule: f"(?P<{match_group_name}>{rule})")
@@ -128,40 +76,13 @@ def complete_route_pattern(pattern: str, rules: Dict[str, Type[SumType]], rule_f
     """
     :param pattern: URL pattern
     """
-    buf = []
-    while pattern:
-        result = extract_pattern(pattern)
-        if result:
-            result, pattern = result
-            # Remove braces from the result "{pattern[:rule]}"
-            result = result[1:-1]
-            if ':' in result:
-                # pattern in a "pattern_name:rule" form
-                match_group_name, rule = result.split(':', 1)
-            else:
-                # pattern in a "pattern_name" form
-                match_group_name = result
-                rule = rules.get(match_group_name)
-                if not rule:
-                    # Use default pattern
-                    rule = '[^/]+'
-                elif issubclass(rule, SumType):
-                    # Compose SumType's regex
-                    rule = '(?:{})'.format('|'.join([str(v) for v in rule.values()]))
-
-            result = rule_format(match_group_name, rule)
-            buf.append(result)
-            continue
-
-        buf.append(pattern[0])
-        pattern = pattern[1:]
-
-    # Parsing is done. Now join everything together
-    buf = ''.join(buf)
-    return buf
+    return render_route_pattern(parse_route_pattern(pattern), rules, rule_format)
 
 
-def create_django_route(dispatcher: Dispatcher) -> List[URLPattern]:
+def create_django_route(dispatcher: Dispatcher, prefix: str = '') -> List[URLPattern]:
+    """
+    :param prefix: static beginning of the route pattern that is matched by an enclosing URL resolver
+    """
     view_variants = []
     viewset_variants = []
     for view_variant in dispatcher.view_variants:
@@ -175,22 +96,22 @@ def create_django_route(dispatcher: Dispatcher) -> List[URLPattern]:
     # Prepare URLPatterns similar to http://www.django-rest-framework.org/api-guide/routers/#usage
     if view_variants:
         django_route_name = f'{dispatcher.route_namespace}.{dispatcher.route_name}'
-        pattern = dispatcher.route_pattern.lstrip('/')  # removes django warnings
+        pattern = dispatcher.route_pattern.lstrip('/')[len(prefix):]  # removes django warnings
         pattern = complete_route_pattern(pattern, dispatcher.route_rules, _django_rule_format)
         regex_pattern = f'^{pattern}$'
-        callback = PredicatedHandler(dispatcher.route_rules, view_variants)
+        callback = PredicatedHandler(dispatcher.route_rules, view_variants, dispatcher.route_namespace)
         log.debug(f'Creating Django URL "{regex_pattern}" as the handler named "{dispatcher.route_name}" in the namespace "{dispatcher.route_namespace}".')
-        rv.append(URLPattern(RegexPattern(regex_pattern, is_endpoint=True), callback, dispatcher.route_extra_kwargs, django_route_name))
+        rv.append(URLPattern(RegexPattern(regex_pattern, name=django_route_name, is_endpoint=True), callback, dispatcher.route_extra_kwargs, django_route_name))
 
     if viewset_variants:
         django_route_name = f'{dispatcher.route_namespace}.{dispatcher.route_name}-drf_viewset'
-        pattern = dispatcher.route_pattern.lstrip('/')  # removes django warnings
+        pattern = dispatcher.route_pattern.lstrip('/')[len(prefix):]  # removes django warnings
         pattern = complete_route_pattern(pattern, dispatcher.route_rules, _django_rule_format)
-        drf_pattern = '(?P<__frameapp_dynamic_viewset__>/(?P<pk>[^/.]+))?'
+        drf_pattern = f'(?P<__frameapp_dynamic_viewset__>/(?P<pk>{DRF_ITEM_SEGMENT_RULE}))?'
         regex_pattern = f'^{pattern}{drf_pattern}$'
-        callback = PredicatedHandler(dispatcher.route_rules, viewset_variants)
+        callback = PredicatedHandler(dispatcher.route_rules, viewset_variants, dispatcher.route_namespace)
         log.debug(f'Creating DRF URL "{regex_pattern}" as the handler named "{dispatcher.route_name}" in the namespace "{dispatcher.route_namespace}".')
-        rv.append(URLPattern(RegexPattern(regex_pattern, is_endpoint=True), callback, dispatcher.route_extra_kwargs, django_route_name))
+        rv.append(URLPattern(RegexPattern(regex_pattern, name=django_route_name, is_endpoint=True), callback, dispatcher.route_extra_kwargs, django_route_name))
     return rv
 
 
@@ -198,11 +119,190 @@ def generate_api_docs(configurator: Configurator):
     return ''
 
 
-def django_url_patterns(namespace: str, configurator: Configurator) -> List[URLPattern]:
+def django_url_patterns(namespace: str,
+                        configurator: Configurator,
+                        group_by_prefix: bool = False,
+                        ordering: Optional[str] = None,
+                        hits: Optional[Mapping[str, int]] = None) -> List[Union[URLPattern, URLResolver]]:
     """ Generates Django URLs from registered routes
+
+    Views may be DRF viewsets and API views, plain functions, or plain classes. Plain views skip DRF request
+    handling entirely: they receive Django requests and their results go straight to frameapp renderers.
+
+    :param group_by_prefix: nest routes that start with the same static segment into a URL resolver,
+                            so that Django skips the whole group when the segment doesn't match
+    :param ordering: either 'specificity' (patterns with fewer placeholders are tried first) or 'hits'
+                     (most requested routes are tried first). Patterns that may match the same path keep their
+                     relative order, therefore every path is resolved to the same view as without the option.
+    :param hits: numbers of requests per Django URL name, required for the 'hits' ordering.
+                 See :mod:`frameapp.ext.django_integration.hits`.
     """
-    application_routes = configurator.routes.registry[namespace]
+    return dispatchers_url_patterns(django_dispatchers(namespace, configurator), group_by_prefix, ordering, hits)
+
+
+def dispatchers_url_patterns(dispatchers: List[Dispatcher],
+                             group_by_prefix: bool = False,
+                             ordering: Optional[str] = None,
+                             hits: Optional[Mapping[str, int]] = None) -> List[Union[URLPattern, URLResolver]]:
+    if not group_by_prefix and ordering is None:
+        rv = []
+        for dispatcher in dispatchers:
+            rv += create_django_route(dispatcher=dispatcher)
+        return rv
+
+    if ordering is not None and ordering not in ORDERINGS:
+        raise ConfigurationError(f'Unknown ordering of URL patterns "{ordering}", expected one of {sorted(ORDERINGS)}')
+    if ordering == 'hits' and hits is None:
+        raise ConfigurationError('Ordering of URL patterns by hits requires a profile of hits')
+
+    routes = [RouteShape(dispatcher, route_segments(dispatcher.route_pattern.lstrip('/'), dispatcher.route_rules))
+              for dispatcher in dispatchers]
+    return arrange_url_patterns(routes, 0, '', group_by_prefix, ordering, hits or {})
+
+
+class RouteShape(NamedTuple):
+    dispatcher: Dispatcher
+    segments: Optional[Segments]
+    """ Segments of the route pattern, or None if they are unknown
+    """
+
+    @property
+    def url_names(self) -> Tuple[str, ...]:
+        name = f'{self.dispatcher.route_namespace}.{self.dispatcher.route_name}'
+        if self.is_viewset:
+            return name, f'{name}-drf_viewset'
+        return (name,)
+
+    @property
+    def is_viewset(self) -> bool:
+        return any(isinstance(v.handler, DRFViewMixinWrapper) for v in self.dispatcher.view_variants)
+
+    def shapes(self, depth: int) -> List[Optional[Segments]]:
+        """ Returns lists of segments of all paths the route may match, excluding the first ``depth`` segments
+        that are matched by enclosing resolvers.
+        """
+        if self.segments is None:
+            return [None]
+        segments = self.segments[depth:]
+        if self.is_viewset:
+            return [segments, segments + [(False, DRF_ITEM_SEGMENT_RULE)]]
+        return [segments]
+
+    def group_key(self, depth: int) -> Optional[str]:
+        if self.segments is None or len(self.segments) <= depth + 1:
+            return None
+        is_static, value = self.segments[depth]
+        return value if is_static else None
+
+
+def arrange_url_patterns(routes: List[RouteShape],
+                         depth: int,
+                         prefix: str,
+                         group_by_prefix: bool,
+                         ordering: Optional[str],
+                         hits: Mapping[str, int]) -> List[Union[URLPattern, URLResolver]]:
+    """ Builds URL patterns of routes whose first ``depth`` segments (``prefix``) are matched by enclosing resolvers.
+    """
+    entries: List[List[RouteShape]] = []
+    keys: List[Optional[str]] = []
+    open_groups: Dict[str, int] = {}
+    for route in routes:
+        key = route.group_key(depth) if group_by_prefix else None
+        if key is not None:
+            i = open_groups.get(key)
+            # A route may join an earlier group only if it cannot be shadowed by the routes that are in between
+            if i is not None and not any(entries_overlap([route], entry, depth) for entry in entries[i + 1:]):
+                entries[i].append(route)
+                continue
+            open_groups[key] = len(entries)
+        entries.append([route])
+        keys.append(key)
+
+    positions = list(range(len(entries)))
+    if ordering == 'specificity':
+        positions = constrained_order(entries, depth, lambda entry: min(specificity(route, depth) for route in entry))
+    elif ordering == 'hits':
+        positions = constrained_order(entries, depth, lambda entry: -sum(hits.get(name, 0)
+                                                                         for route in entry
+                                                                         for name in route.url_names))
     rv = []
+    for i in positions:
+        entry, key = entries[i], keys[i]
+        if key is not None and len(entry) > 1:
+            sub_prefix = f'{prefix}{key}/'
+            log.debug(f'Grouping {len(entry)} routes with the common prefix "{sub_prefix}"')
+            url_patterns = arrange_url_patterns(entry, depth + 1, sub_prefix, group_by_prefix, ordering, hits)
+            rv.append(URLResolver(RegexPattern(f'^{re.escape(key)}/'), url_patterns))
+        else:
+            rv += create_django_route(entry[0].dispatcher, prefix)
+    return rv
+
+
+def specificity(route: RouteShape, depth: int) -> Tuple[float, int]:
+    """ Routes with fewer dynamic segments come first, and then longer routes.
+    """
+    if route.segments is None:
+        return math.inf, 0
+    segments = route.segments[depth:]
+    return sum(not is_static for is_static, _ in segments), -len(segments)
+
+
+def constrained_order(entries: List[List[RouteShape]], depth: int, sort_key: Callable[[List[RouteShape]], Any]) -> List[int]:
+    """ Sorts entries by the key, keeping the original relative order of entries that may match the same path.
+    Returns positions of the entries in the new order.
+    """
+    successors: List[List[int]] = [[] for _ in entries]
+    predecessors = [0] * len(entries)
+    for j, entry in enumerate(entries):
+        for i in range(j):
+            if entries_overlap(entries[i], entry, depth):
+                successors[i].append(j)
+                predecessors[j] += 1
+
+    keys = [sort_key(entry) for entry in entries]
+    ready = [(keys[i], i) for i in range(len(entries)) if not predecessors[i]]
+    heapq.heapify(ready)
+    rv = []
+    while ready:
+        _, i = heapq.heappop(ready)
+        rv.append(i)
+        for j in successors[i]:
+            predecessors[j] -= 1
+            if not predecessors[j]:
+                heapq.heappush(ready, (keys[j], j))
+    return rv
+
+
+def entries_overlap(a: List[RouteShape], b: List[RouteShape], depth: int) -> bool:
+    return any(segments_overlap(x, y)
+               for route_a in a for x in route_a.shapes(depth)
+               for route_b in b for y in route_b.shapes(depth))
+
+
+def segments_overlap(a: Optional[Segments], b: Optional[Segments]) -> bool:
+    """ Conservatively checks whether two lists of segments may match the same path.
+    """
+    if a is None or b is None:
+        return True
+    if len(a) != len(b):
+        return False
+    for (a_is_static, a_value), (b_is_static, b_value) in zip(a, b):
+        if a_is_static and b_is_static:
+            if a_value != b_value:
+                return False
+        elif a_is_static:
+            if not re.fullmatch(b_value, a_value):
+                return False
+        elif b_is_static:
+            if not re.fullmatch(a_value, b_value):
+                return False
+    return True
+
+
+def django_dispatchers(namespace: str, configurator: Configurator) -> List[Dispatcher]:
+    """ Prepares view handlers of registered routes in the order of their registration
+    """
+    application_routes = configurator.routes.registry[namespace]
     dispatchers = []
     for route in application_routes.values():
         dispatcher = Dispatcher(
@@ -215,12 +315,25 @@ def django_url_patterns(namespace: str, configurator: Configurator) -> List[URLP
             view_variants=[]
         )
         for view_meta in route.view_metas:
-            if issubclass(view_meta.registered_view, GenericViewSet):
-                handler = DRFViewMixinWrapper(view_meta.registered_view)
-            elif issubclass(view_meta.registered_view, APIView):
-                handler = DRFAPIViewWrapper(view_meta.registered_view, view_meta.attr)
+            view = view_meta.registered_view
+            if not inspect.isclass(view):
+                # plain functions are called directly, without any wrapping
+                handler = view
+            elif issubclass(view, GenericViewSet):
+                handler = DRFViewMixinWrapper(view)
+            elif issubclass(view, APIView):
+                handler = DRFAPIViewWrapper(view, view_meta.attr)
+            elif not issubclass(view, DjangoGenericView):
+                handler = ClassViewWrapper(view, view_meta.attr)
             else:
-                raise ConfigurationError(f'Unknown type of view: {view_meta.registered_view}')
+                raise ConfigurationError(f'Unknown type of view: {view}')
+
+            if view_meta.cache is not None and not view_meta.cache.vary and requires_permissions(view):
+                raise ConfigurationError(
+                    f'View {view} of the route "{route.name}" in the namespace "{namespace}" restricts access with '
+                    f'DRF permissions, yet its cached responses would be served to every client. '
+                    f'List the headers that identify clients (e.g. Authorization or Cookie) in cache_vary.'
+                )
 
             if view_meta.decorator:
                 # apply decorators
@@ -232,28 +345,65 @@ def django_url_patterns(namespace: str, configurator: Configurator) -> List[URLP
                 handler=handler,
                 attr=view_meta.attr,
                 renderer=view_meta.renderer,
-                predicates=view_meta.predicates
+                predicates=view_meta.predicates,
+                coalesce=view_meta.coalesce,
+                admission=view_meta.admission,
+                deadline=view_meta.deadline,
+                cache=view_meta.cache,
+                etag=view_meta.etag,
+                last_modified=view_meta.last_modified,
+                compression=view_meta.compression
             )
             dispatcher.view_variants.append(view_variant)
 
         dispatchers.append(dispatcher)
 
-    for dispatcher in dispatchers:
-        rv += create_django_route(dispatcher=dispatcher)
+    return dispatchers
 
-    return rv
+
+def requires_permissions(view: Any) -> bool:
+    """ Checks whether the view is a DRF view that may deny access to some clients.
+    Cached responses are served before DRF authentication and permission checks.
+    """
+    if not inspect.isclass(view) or not issubclass(view, APIView):
+        return False
+    if view.get_permissions is not APIView.get_permissions:
+        return True
+    return any(permission is not AllowAny for permission in view.permission_classes)
+
+
+class ClassViewWrapper:
+    """ Wrap a plain class into a callable object that instantiates the class for every request
+    and calls the registered method of the instance.
+
+    Requests to plain views don't go through DRF: there's no content negotiation, authentication
+    or request parsing, only frameapp predicates and renderers. The method receives the Django request
+    and route arguments, the same way functions do.
+    """
+    __slots__ = ('view_cls', 'attr', 'csrf_exempt')
+
+    def __init__(self, view_cls: type, view_attr: str) -> None:
+        self.view_cls = view_cls
+        self.attr = view_attr
+        self.csrf_exempt = getattr(getattr(view_cls, view_attr), 'csrf_exempt', False)
+
+    def __call__(self, request: HttpRequest, *args, **kwargs):
+        return getattr(self.view_cls(), self.attr)(request, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f'ClassViewWrapper(view={self.view_cls.__qualname__}.{self.attr})'
 
 
 class DRFViewMixinWrapper:
     """ Wrap DRF ViewMixin into a callable object that dispatches requests either to a collection or a item view.
     """
     def __init__(self, view_cls: Type[GenericViewSet]) -> None:
-        router = routers.SimpleRouter(trailing_slash=False)
-        router.register('', view_cls)
-        urls: Tuple[URLPattern, URLPattern] = router.urls
-        collection, item = urls
-        self.collection_handler = collection.callback
-        self.item_handler = item.callback
+        # The same views as the ones that DRF SimpleRouter generates for its list and detail routes
+        initkwargs = {'basename': viewset_basename(view_cls), **policy_overrides(view_cls)}
+        self.collection_handler = viewset_view(view_cls, VIEWSET_COLLECTION_ACTIONS,
+                                               {**initkwargs, 'detail': False, 'suffix': 'List'})
+        self.item_handler = viewset_view(view_cls, VIEWSET_ITEM_ACTIONS,
+                                         {**initkwargs, 'detail': True, 'suffix': 'Instance'})
         self.csrf_exempt = any([
             getattr(self.collection_handler, 'csrf_exempt', False),
             getattr(self.item_handler, 'csrf_exempt', False),
@@ -265,69 +415,67 @@ class DRFViewMixinWrapper:
             handler = self.item_handler
         else:
             handler = self.collection_handler
+        if handler is None:
+            # the viewset doesn't define any of the actions
+            raise Http404
         return handler(request, *args, **kwargs)
 
     def __repr__(self) -> str:
         return f'DRFViewMixinWrapper(handler=[{self.collection_handler}, {self.item_handler}])'
 
-    @staticmethod
-    def drf_frameapp_dispatch_patched_version(self: APIView, __frameapp_view_attr__: str, request, *args, **kwargs):
-        """ This portion of code is taken from DRF
-        https://github.com/encode/django-rest-framework/blob/79be20a7c68e7c90dd4d5d23a9e6ee08b5f586ae/rest_framework/views.py#L465
 
-        and then modified in order to support multiple handlers for the same request.
-        __frameapp_view_attr__ will always contain a name to a method whose predicates matched the request.
+VIEWSET_COLLECTION_ACTIONS = {'get': 'list', 'post': 'create'}
+VIEWSET_ITEM_ACTIONS = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
 
-        Original docstring:
 
-        `.dispatch()` is pretty much the same as Django's regular dispatch,
-        but with extra hooks for startup, finalize, and exception handling.
-        """
-        handler = getattr(self, __frameapp_view_attr__)
-        log.debug(f'Entering patched DRF resolver with target method "{handler}"')
-
-        self.args = args
-        self.kwargs = kwargs
-        request = self.initialize_request(request, *args, **kwargs)
-        self.request = request
-        self.headers = self.default_response_headers  # deprecate?
+def viewset_view(view_cls: Type[GenericViewSet],
+                 actions: Dict[str, str],
+                 initkwargs: Dict[str, Any]) -> Optional[Callable]:
+    actions = {method: action for method, action in actions.items() if hasattr(view_cls, action)}
+    if not actions:
+        return None
+    return view_cls.as_view(actions, **initkwargs)
 
-        try:
-            self.initial(request, *args, **kwargs)
-            response = handler(request, *args, **kwargs)
-        except Exception as exc:
-            response = self.handle_exception(exc)
 
-        self.response = self.finalize_response(request, response, *args, **kwargs)
-        return self.response
+def viewset_basename(view_cls: Type[GenericViewSet]) -> Optional[str]:
+    """ Returns the same basename as DRF routers do by default, if the viewset has a queryset.
+    """
+    queryset = getattr(view_cls, 'queryset', None)
+    if queryset is None:
+        return None
+    return queryset.model._meta.object_name.lower()
 
 
 class DRFAPIViewWrapper:
     """ Wrap DRF APIView into a callable object that dispatches requests based on view attribute name.
     """
     def __init__(self, view_cls: Type[APIView], view_attr: str) -> None:
+        self.view_cls = view_cls
         self.attr = view_attr
-        view_cls.dispatch = _drf_frameapp_dispatch_patched_version  # this has a global side-effect, not good enough
-
-        self.handler = view_cls.as_view()
-        self.csrf_exempt = getattr(self.handler, 'csrf_exempt', False)
-        # Let's monkey-patch this view class with a b/w compatible .dispatch() method that understands
-        # how to dispatch to predicated methods, and then let's generate an actual view handler.
-        self.handler.dispatch = _drf_frameapp_dispatch_patched_version
+        self.initkwargs = policy_overrides(view_cls)
+        # DRF API views are always CSRF exempt, see APIView.as_view()
+        self.csrf_exempt = True
 
     def __call__(self, request, *args, **kwargs):
-        # DRF GenericViewSet is similar to DRF ModelViewSet, yet we have an extra step here.
-        # The handler will call a patched version of DRFs .dispatch() method that will pass data to the correct method.
+        # Instead of DRF's .dispatch(), the view instance is handled by a version of it that calls the method
+        # whose predicates matched the request. The instance is set up the same way as in View.as_view().
 
         # Note however, that by the time DRF is in action, we have matched all the required predicates.
         # Best of the two worlds!
-        return self.handler(self.attr, request, *args, **kwargs)
+        view = self.view_cls(**self.initkwargs)
+        # View.setup() only exists since Django 2.2
+        if hasattr(view, 'get') and not hasattr(view, 'head'):
+            view.head = view.get
+        view.request = request
+        view.args = args
+        view.kwargs = kwargs
+        return _drf_frameapp_dispatch(view, self.attr, request, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f'DRFAPIViewWrapper(view={self.view_cls.__qualname__}.{self.attr})'
 
 
-# Note: DRF API Views are made CSRF exempt from within `as_view` as to prevent
-# accidental removal of this exemption in cases where `dispatch` needs to
-# be overridden.
-def _drf_frameapp_dispatch_patched_version(self: APIView, __frameapp_view_attr__: str, request, *args, **kwargs):
+def _drf_frameapp_dispatch(self: APIView, __frameapp_view_attr__: str, request, *args, **kwargs):
     """ This portion of code is taken from DRF
     https://github.com/encode/django-rest-framework/blob/79be20a7c68e7c90dd4d5d23a9e6ee08b5f586ae/rest_framework/views.py#L465
 
@@ -340,7 +488,7 @@ def _drf_frameapp_dispatch_patched_version(self: APIView, __frameapp_view_attr__
     but with extra hooks for startup, finalize, and exception handling.
     """
     handler = getattr(self, __frameapp_view_attr__)
-    log.debug(f'Entering patched DRF resolver with target method "{handler}"')
+    log.debug(f'Entering DRF dispatch with target method "{handler}"')
 
     self.args = args
     self.kwargs = kwargs
@@ -0,0 +1,175 @@
+""" Versioned namespaces of routes.
+
+Routes of versioned APIs start with a version segment, e.g. ``/v{version:[0-9]+\\.[0-9]+}/users``.
+Instead of matching the segment again with every route regex, :func:`django_versioned_url_patterns` installs
+all versioned routes of a namespace under a single :class:`VersionedURLResolver`:
+
+.. code-block:: python
+
+    # urls.py
+    from frameapp.ext.django_integration.versioning import django_versioned_url_patterns
+
+    urlpatterns = django_versioned_url_patterns('myapp', config, versions=['1.0', '1.1', '2.0'])
+
+The resolver matches the version segment once, parses it into an API version object that is shared by all
+requests of that version, and resolves the rest of the path with route patterns that don't contain the version
+segment. Views still receive the ``version`` argument as a string, which carries the parsed version for
+:func:`frameapp.ext.django_integration.middleware.assign_api_version`. ``reverse()`` works as usual.
+
+For every version listed in ``versions`` the resolver keeps a separate table of routes that only contains
+routes and view variants whose ``api_version`` predicates accept that version. Note that a path of a route
+that doesn't exist in the requested version is therefore resolved by the next matching route, if there is one,
+instead of failing on predicates. Other versions are resolved with the complete table.
+"""
+import logging
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Union, Mapping, Iterable, Tuple
+
+from django.urls import URLPattern, Resolver404, ResolverMatch
+from django.urls.resolvers import RegexPattern, URLResolver
+from pkg_resources.extern.packaging.version import Version
+
+from frameapp.exceptions import ConfigurationError
+from frameapp.configurator import Configurator
+from frameapp.configurator.routes import ViewVariant
+from frameapp.configurator.predicates import ApiVersionPredicate, parse_api_version
+from frameapp.configurator.patterns import parse_route_pattern, Placeholder, Text, DEFAULT_RULE
+from frameapp.configurator.util import Notted
+from .url import Dispatcher, django_dispatchers, dispatchers_url_patterns
+from .router import nested_resolver_match
+
+
+log = logging.getLogger(__name__)
+
+
+VERSION_ARGUMENT = 'version'
+
+
+class VersionArgument(str):
+    """ Value of the version argument of views, along with the parsed API version
+    """
+    api_version: Version
+
+
+@lru_cache(maxsize=256)
+def version_argument(version: str) -> VersionArgument:
+    rv = VersionArgument(version)
+    rv.api_version = parse_api_version(version)
+    return rv
+
+
+class VersionedURLResolver(URLResolver):
+    def __init__(self,
+                 pattern: RegexPattern,
+                 url_patterns: List[Union[URLPattern, URLResolver]],
+                 version_tables: Dict[str, List[Union[URLPattern, URLResolver]]]) -> None:
+        """
+        :param url_patterns: patterns of all versioned routes, relative to the version segment
+        :param version_tables: patterns of routes that exist in particular versions
+        """
+        super().__init__(pattern, url_patterns)
+        self.default_table = URLResolver(RegexPattern(r'^'), url_patterns)
+        self.version_tables = {
+            version: URLResolver(RegexPattern(r'^'), table) for version, table in version_tables.items()
+        }
+
+    def resolve(self, path: str) -> ResolverMatch:
+        path = str(path)
+        match = self.pattern.match(path)
+        if not match:
+            raise Resolver404({'path': path})
+
+        new_path, args, kwargs = match
+        version = kwargs[VERSION_ARGUMENT] = version_argument(kwargs[VERSION_ARGUMENT])
+        table = self.version_tables.get(version, self.default_table)
+        sub_match = table.resolve(new_path)
+        return nested_resolver_match(self, sub_match, args, kwargs, getattr(sub_match, 'tried', None) or [])
+
+
+def split_version_segment(pattern: str) -> Optional[Tuple[str, str]]:
+    """ Returns the rule of the version placeholder and the rest of the pattern,
+    or None if the pattern doesn't start with a version segment.
+    """
+    nodes = parse_route_pattern(pattern.lstrip('/'))
+    if len(nodes) < 3:
+        return None
+    head, version, tail = nodes[:3]
+    if head != Text('v') \
+            or not isinstance(version, Placeholder) or version.name != VERSION_ARGUMENT \
+            or not isinstance(tail, Text) or not tail.value.startswith('/'):
+        return None
+    rest = [tail.value[1:]]
+    rest.extend(node.value if isinstance(node, Text) else node.source for node in nodes[3:])
+    return version.rule or DEFAULT_RULE, ''.join(rest)
+
+
+def accepts_version(view_variant: ViewVariant, version: str) -> bool:
+    request = SimpleNamespace(API_VERSION=parse_api_version(version))
+    for predicate in view_variant.predicates:
+        inner = predicate.predicate if isinstance(predicate, Notted) else predicate
+        if isinstance(inner, ApiVersionPredicate) and not predicate(None, request):
+            return False
+    return True
+
+
+def version_table(dispatchers: List[Dispatcher], version: str) -> List[Dispatcher]:
+    rv = []
+    for dispatcher in dispatchers:
+        view_variants = [v for v in dispatcher.view_variants if accepts_version(v, version)]
+        if view_variants:
+            rv.append(dispatcher._replace(view_variants=view_variants))
+    return rv
+
+
+def django_versioned_url_patterns(namespace: str,
+                                  configurator: Configurator,
+                                  versions: Optional[Iterable[str]] = None,
+                                  group_by_prefix: bool = False,
+                                  ordering: Optional[str] = None,
+                                  hits: Optional[Mapping[str, int]] = None) -> List[Union[URLPattern, URLResolver]]:
+    """ Generates Django URLs of registered routes, where routes that start with a version segment
+    are installed under a single :class:`VersionedURLResolver` in place of the first of them.
+
+    :param versions: API versions that get their own tables of routes
+    :param group_by_prefix: see :func:`.url.django_url_patterns`
+    :param ordering: see :func:`.url.django_url_patterns`
+    :param hits: see :func:`.url.django_url_patterns`
+    """
+    entries: List[Union[Dispatcher, None]] = []
+    versioned = []
+    version_rule = None
+    for dispatcher in django_dispatchers(namespace, configurator):
+        split = split_version_segment(dispatcher.route_pattern)
+        if split is None:
+            entries.append(dispatcher)
+            continue
+        rule, rest = split
+        if version_rule is None:
+            version_rule = rule
+            # the versioned resolver takes the place of the first versioned route
+            entries.append(None)
+        elif rule != version_rule:
+            raise ConfigurationError(f'Route "{dispatcher.route_name}" in the namespace "{namespace}" has a version '
+                                     f'rule "{rule}" that differs from the rule of other routes: "{version_rule}"')
+        versioned.append(dispatcher._replace(route_pattern=rest))
+
+    rv = []
+    pending = []
+    for entry in entries:
+        if entry is not None:
+            pending.append(entry)
+            continue
+        rv += dispatchers_url_patterns(pending, group_by_prefix, ordering, hits)
+        pending = []
+        version_tables = {
+            version: dispatchers_url_patterns(version_table(versioned, version), group_by_prefix, ordering, hits)
+            for version in versions or ()
+        }
+        log.debug(f'Creating a versioned resolver of {len(versioned)} routes in the namespace "{namespace}" '
+                  f'with separate tables for versions {sorted(version_tables)}')
+        rv.append(VersionedURLResolver(RegexPattern(f'^v(?P<{VERSION_ARGUMENT}>{version_rule})/'),
+                                       dispatchers_url_patterns(versioned, group_by_prefix, ordering, hits),
+                                       version_tables))
+    rv += dispatchers_url_patterns(pending, group_by_prefix, ordering, hits)
+    return rv
@@ -1,14 +1,30 @@
+import inspect
 import logging
-from typing import List, Dict, Union, Optional
+import time
+from typing import Any, List, Dict, Union, Optional, FrozenSet
 
 from django.http.request import HttpRequest as DjangoRequest
-from django.http.response import HttpResponse as DjangoResponse
+from django.http.response import HttpResponse as DjangoResponse, HttpResponseBase
+from django.utils.cache import patch_vary_headers, get_conditional_response
+from django.utils.http import http_date
 from django.http import Http404 as HTTPNotFound
 from rest_framework.request import Request as DRFRequest
 from rest_framework.response import Response as DRFResponse
+from rest_framework.views import APIView
 
 from frameapp.configurator.routes import ViewVariant
+from frameapp.configurator.renderers import accepts_encoding, compress_response
 from frameapp.configurator.sums import SumType
+from frameapp.configurator.predicates import RequestMethodPredicate
+from frameapp.configurator.util import Notted
+from frameapp.ext.django_integration.coalesce import SingleFlight, COALESCED_METHODS, coalesce_key
+from frameapp.ext.django_integration.admission import limiter_for, service_unavailable_response
+from frameapp.ext.django_integration.deadline import (
+    DeadlineExceeded, propagated_deadline, effective_deadline, gateway_timeout_response
+)
+from frameapp.ext.django_integration.cache import CACHED_METHODS, cache_key, get_response_cache
+from frameapp.ext.django_integration.responses import ResponseSnapshot
+from frameapp.ext.django_integration.conditional import SAFE_METHODS, evaluate_validators, with_content_etag
 
 
 log = logging.getLogger(__name__)
@@ -18,21 +34,96 @@ HttpRequest = Union[DjangoRequest, DRFRequest]
 HttpResponse = Union[DjangoResponse, DRFResponse]
 
 
+DEFAULT_REQUEST_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS'))
+
+
+def allowed_request_methods(view_variants: List[ViewVariant]) -> Optional[FrozenSet[str]]:
+    """ Returns a set of request methods accepted by at least one of the view variants,
+    or None if there's a variant that doesn't restrict request methods at all.
+    """
+    allowed = set()
+    for view_variant in view_variants:
+        for predicate in view_variant.predicates:
+            if isinstance(predicate, RequestMethodPredicate):
+                allowed.update(predicate.val)
+                break
+            if isinstance(predicate, Notted) and isinstance(predicate.predicate, RequestMethodPredicate):
+                # Inverted predicates accept any non-standard method too
+                return None
+        else:
+            return None
+    return frozenset(allowed)
+
+
+def is_drf_view(view: Any) -> bool:
+    return inspect.isclass(view) and issubclass(view, APIView)
+
+
+def answers_options_explicitly(view_variants: List[ViewVariant]) -> bool:
+    """ Returns True if at least one of the view variants accepts OPTIONS and answers it itself:
+    either OPTIONS was requested explicitly rather than as a part of the default set of methods,
+    or the variant is a DRF view, which responds to OPTIONS with the metadata of the view.
+    """
+    for view_variant in view_variants:
+        for predicate in view_variant.predicates:
+            if isinstance(predicate, RequestMethodPredicate):
+                if 'OPTIONS' in predicate.val and (set(predicate.val) != DEFAULT_REQUEST_METHODS
+                                                   or is_drf_view(view_variant.registered_view)):
+                    return True
+                break
+    return False
+
+
 class PredicatedHandler:
     """ Wrapper object around actual view handlers that checks predicates during the request
     and processes results returned from view handlers during the response.
     """
-    __slots__ = ['rules', 'view_variants', 'csrf_exempt']
+    __slots__ = ['rules', 'view_variants', 'csrf_exempt', 'allowed_methods', 'allow_header', 'answer_options',
+                 'single_flights', 'limiters', 'namespace', 'variant_indices', 'sum_variants']
 
-    def __init__(self, rules: Dict[str, SumType], view_variants: List[ViewVariant]) -> None:
+    def __init__(self, rules: Dict[str, SumType], view_variants: List[ViewVariant], namespace: str = '') -> None:
+        self.namespace = namespace
         self.view_variants = view_variants
-        # Note that the entire PredicatedHandler will be CSRF-exempt if at least one handler is exempt.
-        # This is not the ideal solution, yet it allows us to encapsulate the logic inside this object
-        # instead of implementing csrf check on individual handlers in the middleware, when predicates are matched
-        # and the final handler is known.
-        # Most of the time it's what we need anyway, because we don't put non-api views inside DRF APIView subclasses.
-        self.csrf_exempt = any(getattr(v.handler, 'csrf_exempt', False) for v in view_variants)
+        # CSRF middleware checks the whole PredicatedHandler before predicates pick a variant, therefore
+        # the handler is exempt only if all of its variants are. DRF API views are always exempt and enforce
+        # CSRF for session-authenticated requests themselves, plain views rely on the middleware.
+        self.csrf_exempt = all(getattr(v.handler, 'csrf_exempt', False) for v in view_variants)
         self.rules = rules
+        # Route arguments are strings, SumType variants are looked up by their string values
+        self.sum_variants = {
+            name: {str(value): rule.__sum_meta__.variants[variant_name]
+                   for value, variant_name in rule.__sum_meta__.values.items()}
+            for name, rule in rules.items()
+            if isinstance(rule, type) and issubclass(rule, SumType)
+        }
+        # The set of allowed methods is known upfront, therefore wrong-method requests can be answered
+        # without evaluating predicates or entering view code (including DRF dispatch). So can OPTIONS,
+        # unless one of the variants answers it itself, e.g. DRF views with their metadata.
+        self.allowed_methods = allowed_request_methods(view_variants)
+        if self.allowed_methods is None:
+            self.allow_header = None
+            self.answer_options = False
+        else:
+            self.allow_header = ', '.join(sorted(self.allowed_methods | {'OPTIONS'}))
+            self.answer_options = not answers_options_explicitly(view_variants)
+        # Concurrent identical requests to coalescing variants share a single in-flight execution
+        self.single_flights = {id(v): SingleFlight() for v in view_variants if v.coalesce}
+        self.limiters = {id(v): limiter_for(v.admission) for v in view_variants if v.admission}
+        # Variants are distinguished in cache keys by their position
+        self.variant_indices = {id(v): i for i, v in enumerate(view_variants) if v.cache}
+
+    def options_response(self) -> DjangoResponse:
+        # Middlewares are free to mutate responses (CORS headers, cookies etc.), therefore
+        # we only prebuild the header value and hand out a fresh response object every time.
+        response = DjangoResponse(status=200)
+        response['Allow'] = self.allow_header
+        response['Content-Length'] = '0'
+        return response
+
+    def method_not_allowed_response(self) -> DjangoResponse:
+        response = DjangoResponse(status=405)
+        response['Allow'] = self.allow_header
+        return response
 
     def match_predicates(self, request: HttpRequest) -> Optional[ViewVariant]:
         for view_variant in self.view_variants:
@@ -47,37 +138,157 @@ class PredicatedHandler:
     def __call__(self, request: HttpRequest, *route_args, **route_kwargs) -> HttpResponse:
         """ Try to resolve predicates and call a view handler on success.
         """
+        if self.allow_header is not None:
+            if request.method == 'OPTIONS' and self.answer_options:
+                return self.options_response()
+            if request.method not in self.allowed_methods:
+                log.debug(f'{request.method} is not allowed for {request.path}')
+                return self.method_not_allowed_response()
+
+        started_at = time.monotonic()
+        request.DEADLINE = propagated_deadline(request)
+        try:
+            return self.handle(request, started_at, route_args, route_kwargs)
+        except DeadlineExceeded:
+            log.debug(f'Deadline exceeded for {request.method} {request.path}')
+            return gateway_timeout_response()
+
+    def handle(self, request: HttpRequest, started_at: float, route_args, route_kwargs) -> HttpResponse:
         # here predicate is an instance object
         matched_view_variant = self.match_predicates(request)
         if matched_view_variant:
-            # All predicates match, proceed to view handler invocation
-            log.debug(f'{request.method} {request.path} will be handled by {matched_view_variant.handler}')
-            handler = matched_view_variant.handler
-            context = {}
-            rules = self.rules
-            for k, v in route_kwargs.items():
-                if k in rules:  # match SumType's case
-                    context[k] = self.rules[k].match(v)
-                else:  # regular value assignment
-                    context[k] = v
-
-            response = handler(request, *route_args, **route_kwargs)
-            #     # else:
-            #     #     # Handler is a Pyramid-like class view.
-            #     #     handler = getattr(handler(request, context), matched_view_variant.attr)
-            #     #     response = handler()
-            # else:
-            #     # handler is a simple callable
-            #     response = handler(request, context, *route_args, **route_kwargs)
-
-            if isinstance(response, DjangoResponse):
-                # Do not process standard responses
-                final_response = response
-            else:
-                renderer = matched_view_variant.renderer
-                final_response = renderer(request, response)
+            deadline = effective_deadline(request.DEADLINE, started_at, matched_view_variant.deadline)
+            request.DEADLINE = deadline
+            # Predicates include schema validation, which may take a while
+            deadline.check()
 
-            return final_response
+            if matched_view_variant.etag or matched_view_variant.last_modified:
+                return self.conditional(matched_view_variant, request, route_args, route_kwargs)
+            return self.respond(matched_view_variant, request, route_args, route_kwargs)
 
         log.debug(f'All predicates have failed for {request.method} {request.path}')
         raise HTTPNotFound()
+
+    def conditional(self, matched_view_variant: ViewVariant, request: HttpRequest, route_args, route_kwargs) -> HttpResponse:
+        etag, last_modified = evaluate_validators(matched_view_variant, request, route_args, route_kwargs)
+        response = None
+        if etag is not None or last_modified is not None:
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.respond(matched_view_variant, request, route_args, route_kwargs)
+        elif request.method in SAFE_METHODS:
+            log.debug(f'{request.method} {request.path} is not modified')
+
+        if request.method in SAFE_METHODS:
+            if last_modified and not response.has_header('Last-Modified'):
+                response['Last-Modified'] = http_date(last_modified)
+            if etag:
+                if response.has_header('Content-Encoding') and etag.startswith('"'):
+                    # the compressed representation is not byte-for-byte identical to the one the ETag identifies
+                    etag = f'W/{etag}'
+                response.setdefault('ETag', etag)
+            if matched_view_variant.etag is True and response.status_code == 200 and response.has_header('ETag'):
+                # content-based ETags are known only after the view has rendered the response
+                response = get_conditional_response(request, etag=response['ETag'], last_modified=last_modified,
+                                                    response=response)
+        return response
+
+    def respond(self, matched_view_variant: ViewVariant, request: HttpRequest, route_args, route_kwargs) -> HttpResponse:
+        if matched_view_variant.cache is not None and request.method in CACHED_METHODS:
+            return self.cached(matched_view_variant, request, route_args, route_kwargs)
+        response = self.admit(matched_view_variant, request, route_args, route_kwargs)
+        return self.compressed(matched_view_variant, request, response)
+
+    def compressed(self, matched_view_variant: ViewVariant, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        # Compression happens outside of request coalescing, because identical requests
+        # may still differ in accepted encodings
+        if matched_view_variant.compression is None:
+            return response
+        return compress_response(request, response, matched_view_variant.compression)
+
+    def cached(self, matched_view_variant: ViewVariant, request: HttpRequest, route_args, route_kwargs) -> HttpResponse:
+        policy = matched_view_variant.cache
+        route = (self.namespace, matched_view_variant.route_name)
+        content_encoding = None
+        if matched_view_variant.compression is not None and accepts_encoding(request, 'gzip'):
+            content_encoding = 'gzip'
+        key = cache_key(policy, route, self.variant_indices[id(matched_view_variant)], request, route_args, route_kwargs,
+                        content_encoding)
+        response_cache = get_response_cache()
+        snapshot = response_cache.get(key)
+        if snapshot is not None:
+            log.debug(f'{request.method} {request.path} is served from the response cache')
+            return snapshot.to_response()
+
+        response = self.admit(matched_view_variant, request, route_args, route_kwargs)
+        response = self.compressed(matched_view_variant, request, response)
+        if response.status_code == 200:
+            if policy.vary:
+                patch_vary_headers(response, policy.vary)
+            snapshot = ResponseSnapshot.from_response(response)
+            if snapshot is not None:
+                response_cache.set(key, snapshot, policy.ttl, route, policy.tags)
+        return response
+
+    def admit(self, matched_view_variant: ViewVariant, request: HttpRequest, route_args, route_kwargs) -> HttpResponse:
+        limiter = self.limiters.get(id(matched_view_variant))
+        if limiter is None:
+            return self.dispatch(matched_view_variant, request, route_args, route_kwargs)
+
+        deadline = request.DEADLINE
+        if not limiter.acquire(min(limiter.policy.queue_timeout, deadline.remaining())):
+            deadline.check()
+            log.debug(f'Shedding {request.method} {request.path}: {limiter}')
+            return service_unavailable_response(limiter.policy)
+        admitted_at = time.monotonic()
+        try:
+            return self.dispatch(matched_view_variant, request, route_args, route_kwargs)
+        finally:
+            limiter.release(time.monotonic() - admitted_at)
+
+    def dispatch(self, matched_view_variant: ViewVariant, request: HttpRequest, route_args, route_kwargs) -> HttpResponse:
+        single_flight = self.single_flights.get(id(matched_view_variant))
+        if single_flight is None or request.method not in COALESCED_METHODS:
+            return self.call_view(matched_view_variant, request, route_args, route_kwargs)
+
+        key = coalesce_key(matched_view_variant.coalesce, request, route_args, route_kwargs)
+        return single_flight.do(
+            key, lambda: self.call_view(matched_view_variant, request, route_args, route_kwargs), request.DEADLINE
+        )
+
+    def call_view(self, matched_view_variant: ViewVariant, request: HttpRequest, route_args, route_kwargs) -> HttpResponse:
+        """ Call a view handler of the matched variant and render its result.
+        """
+        # All predicates match, proceed to view handler invocation
+        log.debug(f'{request.method} {request.path} will be handled by {matched_view_variant.handler}')
+        handler = matched_view_variant.handler
+        context = {}
+        sum_variants = self.sum_variants
+        for k, v in route_kwargs.items():
+            if k in sum_variants:  # match SumType's case
+                context[k] = sum_variants[k][v]
+            else:  # regular value assignment
+                context[k] = v
+
+        request.DEADLINE.check()
+        response = handler(request, *route_args, **route_kwargs)
+        #     # else:
+        #     #     # Handler is a Pyramid-like class view.
+        #     #     handler = getattr(handler(request, context), matched_view_variant.attr)
+        #     #     response = handler()
+        # else:
+        #     # handler is a simple callable
+        #     response = handler(request, context, *route_args, **route_kwargs)
+
+        if isinstance(response, HttpResponseBase):
+            # Do not process standard (and streaming) responses
+            final_response = response
+        else:
+            request.DEADLINE.check()
+            renderer = matched_view_variant.renderer
+            final_response = renderer(request, response)
+
+        if matched_view_variant.etag is True and request.method in SAFE_METHODS:
+            final_response = with_content_etag(final_response)
+
+        return final_response
@@ -1,7 +1,8 @@
 from collections import OrderedDict
-from typing import NamedTuple, Dict
+from typing import NamedTuple, Dict, Any
 
 from .configurator.routes import Route
+from .configurator.patterns import URLTemplate
 from .configurator.sums import SumTypeMetaData
 from .structures import CompactSerializable
 
@@ -11,6 +12,18 @@ class AppRegistry(NamedTuple):
     """
     routes: Dict[str, Dict[str, Route]]
     sums: Dict[str, SumTypeMetaData]
+    url_templates: Dict[str, Dict[str, URLTemplate]]
+
+    def url_for(self, namespace: str, route_name: str, **kwargs: Any) -> str:
+        """ Builds a path of the route from its precompiled template. Arguments of SumType placeholders may be
+        either variants or their values. Raises TypeError if the arguments don't correspond to the route pattern,
+        and ConfigurationError if an argument doesn't match the rule of its placeholder.
+        """
+        try:
+            template = self.url_templates[namespace][route_name]
+        except KeyError:
+            raise KeyError(f'Route "{route_name}" is not registered in the namespace "{namespace}"')
+        return template.render(kwargs)
 
 
 class _RegistryBuilder(CompactSerializable):
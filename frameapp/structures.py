@@ -1,12 +1,26 @@
 import json
-from typing import Dict, Callable, List, Optional, Iterable, Set, Any
+from array import array
+from functools import lru_cache
+from keyword import iskeyword
+from typing import (
+    Dict, Callable, List, Optional, Iterable, Set, Any, Tuple, FrozenSet, Type, Iterator, BinaryIO, Sequence,
+    TypeVar, Union
+)
 
 from .configurator.renderers import ExtendedJSONEncoder
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 encode_json = ExtendedJSONEncoder().encode
 
 
+T = TypeVar('T', bound='CompactSerializable')
+
+
 class CompactSerializable:
     """ Whenever you inherit from this object, make sure that you define `__slots__` in your child classes.
     """
@@ -18,31 +32,43 @@ class CompactSerializable:
     }
     DEFAULT_IN_MODIFIERS: Dict[str, List[str]] = {}
     DEFAULT_OUT_MODIFIERS: Dict[str, List[str]] = {}
+    SUBCLASSES_GENERATION = 0
+    """ Incremented whenever a subclass is defined, so that tables of subclasses can be cached
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        CompactSerializable.SUBCLASSES_GENERATION += 1
 
     def as_dict(self,
                 fields: Optional[Iterable[str]] = None,
                 exclude: Optional[Set[str]] = None) -> Dict[str, Any]:
         """ Returns a dictionary representation of itself, adhering provided fields and modifiers.
         """
-        if exclude is None:
-            exclude = set()
-        if not fields:
-            fields = (k for k in self.__slots__ if k not in exclude)
-
-        rv = {}
-        for f in fields:
-            split = f.split('|')
-            field, modifiers = split[0], split[1:]
-            field = field.strip()
-            v = getattr(self, field)
-            for m in modifiers:
-                v = self.apply_modifier(m.strip(), v)
-            else:
-                default_modifiers = self.DEFAULT_OUT_MODIFIERS.get(field, [])
-                for m in default_modifiers:
-                    v = self.apply_modifier(m, v)
-            rv[field] = v
-        return rv
+        return compile_as_dict(type(self), *_plan_key(fields, exclude))(self)
+
+    @classmethod
+    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+        """ Builds an object from a dictionary representation of it, applying input modifiers to the values.
+        Extra keys are ignored.
+        """
+        return compile_from_dict(cls)(data)
+
+    @classmethod
+    def from_dicts(cls: Type[T], data: Iterable[Dict[str, Any]]) -> List[T]:
+        """ Bulk equivalent of ``[cls.from_dict(item) for item in data]``.
+        """
+        from_dict = compile_from_dict(cls)
+        return [from_dict(item) for item in data]
+
+    @classmethod
+    def from_json(cls: Type[T], data: Union[str, bytes]) -> Union[T, List[T]]:
+        """ Builds an object, or a list of objects if the JSON document is an array.
+        """
+        data = json.loads(data)
+        if isinstance(data, list):
+            return cls.from_dicts(data)
+        return cls.from_dict(data)
 
     def apply_modifier(self, modifier: str, value: Any) -> Any:
         if modifier.startswith('.'):
@@ -52,6 +78,9 @@ class CompactSerializable:
             value = self.OUT_MODIFIERS[modifier](value)
         return value
 
+    def __json__(self) -> Dict[str, Any]:
+        return self.as_dict()
+
     def __str__(self) -> str:
         """ Serialize the object by passing it to ``str()``.
         """
@@ -59,3 +88,242 @@ class CompactSerializable:
 
     def __bytes__(self) -> bytes:
         return bytes(self.__str__(), 'utf-8')
+
+
+@lru_cache(maxsize=1024)
+def compile_as_dict(cls: Type[CompactSerializable],
+                    fields: Optional[Tuple[str, ...]],
+                    exclude: FrozenSet[str]) -> Callable[[CompactSerializable], Dict[str, Any]]:
+    """ Compiles field specs of ``as_dict()`` into a function that builds the dictionary in one expression:
+
+    .. code-block:: python
+
+        # fields=('id', 'name | .upper', 'created_at | str')
+        def as_dict(o):
+            return {'id': o.id, 'name': o.name.upper(), 'created_at': _m2_0(o.created_at)}
+
+    Explicit modifiers of a field are followed by its default modifiers. Modifiers are resolved when a plan
+    is compiled, therefore ``OUT_MODIFIERS`` and ``DEFAULT_OUT_MODIFIERS`` should not be changed afterwards.
+    """
+    namespace, items = _compile_field_expressions(cls, fields, exclude)
+    source = (
+        f"def as_dict(o):\n"
+        f"    return {{{', '.join(f'{field!r}: {value}' for field, value in items)}}}\n"
+    )
+    code = compile(source, f'<frameapp as_dict plan for {cls.__qualname__}>', 'exec')
+    exec(code, namespace)
+    return namespace['as_dict']
+
+
+@lru_cache(maxsize=1024)
+def compile_as_row(cls: Type[CompactSerializable],
+                   fields: Optional[Tuple[str, ...]],
+                   exclude: FrozenSet[str]) -> Tuple[Tuple[str, ...], Callable[[CompactSerializable], Tuple]]:
+    """ Same as :func:`compile_as_dict`, but the compiled function returns a tuple of values.
+    Returns field names along with the function.
+    """
+    namespace, items = _compile_field_expressions(cls, fields, exclude)
+    source = (
+        f"def as_row(o):\n"
+        f"    return ({''.join(f'{value}, ' for _, value in items)})\n"
+    )
+    code = compile(source, f'<frameapp as_row plan for {cls.__qualname__}>', 'exec')
+    exec(code, namespace)
+    return tuple(field for field, _ in items), namespace['as_row']
+
+
+def _compile_field_expressions(cls: Type[CompactSerializable],
+                               fields: Optional[Tuple[str, ...]],
+                               exclude: FrozenSet[str]) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """ Returns a namespace and a list of (field name, Python expression of its value) pairs,
+    where the object is referred to as ``o``.
+    """
+    if fields is None:
+        fields = tuple(k for k in cls.__slots__ if k not in exclude)
+    custom_modifiers = cls.apply_modifier is not CompactSerializable.apply_modifier
+
+    namespace = {}
+    items = []
+    for i, spec in enumerate(fields):
+        field, *modifiers = spec.split('|')
+        field = field.strip()
+        if field.isidentifier() and not iskeyword(field):
+            value = f'o.{field}'
+        else:
+            namespace[f'_f{i}'] = field
+            value = f'getattr(o, _f{i})'
+
+        modifiers = [m.strip() for m in modifiers] + list(cls.DEFAULT_OUT_MODIFIERS.get(field, []))
+        for j, modifier in enumerate(modifiers):
+            if custom_modifiers:
+                value = f'o.apply_modifier({modifier!r}, {value})'
+            elif modifier.startswith('.') and modifier[1:].isidentifier():
+                # applying a method of the value
+                value = f'{value}.{modifier[1:]}()'
+            elif modifier.startswith('.'):
+                namespace[f'_m{i}_{j}'] = modifier[1:]
+                value = f'getattr({value}, _m{i}_{j})()'
+            else:
+                namespace[f'_m{i}_{j}'] = cls.OUT_MODIFIERS[modifier]
+                value = f'_m{i}_{j}({value})'
+        items.append((field, value))
+    return namespace, items
+
+
+@lru_cache(maxsize=None)
+def compile_from_dict(cls: Type[T]) -> Callable[[Dict[str, Any]], T]:
+    """ Compiles a constructor that sets slots directly, without calling ``__init__()``.
+    Only the lookups of fields are guarded, so that errors raised by modifiers propagate as they are:
+
+    .. code-block:: python
+
+        def from_dict(d):
+            try:
+                v0 = d['id']
+                v1 = d['created_at']
+            except KeyError as e:
+                raise TypeError(_missing + str(e)) from e
+            o = _new(_cls)
+            o.id = v0
+            o.created_at = _m1_0(v1)
+            return o
+    """
+    namespace = {'_new': object.__new__, '_cls': cls}
+    lookups = ['    try:']
+    lines = ['    o = _new(_cls)']
+    for i, field in enumerate(cls.__slots__):
+        lookups.append(f'        v{i} = d[{field!r}]')
+        value = f'v{i}'
+        for j, modifier in enumerate(cls.DEFAULT_IN_MODIFIERS.get(field, [])):
+            if modifier.startswith('.') and modifier[1:].isidentifier():
+                # applying a method of the value
+                value = f'{value}.{modifier[1:]}()'
+            elif modifier.startswith('.'):
+                namespace[f'_m{i}_{j}'] = modifier[1:]
+                value = f'getattr({value}, _m{i}_{j})()'
+            else:
+                namespace[f'_m{i}_{j}'] = cls.IN_MODIFIERS[modifier]
+                value = f'_m{i}_{j}({value})'
+        if field.isidentifier() and not iskeyword(field):
+            lines.append(f'    o.{field} = {value}')
+        else:
+            namespace[f'_f{i}'] = field
+            lines.append(f'    setattr(o, _f{i}, {value})')
+    if len(lookups) > 1:
+        namespace['_missing'] = f'{cls.__name__}.from_dict() is missing a field: '
+        lookups.extend([
+            '    except KeyError as e:',
+            '        raise TypeError(_missing + str(e)) from e',
+        ])
+        lines = lookups + lines
+    lines.insert(0, 'def from_dict(d):')
+    lines.append('    return o\n')
+    code = compile('\n'.join(lines), f'<frameapp from_dict constructor for {cls.__qualname__}>', 'exec')
+    exec(code, namespace)
+    return namespace['from_dict']
+
+
+def _plan_key(fields: Optional[Iterable[str]],
+              exclude: Optional[Set[str]]) -> Tuple[Optional[Tuple[str, ...]], FrozenSet[str]]:
+    if not fields:
+        return None, frozenset(exclude or ())
+    return tuple(fields), frozenset()
+
+
+def as_dicts(objs: Iterable[CompactSerializable],
+             fields: Optional[Iterable[str]] = None,
+             exclude: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """ Bulk equivalent of ``[o.as_dict(fields, exclude) for o in objs]``, field specs are resolved once per class.
+    """
+    fields, exclude = _plan_key(fields, exclude)
+    plans = {}
+    rv = []
+    for o in objs:
+        cls = type(o)
+        try:
+            plan = plans[cls]
+        except KeyError:
+            plan = plans[cls] = compile_as_dict(cls, fields, exclude)
+        rv.append(plan(o))
+    return rv
+
+
+def iter_json_lines(objs: Iterable[CompactSerializable],
+                    fields: Optional[Iterable[str]] = None,
+                    exclude: Optional[Set[str]] = None) -> Iterator[bytes]:
+    """ Yields UTF-8 encoded `JSON lines <http://jsonlines.org/>`_, one per object.
+    Objects are consumed lazily, so that the input may be a generator or a database cursor of any size.
+    """
+    fields, exclude = _plan_key(fields, exclude)
+    plans = {}
+    for o in objs:
+        cls = type(o)
+        try:
+            plan = plans[cls]
+        except KeyError:
+            plan = plans[cls] = compile_as_dict(cls, fields, exclude)
+        yield f'{encode_json(plan(o))}\n'.encode('utf-8')
+
+
+def write_json_lines(stream: BinaryIO,
+                     objs: Iterable[CompactSerializable],
+                     fields: Optional[Iterable[str]] = None,
+                     exclude: Optional[Set[str]] = None) -> int:
+    """ Writes JSON lines of the objects to a binary stream, returns the number of written objects.
+    """
+    n = 0
+    for n, line in enumerate(iter_json_lines(objs, fields, exclude), 1):
+        stream.write(line)
+    return n
+
+
+def as_columns(objs: Iterable[CompactSerializable],
+               fields: Optional[Iterable[str]] = None,
+               exclude: Optional[Set[str]] = None,
+               typed: bool = True) -> Dict[str, Sequence]:
+    """ Returns a columnar representation of the objects, i.e. a mapping of field names to sequences of values.
+    No intermediate dictionaries are allocated per object.
+
+    With ``typed=True`` columns of integers and floats are packed into NumPy arrays when NumPy is installed,
+    or into :class:`array.array` otherwise. Both are supported by the JSON encoders.
+    """
+    fields, exclude = _plan_key(fields, exclude)
+    plans = {}
+    names = None
+    rows = []
+    for o in objs:
+        cls = type(o)
+        try:
+            as_row = plans[cls]
+        except KeyError:
+            row_names, as_row = compile_as_row(cls, fields, exclude)
+            plans[cls] = as_row
+            if names is None:
+                names = row_names
+            elif names != row_names:
+                raise ValueError(f'Objects of {cls} have fields {row_names} that differ from {names}')
+        rows.append(as_row(o))
+
+    if names is None:
+        return {}
+    columns = zip(*rows) if rows else ((),) * len(names)
+    if typed:
+        return {name: pack_column(column) for name, column in zip(names, columns)}
+    return {name: list(column) for name, column in zip(names, columns)}
+
+
+def pack_column(values: Sequence[Any]) -> Sequence[Any]:
+    """ Packs a column of integers or floats into a typed array, other columns are returned as lists.
+    """
+    if values:
+        first_type = type(values[0])
+        # bools are ints too, but they should remain bools in the output
+        if first_type in (int, float) and all(type(v) is first_type for v in values):
+            try:
+                if numpy is not None:
+                    return numpy.array(values, dtype=numpy.int64 if first_type is int else numpy.float64)
+                return array('q' if first_type is int else 'd', values)
+            except OverflowError:
+                # integers beyond 64 bits
+                pass
+    return list(values)
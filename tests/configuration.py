@@ -0,0 +1,81 @@
+""" Programmatic configuration of routes and views, an equivalent of scanning ``http_endpoint`` markers.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.urls import Resolver404
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from frameapp.configurator import Configurator
+from frameapp.configurator.sums import SumType
+
+
+def configure(namespace: str,
+              routes: Iterable[Tuple[str, str]],
+              views: Iterable[Tuple[Any, Dict[str, Any]]],
+              rules: Dict[str, Dict[str, Any]] = None) -> Configurator:
+    config = Configurator()
+    config.routes.change_namespace(namespace)
+    for name, pattern in routes:
+        config.routes.add_route(name, pattern, rules=(rules or {}).get(name))
+    for view, settings in views:
+        register_view(config, view, **settings)
+    config.freeze()
+    return config
+
+
+def register_view(config: Configurator, view: Any, **settings) -> None:
+    settings.setdefault('renderer', 'json')
+    view_meta = config.views.add_view(view=view, **settings)
+    route = config.routes.registry[config.routes.namespace][view_meta.route_name]
+    route.view_metas.append(view_meta._replace(renderer=config.renderers.get_renderer(view_meta.renderer)))
+
+
+class Language(SumType):
+    ENGLISH: str = 'en'
+    GERMAN: str = 'de'
+    DANISH: str = 'dk'
+
+
+def endpoint(request, **kwargs):
+    return kwargs
+
+
+ROUTES = [
+    ('home', '/'),
+    ('items', '/items'),
+    ('item', '/items/{item_id:\\d+}'),
+    ('item_comments', '/items/{item_id:\\d+}/comments'),
+    ('item_slug', '/items/{slug}'),
+    ('about', '/{lang}/about'),
+    ('files', '/files/{path:.+}'),
+    ('status', '/v1.0/status'),
+    ('user', '/users/{user_id}'),
+    ('user_me', '/users/me'),
+]
+
+ROUTE_RULES = {'about': {'lang': Language}}
+
+PATHS = [
+    '', 'items', 'items/', 'items/1', 'items/12/comments', 'items/abc', 'items/abc/comments',
+    'en/about', 'dk/about', 'fr/about', 'files/a/b/c.txt', 'files/', 'v1.0/status', 'v1x0/status',
+    'users/me', 'users/1', 'users/1/', 'items/1\n', 'missing',
+]
+
+
+def routing_config(namespace: str = 'routing') -> Configurator:
+    """ Routes that are ambiguous in various ways, one GET view per route.
+    """
+    return configure(namespace, ROUTES, [(endpoint, {'route_name': name, 'request_method': 'GET'})
+                                         for name, _ in ROUTES], ROUTE_RULES)
+
+
+def resolution(url_patterns: Any, path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """ Returns the name of the resolved URL pattern and its arguments, or None if the path is not resolved.
+    """
+    if not isinstance(url_patterns, URLResolver):
+        url_patterns = URLResolver(RegexPattern('^'), url_patterns)
+    try:
+        match = url_patterns.resolve(path)
+    except Resolver404:
+        return None
+    return match.url_name, match.kwargs
@@ -0,0 +1,35 @@
+import pathlib
+import sys
+
+import django
+from django.conf import settings
+from pkg_resources import parse_version
+
+
+here = pathlib.Path(__file__).parent
+
+# sample applications and URL configurations are importable by their top-level names
+sys.path.insert(0, str(here))
+
+
+def pytest_configure(config):
+    settings.configure(
+        SECRET_KEY='frameapp-tests',
+        ALLOWED_HOSTS=['*'],
+        ROOT_URLCONF='sample_urls',
+        ROOT_PATH=str(here),
+        DATABASES={},
+        INSTALLED_APPS=[
+            'django.contrib.contenttypes',
+            'django.contrib.auth',
+            'rest_framework',
+        ],
+        MIDDLEWARE=[
+            'django.middleware.csrf.CsrfViewMiddleware',
+            'frameapp.ext.django_integration.middleware.FrameappMiddleware',
+        ],
+        FRAMEAPP={
+            'MIN_API_VERSION': parse_version('1.0'),
+        },
+    )
+    django.setup()
@@ -0,0 +1,10 @@
+from frameapp import entrypoint
+from frameapp.ext.django_integration.url import django_url_patterns
+from frameapp.ext.django_integration.batch import django_batch_url_pattern
+
+
+config = entrypoint.setup('sampleapp', {'sampleapp': [{'entry_point': 'includeme', 'url_prefix': '/'}]}, namespace='sample')
+
+frameapp_urls = django_url_patterns('sample', config)
+
+urlpatterns = frameapp_urls + [django_batch_url_pattern(frameapp_urls)]
@@ -0,0 +1,22 @@
+""" Application used by the test suite, see sample_urls.py
+"""
+
+
+def includeme(config):
+    config.routes.add_route('items', '/items')
+    config.routes.add_route('item', '/items/{item_id:\\d+}')
+    config.routes.add_route('report', '/report')
+    config.routes.add_route('notes', '/notes')
+    config.routes.add_route('greeting', '/greetings/{name}')
+    config.routes.add_route('counter', '/counter')
+    config.routes.add_route('mixed', '/mixed')
+    config.routes.add_route('drf_post', '/drf-post')
+    config.routes.add_route('validated', '/validated')
+    config.routes.add_route('cached', '/cached/{key}')
+    config.routes.add_route('things', '/things')
+    config.routes.add_route('ping', '/ping')
+    config.routes.add_route('feed', '/feed')
+    config.routes.add_route('slow', '/slow')
+    config.routes.add_route('limited', '/limited')
+    config.routes.add_route('article', '/article')
+    config.routes.add_route('cached_report', '/cached-report')
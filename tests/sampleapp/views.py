@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.viewsets import GenericViewSet
+
+from frameapp.marker.view import http_endpoint, http_defaults
+
+
+@http_defaults(route_name='items', renderer='json')
+class ItemsView(APIView):
+    @http_endpoint(request_method='GET')
+    def get(self, request, **kwargs):
+        return Response({'items': [1, 2, 3]})
+
+
+@http_defaults(route_name='item', renderer='json')
+class ItemView(APIView):
+    @http_endpoint(request_method='GET')
+    def get(self, request, item_id, **kwargs):
+        return Response({'item': int(item_id)})
+
+
+@http_endpoint(route_name='report', request_method='GET', renderer='json', compress=True, compress_min_size=16)
+def report(request, **kwargs):
+    return {'rows': [{'id': i, 'name': f'row {i}'} for i in range(100)]}
+
+
+NOTES = []
+
+
+@http_endpoint(route_name='notes', request_method='POST', renderer='json')
+def add_note(request, **kwargs):
+    NOTES.append(json.loads(request.body))
+    return {'notes': len(NOTES)}
+
+
+@http_endpoint(route_name='greeting', request_method='GET', renderer='json')
+def greeting(request, name, **kwargs):
+    return {'greeting': f'Hello, {name}', 'request': type(request).__name__}
+
+
+@http_defaults(route_name='counter', renderer='json')
+class CounterView:
+    instances = 0
+
+    def __init__(self) -> None:
+        CounterView.instances += 1
+
+    @http_endpoint(request_method='GET')
+    def get(self, request, **kwargs):
+        return {'instances': CounterView.instances}
+
+    @http_endpoint(request_method='POST')
+    def post(self, request, **kwargs):
+        return {'posted': True}
+
+
+@http_defaults(route_name='mixed', renderer='json')
+class MixedView(APIView):
+    @http_endpoint(request_method='GET')
+    def get(self, request, **kwargs):
+        return Response({'drf': True})
+
+
+@http_endpoint(route_name='mixed', request_method='POST', renderer='json')
+def mixed_post(request, **kwargs):
+    return {'plain': True}
+
+
+@http_defaults(route_name='drf_post', renderer='json')
+class DRFPostView(APIView):
+    authentication_classes = ()
+
+    @http_endpoint(request_method='POST')
+    def post(self, request, **kwargs):
+        return Response({'data': request.data})
+
+
+@http_endpoint(route_name='validated', request_method='POST', renderer='json', input_schema='note.json')
+def validated(request, **kwargs):
+    return {'valid': True}
+
+
+@http_defaults(route_name='cached', renderer='json')
+class CachedView(APIView):
+    calls = 0
+
+    @http_endpoint(request_method='GET', cache=60, cache_vary=('X-Tenant',), cache_tags=('cached',))
+    def get(self, request, key, **kwargs):
+        CachedView.calls += 1
+        return Response({'key': key, 'calls': CachedView.calls})
+
+
+@http_endpoint(route_name='things', renderer='json')
+class ThingsViewSet(GenericViewSet):
+    """ Things of the sample app.
+    """
+    def list(self, request, **kwargs):
+        return Response({'things': []})
+
+
+@http_endpoint(route_name='ping', renderer='json')
+def ping(request, **kwargs):
+    return {'pong': request.method}
+
+
+FEED_REVISION = 7
+
+
+@http_endpoint(route_name='feed', request_method='GET', renderer='json', compress=True, compress_min_size=16,
+               etag=lambda request, **kwargs: f'feed-{FEED_REVISION}')
+def feed(request, **kwargs):
+    return {'entries': [f'entry {i}' for i in range(50)]}
+
+
+@http_endpoint(route_name='slow', request_method='GET', renderer='json', deadline=0.05)
+def slow(request, **kwargs):
+    time.sleep(float(request.GET.get('sleep', 0)))
+    request.DEADLINE.check()
+    return {'remaining': request.DEADLINE.remaining()}
+
+
+LIMITED_ENTERED = threading.Event()
+LIMITED_RELEASE = threading.Event()
+
+
+@http_endpoint(route_name='limited', request_method='GET', renderer='json', max_concurrency=1, retry_after=3)
+def limited(request, **kwargs):
+    LIMITED_ENTERED.set()
+    LIMITED_RELEASE.wait(5)
+    return {'admitted': True}
+
+
+ARTICLE = {'title': 'First', 'updated_at': datetime(2020, 1, 1, tzinfo=timezone.utc), 'renders': 0}
+
+
+def article_updated_at(request, **kwargs):
+    return ARTICLE['updated_at']
+
+
+@http_endpoint(route_name='article', request_method=('GET', 'PUT'), renderer='json', etag=True,
+               last_modified=article_updated_at)
+def article(request, **kwargs):
+    ARTICLE['renders'] += 1
+    if request.method == 'PUT':
+        ARTICLE['title'] = json.loads(request.body)['title']
+    return {'title': ARTICLE['title']}
+
+
+CACHED_REPORT_CALLS = []
+
+
+@http_endpoint(route_name='cached_report', request_method='GET', renderer='json', cache=60,
+               compress=True, compress_min_size=16)
+def cached_report(request, **kwargs):
+    CACHED_REPORT_CALLS.append(request.META.get('HTTP_ACCEPT_ENCODING'))
+    return {'rows': [f'row {i}' for i in range(100)]}
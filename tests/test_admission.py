@@ -0,0 +1,69 @@
+import json
+import threading
+import time
+
+from django.test import Client
+
+from frameapp.configurator.routes import AdmissionPolicy
+from frameapp.ext.django_integration.admission import AdaptiveConcurrencyLimiter, ConcurrencyLimiter, limiter_for
+
+from sampleapp import views
+
+
+def policy(max_concurrency, adaptive=False):
+    return AdmissionPolicy(max_concurrency=max_concurrency, queue_timeout=0.0, adaptive=adaptive, retry_after=1)
+
+
+def test_limiter_admits_up_to_the_limit():
+    limiter = limiter_for(policy(2))
+    assert type(limiter) is ConcurrencyLimiter
+    assert limiter.acquire(0)
+    assert limiter.acquire(0)
+    assert not limiter.acquire(0)
+    assert not limiter.acquire(0.01)
+    limiter.release(0.1)
+    assert limiter.acquire(0)
+
+
+def test_waiting_request_is_admitted_when_a_slot_is_released():
+    limiter = limiter_for(policy(1))
+    assert limiter.acquire(0)
+    threading.Timer(0.05, limiter.release, args=(0.05,)).start()
+    started_at = time.monotonic()
+    assert limiter.acquire(5)
+    assert time.monotonic() - started_at < 5
+
+
+def test_adaptive_limit_shrinks_with_latency_and_recovers():
+    limiter = limiter_for(policy(16, adaptive=True))
+    assert type(limiter) is AdaptiveConcurrencyLimiter
+    for _ in range(5):
+        limiter.acquire(0)
+        limiter.release(0.01)
+    assert limiter.limit == 16
+    for _ in range(5):
+        limiter.acquire(0)
+        limiter.release(1.0)
+    assert 1 <= limiter.limit < 16
+    for _ in range(20):
+        limiter.acquire(0)
+        limiter.release(0.01)
+    assert limiter.limit == 16
+
+
+def test_requests_over_the_limit_are_shed():
+    views.LIMITED_ENTERED.clear()
+    views.LIMITED_RELEASE.clear()
+    responses = []
+    leader = threading.Thread(target=lambda: responses.append(Client().get('/limited')))
+    leader.start()
+    try:
+        assert views.LIMITED_ENTERED.wait(5)
+        shed = Client().get('/limited')
+        assert shed.status_code == 503
+        assert shed['Retry-After'] == '3'
+    finally:
+        views.LIMITED_RELEASE.set()
+        leader.join(5)
+    assert json.loads(responses[0].content) == {'admitted': True}
+    assert Client().get('/limited').status_code == 200
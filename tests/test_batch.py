@@ -0,0 +1,58 @@
+import json
+
+from django.test import Client
+
+
+def post_batch(client, requests, **extra):
+    return client.post('/batch', data=json.dumps({'requests': requests}), content_type='application/json', **extra)
+
+
+def test_sub_responses_are_returned_in_order():
+    response = post_batch(Client(), [
+        {'path': '/items/1'},
+        {'path': '/items'},
+        {'path': '/nope'},
+        {'method': 'DELETE', 'path': '/items'},
+    ])
+    assert response.status_code == 200
+    results = json.loads(response.content)['responses']
+    assert [r['status'] for r in results] == [200, 200, 404, 405]
+    assert results[0]['body'] == {'item': 1}
+    assert results[1]['body'] == {'items': [1, 2, 3]}
+
+
+def test_sub_responses_are_not_compressed():
+    client = Client()
+    assert client.get('/report', HTTP_ACCEPT_ENCODING='gzip')['Content-Encoding'] == 'gzip'
+
+    response = post_batch(client, [
+        {'path': '/report'},
+        {'path': '/report', 'headers': {'Accept-Encoding': 'gzip'}},
+    ], HTTP_ACCEPT_ENCODING='gzip')
+    results = json.loads(response.content.decode('utf-8'))['responses']
+    for result in results:
+        assert result['status'] == 200
+        assert 'Content-Encoding' not in result['headers']
+        assert len(result['body']['rows']) == 100
+
+
+def test_batch_request_must_be_json():
+    response = Client().post('/batch', data=json.dumps({'requests': []}), content_type='text/plain')
+    assert response.status_code == 415
+
+
+def test_sub_requests_are_csrf_checked():
+    from sampleapp.views import NOTES
+    del NOTES[:]
+    client = Client(enforce_csrf_checks=True)
+    sub_request = {'method': 'POST', 'path': '/notes', 'body': {'text': 'hi'}}
+
+    response = post_batch(client, [sub_request])
+    assert json.loads(response.content)['responses'][0]['status'] == 403
+    assert NOTES == []
+
+    token = 'a' * 32
+    client.cookies['csrftoken'] = token
+    response = post_batch(client, [sub_request, {'path': '/items'}], HTTP_X_CSRFTOKEN=token)
+    assert [r['status'] for r in json.loads(response.content)['responses']] == [200, 200]
+    assert NOTES == [{'text': 'hi'}]
@@ -0,0 +1,93 @@
+import json
+import time
+
+import pytest
+from django.test import Client
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from frameapp.exceptions import ConfigurationError
+from frameapp.ext.django_integration.cache import ResponseCache, get_response_cache
+from frameapp.ext.django_integration.responses import ResponseSnapshot
+from frameapp.ext.django_integration.url import django_url_patterns
+
+from configuration import configure
+
+
+def snapshot(content: bytes) -> ResponseSnapshot:
+    return ResponseSnapshot(status=200, reason='OK', headers=(('Content-Type', 'text/plain'),), content=content)
+
+
+ROUTE = ('ns', 'route')
+
+
+def test_entries_expire():
+    cache = ResponseCache()
+    cache.set('k', snapshot(b'a'), 0.05, ROUTE)
+    assert cache.get('k').content == b'a'
+    time.sleep(0.06)
+    assert cache.get('k') is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.size) == (1, 1, 0, 0)
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ResponseCache(max_size=10)
+    cache.set('a', snapshot(b'aaaa'), 60, ROUTE)
+    cache.set('b', snapshot(b'bbbb'), 60, ROUTE)
+    cache.get('a')
+    cache.set('c', snapshot(b'cccc'), 60, ROUTE)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats().evictions == 1
+    assert cache.stats().size == 8
+    # too large to be cached at all
+    cache.set('d', snapshot(b'd' * 11), 60, ROUTE)
+    assert cache.get('d') is None
+
+
+def test_invalidation_by_route_and_tags():
+    cache = ResponseCache()
+    cache.set('a', snapshot(b'a'), 60, ('ns', 'one'), frozenset({'x'}))
+    cache.set('b', snapshot(b'b'), 60, ('ns', 'one'))
+    cache.set('c', snapshot(b'c'), 60, ('ns', 'two'), frozenset({'x', 'y'}))
+    assert cache.invalidate_tags('y') == 1
+    assert cache.get('c') is None
+    assert cache.invalidate_route('ns', 'one') == 2
+    assert cache.stats().entries == 0
+    assert cache.tag_index == {} and cache.route_index == {}
+
+
+def test_cached_responses_skip_the_view():
+    from sampleapp.views import CachedView
+    get_response_cache().clear()
+    client = Client()
+    first = json.loads(client.get('/cached/a').content)
+    assert json.loads(client.get('/cached/a').content) == first
+    assert json.loads(client.get('/cached/b').content)['calls'] == first['calls'] + 1
+    # headers listed in cache_vary are a part of the key
+    response = client.get('/cached/a', HTTP_X_TENANT='other')
+    assert json.loads(response.content)['calls'] == first['calls'] + 2
+    assert 'X-Tenant' in response['Vary']
+
+    get_response_cache().invalidate_tags('cached')
+    assert json.loads(client.get('/cached/a').content)['calls'] == CachedView.calls
+
+
+class PrivateView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        return Response({'secret': True})
+
+
+def test_views_with_permissions_must_vary_cached_responses():
+    routes = [('private', '/private')]
+    config = configure('private', routes, [(PrivateView, dict(route_name='private', attr='get', cache=60))])
+    with pytest.raises(ConfigurationError):
+        django_url_patterns('private', config)
+
+    config = configure('private', routes, [(PrivateView, dict(route_name='private', attr='get', cache=60,
+                                                              cache_vary=('Authorization',)))])
+    assert django_url_patterns('private', config)
@@ -0,0 +1,171 @@
+import threading
+import time
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from frameapp.ext.django_integration.coalesce import SingleFlight, coalesce_key, default_coalesce_key
+from frameapp.ext.django_integration.deadline import NO_DEADLINE, Deadline, DeadlineExceeded
+
+
+rf = RequestFactory()
+
+
+def test_default_key_distinguishes_credentials_and_accepted_media_types():
+    key = default_coalesce_key(rf.get('/items?page=1'), item_id='1')
+    assert key == default_coalesce_key(rf.get('/items?page=1'), item_id='1')
+    assert key != default_coalesce_key(rf.get('/items?page=2'), item_id='1')
+    assert key != default_coalesce_key(rf.get('/items?page=1'), item_id='2')
+    assert key != default_coalesce_key(rf.get('/items?page=1', HTTP_ACCEPT='application/vnd.frameapp.compact'),
+                                       item_id='1')
+    assert key != default_coalesce_key(rf.get('/items?page=1', HTTP_AUTHORIZATION='Token abc'), item_id='1')
+    assert key != default_coalesce_key(rf.get('/items?page=1', HTTP_COOKIE='sessionid=abc'), item_id='1')
+
+
+def test_custom_key():
+    assert coalesce_key(lambda request, item_id: item_id, rf.get('/'), (), {'item_id': '1'}) == '1'
+
+
+def run_concurrently(single_flight, key, fn, followers, deadline=NO_DEADLINE):
+    """ Starts the leader, waits until it enters fn, then starts the followers.
+    """
+    results = {}
+    errors = {}
+
+    def call(name):
+        try:
+            results[name] = single_flight.do(key, fn, deadline)
+        except BaseException as e:
+            errors[name] = e
+
+    leader = threading.Thread(target=call, args=('leader',))
+    leader.start()
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(followers)]
+    return leader, threads, results, errors
+
+
+def test_followers_share_the_response_of_the_leader():
+    single_flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def view():
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        return HttpResponse(b'shared', content_type='text/plain')
+
+    leader, followers, results, errors = run_concurrently(single_flight, 'k', view, 3)
+    assert entered.wait(5)
+    for t in followers:
+        t.start()
+    # let the followers reach the in-flight execution
+    time.sleep(0.1)
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+
+    assert not errors
+    assert len(calls) == 1
+    assert {r.content for r in results.values()} == {b'shared'}
+    # every request gets its own response object
+    assert len({id(r) for r in results.values()}) == 4
+    assert single_flight.flights == {}
+
+
+def test_followers_reraise_errors_of_the_leader():
+    single_flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+
+    def view():
+        entered.set()
+        release.wait(5)
+        raise ValueError('boom')
+
+    leader, followers, results, errors = run_concurrently(single_flight, 'k', view, 2)
+    assert entered.wait(5)
+    for t in followers:
+        t.start()
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+    assert all(isinstance(e, ValueError) and e.args == ('boom',) for e in errors.values())
+    assert 'leader' in errors
+    # every request raises its own exception object
+    assert len({id(e) for e in errors.values()}) == 3
+    assert all(errors[i].__cause__ is errors['leader'] for i in range(2))
+
+
+def test_followers_give_up_at_their_deadline():
+    single_flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+
+    def view():
+        entered.set()
+        release.wait(5)
+        return HttpResponse(b'late')
+
+    leader = threading.Thread(target=single_flight.do, args=('k', view, NO_DEADLINE))
+    leader.start()
+    assert entered.wait(5)
+    with pytest.raises(DeadlineExceeded):
+        single_flight.do('k', view, Deadline(0))
+    release.set()
+    leader.join(5)
+
+
+def test_followers_with_time_left_take_over_when_the_leader_runs_out_of_time():
+    single_flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def view():
+        calls.append(1)
+        if len(calls) == 1:
+            entered.set()
+            release.wait(5)
+            raise DeadlineExceeded()
+        return HttpResponse(b'retried')
+
+    leader, followers, results, errors = run_concurrently(single_flight, 'k', view, 2)
+    assert entered.wait(5)
+    for t in followers:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+    assert list(errors) == ['leader']
+    assert {r.content for r in results.values()} == {b'retried'}
+    # one of the followers became the new leader
+    assert 2 <= len(calls) <= 3
+    assert single_flight.flights == {}
+
+
+def test_responses_that_set_cookies_are_not_shared():
+    single_flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def view():
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        response = HttpResponse(b'private')
+        response.set_cookie('session', str(len(calls)))
+        return response
+
+    leader, followers, results, errors = run_concurrently(single_flight, 'k', view, 1)
+    assert entered.wait(5)
+    followers[0].start()
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+    assert not errors
+    assert len(calls) == 2
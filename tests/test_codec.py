@@ -0,0 +1,92 @@
+import enum
+import struct
+from datetime import datetime, date, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from frameapp.codec import (
+    HEADER, LIST, DICT, STR, CodecError, CompactDecoder, encode_compact, decode_compact, get_decoder
+)
+from frameapp.structures import CompactSerializable
+
+
+class Point(CompactSerializable):
+    __slots__ = ('x', 'y')
+    x: int
+    y: int
+
+    def __init__(self, x: int, y: int) -> None:
+        self.x = x
+        self.y = y
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+@pytest.mark.parametrize('value', [
+    None, True, False, 0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 100, -2 ** 100, 1.5, float('inf'),
+    '', 'text', 'юникод', b'\x00\xff', [], [1, [2, 'three']], {}, {'a': {'b': [None]}, 1: 2},
+    datetime(2018, 1, 2, 3, 4, 5), datetime(2018, 1, 2, 3, 4, 5, 678),
+    datetime(2018, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+    date(2018, 1, 2), Decimal('1.10'),
+])
+def test_round_trip(value):
+    assert decode_compact(encode_compact(value)) == value
+
+
+def test_containers_and_objects():
+    assert decode_compact(encode_compact((1, 2))) == [1, 2]
+    assert decode_compact(encode_compact({3})) == [3]
+    assert decode_compact(encode_compact(Color.RED)) == 'red'
+    point = decode_compact(encode_compact({'p': Point(1, 2)}))['p']
+    assert isinstance(point, Point) and (point.x, point.y) == (1, 2)
+
+
+def test_unknown_schemas_are_rejected():
+    class Other(CompactSerializable):
+        __slots__ = ('x',)
+
+    with pytest.raises(CodecError):
+        decode_compact(encode_compact(Point(1, 2)), classes=[Other])
+
+
+def test_decoder_of_all_subclasses_is_shared_until_a_subclass_is_defined():
+    decoder = get_decoder()
+    assert get_decoder() is decoder
+    assert get_decoder([Point]) is get_decoder([Point])
+
+    class Late(CompactSerializable):
+        __slots__ = ('v',)
+
+        def __init__(self, v) -> None:
+            self.v = v
+
+    assert get_decoder() is not decoder
+    assert decode_compact(encode_compact(Late(1))).v == 1
+
+
+def length_prefixed(tag: int, n: int) -> bytes:
+    return struct.pack('<BI', tag, n)
+
+
+@pytest.mark.parametrize('payload', [
+    b'',
+    b'JSON',
+    HEADER,
+    HEADER + b'\xff',
+    HEADER + length_prefixed(STR, 10) + b'abc',
+    HEADER + length_prefixed(STR, 1) + b'\xff',
+    HEADER + encode_compact(1)[len(HEADER):] + b'\x00',
+    # unhashable key
+    HEADER + length_prefixed(DICT, 1) + length_prefixed(LIST, 0) + b'\x00',
+    # nesting beyond the recursion limit
+    HEADER + length_prefixed(LIST, 1) * 100000 + b'\x00',
+    HEADER + encode_compact('2018-13-45T00:00:00')[len(HEADER):].replace(bytes([STR]), b'\x0a', 1),
+    HEADER + encode_compact('not a date')[len(HEADER):].replace(bytes([STR]), b'\x0b', 1),
+    HEADER + encode_compact('1.2.3')[len(HEADER):].replace(bytes([STR]), b'\x0c', 1),
+])
+def test_malformed_payloads_raise_codec_errors(payload):
+    with pytest.raises(CodecError):
+        CompactDecoder().decode(payload)
@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+
+from frameapp.configurator.renderers import accepts_encoding, compress_response, gzip_compress
+from frameapp.configurator.routes import CompressionPolicy
+from frameapp.ext.django_integration.cache import get_response_cache
+
+from sampleapp import views
+
+
+rf = RequestFactory()
+POLICY = CompressionPolicy(min_size=16, level=6)
+
+
+def test_accepted_encodings():
+    assert accepts_encoding(rf.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate'), 'gzip')
+    assert accepts_encoding(rf.get('/', HTTP_ACCEPT_ENCODING='br, GZIP;q=0.5'), 'gzip')
+    assert not accepts_encoding(rf.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0'), 'gzip')
+    assert not accepts_encoding(rf.get('/', HTTP_ACCEPT_ENCODING='gzip;q=x'), 'gzip')
+    assert not accepts_encoding(rf.get('/', HTTP_ACCEPT_ENCODING='identity'), 'gzip')
+    assert not accepts_encoding(rf.get('/'), 'gzip')
+
+
+def test_compression_is_deterministic_and_weakens_etags():
+    def compressed():
+        response = HttpResponse(b'x' * 1000)
+        response['ETag'] = '"abc"'
+        return compress_response(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'), response, POLICY)
+
+    first, second = compressed(), compressed()
+    assert first['Content-Encoding'] == 'gzip'
+    assert first.content == second.content
+    assert gzip.decompress(first.content) == b'x' * 1000
+    assert first['Content-Length'] == str(len(first.content))
+    assert first['ETag'] == 'W/"abc"'
+    assert first['Vary'] == 'Accept-Encoding'
+
+
+def test_small_incompressible_and_unsuccessful_responses_are_left_alone():
+    request = rf.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    small = compress_response(request, HttpResponse(b'short'), POLICY)
+    assert not small.has_header('Content-Encoding')
+    assert not small.has_header('Vary')
+    random = compress_response(request, HttpResponse(os.urandom(64)), POLICY)
+    assert not random.has_header('Content-Encoding')
+    assert not compress_response(request, HttpResponse(b'x' * 1000, status=404), POLICY).has_header('Content-Encoding')
+
+
+def test_view_responses_are_compressed_for_accepting_clients():
+    plain = Client().get('/report')
+    assert not plain.has_header('Content-Encoding')
+    assert 'Accept-Encoding' in plain['Vary']
+    compressed = Client().get('/report', HTTP_ACCEPT_ENCODING='gzip')
+    assert compressed['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(compressed.content)) == json.loads(plain.content)
+
+
+def test_compressed_responses_are_cached_per_encoding():
+    get_response_cache().clear()
+    views.CACHED_REPORT_CALLS.clear()
+    client = Client()
+    first = client.get('/cached-report', HTTP_ACCEPT_ENCODING='gzip')
+    second = client.get('/cached-report', HTTP_ACCEPT_ENCODING='gzip')
+    assert first['Content-Encoding'] == second['Content-Encoding'] == 'gzip'
+    assert first.content == second.content
+    plain = client.get('/cached-report')
+    assert not plain.has_header('Content-Encoding')
+    assert json.loads(plain.content) == json.loads(gzip.decompress(first.content))
+    assert views.CACHED_REPORT_CALLS == ['gzip', None]
+    get_response_cache().clear()
+
+
+def test_compression_does_not_depend_on_gzip_compress(monkeypatch):
+    # gzip.compress() of Python 3.6 and 3.7 doesn't accept mtime
+    def compress(data, compresslevel=9):
+        raise AssertionError('gzip.compress() is not used')
+
+    monkeypatch.setattr(gzip, 'compress', compress)
+    response = compress_response(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'), HttpResponse(b'x' * 1000), POLICY)
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.content) == b'x' * 1000
+    # the header carries no timestamp, so that compressed bodies are deterministic
+    assert response.content[4:8] == b'\x00\x00\x00\x00'
+    assert gzip_compress(b'x' * 1000, 6) == response.content
@@ -0,0 +1,59 @@
+import gzip
+import json
+
+from django.test import Client
+
+from sampleapp import views
+
+
+def test_uncompressed_response_carries_strong_etag():
+    response = Client().get('/feed')
+    assert response.status_code == 200
+    assert response['ETag'] == '"feed-7"'
+    assert not response.has_header('Content-Encoding')
+
+
+def test_compressed_response_carries_weak_etag():
+    response = Client().get('/feed', HTTP_ACCEPT_ENCODING='gzip')
+    assert response.status_code == 200
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['ETag'] == 'W/"feed-7"'
+    assert len(json.loads(gzip.decompress(response.content))['entries']) == 50
+
+
+def test_either_etag_validates_the_resource():
+    client = Client()
+    assert client.get('/feed', HTTP_IF_NONE_MATCH='"feed-7"').status_code == 304
+    assert client.get('/feed', HTTP_IF_NONE_MATCH='W/"feed-7"', HTTP_ACCEPT_ENCODING='gzip').status_code == 304
+    assert client.get('/feed', HTTP_IF_NONE_MATCH='"feed-6"').status_code == 200
+
+
+def test_content_etag_validates_rendered_responses():
+    client = Client()
+    response = client.get('/article')
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert etag.startswith('"')
+    assert response['Last-Modified'] == 'Wed, 01 Jan 2020 00:00:00 GMT'
+
+    not_modified = client.get('/article', HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+    assert not_modified['ETag'] == etag
+    assert not_modified.content == b''
+
+
+def test_last_modified_is_answered_before_the_view_is_called():
+    renders = views.ARTICLE['renders']
+    response = Client().get('/article', HTTP_IF_MODIFIED_SINCE='Thu, 02 Jan 2020 00:00:00 GMT')
+    assert response.status_code == 304
+    assert views.ARTICLE['renders'] == renders
+    assert Client().get('/article', HTTP_IF_MODIFIED_SINCE='Tue, 31 Dec 2019 00:00:00 GMT').status_code == 200
+
+
+def test_unsafe_methods_are_preconditioned_on_validators():
+    client = Client()
+    title = views.ARTICLE['title']
+    response = client.put('/article', data={'title': 'Second'}, content_type='application/json',
+                          HTTP_IF_UNMODIFIED_SINCE='Tue, 31 Dec 2019 00:00:00 GMT')
+    assert response.status_code == 412
+    assert views.ARTICLE['title'] == title
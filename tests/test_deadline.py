@@ -0,0 +1,45 @@
+import json
+import math
+import time
+
+import pytest
+from django.test import Client, RequestFactory
+
+from frameapp.ext.django_integration.deadline import NO_DEADLINE, propagated_deadline, effective_deadline
+
+
+rf = RequestFactory()
+
+
+def test_propagated_deadline_is_converted_to_monotonic_time():
+    deadline = propagated_deadline(rf.get('/', HTTP_X_REQUEST_DEADLINE=str(time.time() + 10)))
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired()
+
+
+@pytest.mark.parametrize('value', ['', 'soon', 'nan', 'NaN', 'inf', '-inf', '1e400'])
+def test_malformed_and_non_finite_deadlines_are_ignored(value):
+    assert propagated_deadline(rf.get('/', HTTP_X_REQUEST_DEADLINE=value)) is NO_DEADLINE
+
+
+def test_earliest_deadline_wins():
+    started_at = time.monotonic()
+    assert effective_deadline(NO_DEADLINE, started_at, None) is NO_DEADLINE
+    assert effective_deadline(NO_DEADLINE, started_at, 1.0).expires_at == started_at + 1.0
+    upstream = propagated_deadline(rf.get('/', HTTP_X_REQUEST_DEADLINE=str(time.time() + 0.5)))
+    assert effective_deadline(upstream, started_at, 1.0) is upstream
+    assert math.isinf(NO_DEADLINE.remaining())
+
+
+def test_endpoint_budget_is_exposed_to_the_view():
+    response = Client().get('/slow')
+    assert response.status_code == 200
+    assert 0 < json.loads(response.content)['remaining'] <= 0.05
+
+
+def test_exceeded_budget_results_in_gateway_timeout():
+    assert Client().get('/slow', {'sleep': 0.1}).status_code == 504
+
+
+def test_expired_upstream_deadline_results_in_gateway_timeout():
+    assert Client().get('/slow', HTTP_X_REQUEST_DEADLINE=str(time.time() - 1)).status_code == 504
@@ -0,0 +1,107 @@
+import json
+
+from django.test import Client, RequestFactory
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.viewsets import GenericViewSet
+
+from frameapp.ext.django_integration.drf import PreparedContentNegotiation, policy_overrides
+from frameapp.ext.django_integration.url import DRFAPIViewWrapper, DRFViewMixinWrapper
+
+
+rf = RequestFactory()
+
+
+class BrowsableView(APIView):
+    renderer_classes = (JSONRenderer, BrowsableAPIRenderer)
+    permission_classes = (AllowAny,)
+
+    def get(self, request, **kwargs):
+        return Response({'parsers': [id(p) for p in request.parsers], 'renderer': type(request.accepted_renderer).__name__})
+
+
+class CustomPermissionsView(APIView):
+    def get_permissions(self):
+        return [IsAuthenticated()]
+
+
+def test_policies_are_prepared_once_per_view():
+    overrides = policy_overrides(BrowsableView)
+    assert sorted(overrides) == ['get_authenticators', 'get_content_negotiator', 'get_parsers',
+                                 'get_permissions', 'get_renderers']
+    assert overrides['get_parsers']() is overrides['get_parsers']()
+    assert overrides['get_content_negotiator']() is overrides['get_content_negotiator']()
+    first, second = overrides['get_renderers'](), overrides['get_renderers']()
+    # browsable renderers keep request state on their instances
+    assert first[0] is second[0]
+    assert first[1] is not second[1]
+
+
+def test_overridden_getters_are_kept():
+    assert 'get_permissions' not in policy_overrides(CustomPermissionsView)
+    view = CustomPermissionsView(**policy_overrides(CustomPermissionsView))
+    assert isinstance(view.get_permissions()[0], IsAuthenticated)
+
+
+def test_negotiation_results_are_remembered():
+    negotiation = PreparedContentNegotiation()
+    renderers = [JSONRenderer(), BrowsableAPIRenderer()]
+    for _ in range(2):
+        request = Request(rf.get('/', HTTP_ACCEPT='text/html'))
+        renderer, media_type = negotiation.select_renderer(request, renderers)
+        assert renderer is renderers[1]
+        assert media_type == 'text/html'
+    request = Request(rf.get('/', HTTP_ACCEPT='application/json'))
+    assert negotiation.select_renderer(request, renderers)[0] is renderers[0]
+    assert len(negotiation.selections) == 2
+    expected = DefaultContentNegotiation().select_renderer(Request(rf.get('/?format=json')), renderers)
+    assert negotiation.select_renderer(Request(rf.get('/?format=json')), renderers) == expected
+
+
+def test_api_view_wrapper_dispatches_with_prepared_policies():
+    handler = DRFAPIViewWrapper(BrowsableView, 'get')
+    first = json.loads(handler(rf.get('/', HTTP_ACCEPT='application/json')).render().content)
+    second = json.loads(handler(rf.get('/', HTTP_ACCEPT='application/json')).render().content)
+    assert first == second
+    assert first['renderer'] == 'JSONRenderer'
+    html = handler(rf.get('/', HTTP_ACCEPT='text/html'))
+    assert isinstance(html.accepted_renderer, BrowsableAPIRenderer)
+    # DRF classes are not patched
+    assert BrowsableView.dispatch is APIView.dispatch
+
+
+def test_api_view_wrapper_does_not_require_view_setup(monkeypatch):
+    # View.setup() was added in Django 2.2
+    from django.views.generic import View
+    monkeypatch.delattr(View, 'setup')
+    response = DRFAPIViewWrapper(BrowsableView, 'get')(rf.get('/', HTTP_ACCEPT='application/json'), pk='1')
+    assert json.loads(response.render().content)['renderer'] == 'JSONRenderer'
+
+
+class QuerysetlessViewSet(GenericViewSet):
+    def list(self, request, **kwargs):
+        return Response({'action': self.action, 'detail': self.detail})
+
+    def retrieve(self, request, pk=None, **kwargs):
+        return Response({'action': self.action, 'pk': pk})
+
+
+def test_viewset_wrapper_routes_collection_and_item_requests():
+    handler = DRFViewMixinWrapper(QuerysetlessViewSet)
+    response = handler(rf.get('/things'))
+    assert response.render().data == {'action': 'list', 'detail': False}
+    response = handler(rf.get('/things/5'), __frameapp_dynamic_viewset__='/5', pk='5')
+    assert response.render().data == {'action': 'retrieve', 'pk': '5'}
+    assert handler.csrf_exempt
+
+
+def test_viewsets_work_end_to_end():
+    response = Client().get('/things')
+    assert response.status_code == 200
+    assert json.loads(response.content) == {'things': []}
+    # the viewset doesn't define item actions
+    assert Client().get('/things/1').status_code == 404
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import NamedTuple
+
+import pytest
+
+from frameapp.configurator import encoders
+from frameapp.configurator.encoders import converter_for, encode_json_orjson, encode_json_stdlib
+from frameapp.configurator.renderers import encode_json
+from frameapp.structures import CompactSerializable
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class User(CompactSerializable):
+    __slots__ = ('id', 'name', 'joined_at')
+    DEFAULT_OUT_MODIFIERS = {'name': ['.upper']}
+
+    def __init__(self, id, name, joined_at):
+        self.id = id
+        self.name = name
+        self.joined_at = joined_at
+
+
+class CustomUser(User):
+    __slots__ = ()
+
+    def __json__(self):
+        return {'custom': self.id}
+
+
+PAYLOAD = {
+    'users': [User(1, 'ann', datetime(2020, 1, 2, 3, 4, 5, 678)), CustomUser(2, 'bob', None)],
+    'point': Point(1, 2),
+    'price': Decimal('1.5'),
+    'color': Color.RED,
+    'text': 'ünïcode',
+}
+
+
+backends = [encode_json_stdlib]
+if encoders.orjson is not None:
+    backends.append(encode_json_orjson)
+
+
+@pytest.mark.parametrize('encode', backends)
+def test_backends_agree_with_the_generic_encoder(encode):
+    assert json.loads(encode(PAYLOAD)) == json.loads(encode_json(PAYLOAD)) == {
+        'users': [{'id': 1, 'name': 'ANN', 'joined_at': '2020-01-02T03:04:05'}, {'custom': 2}],
+        'point': [1, 2],
+        'price': 1.5,
+        'color': 'red',
+        'text': 'ünïcode',
+    }
+
+
+@pytest.mark.parametrize('encode', backends)
+def test_values_unsupported_by_orjson_fall_back_to_stdlib(encode):
+    assert json.loads(encode({'big': 2 ** 70, 1: 'int key'})) == {'big': 2 ** 70, '1': 'int key'}
+
+
+def test_converters_are_compiled_only_for_known_shapes():
+    assert converter_for(Point) is list
+    assert converter_for(User) is converter_for(User)
+    assert converter_for(CustomUser) is None
+    assert converter_for(Decimal) is None
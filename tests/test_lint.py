@@ -0,0 +1,67 @@
+import pytest
+
+from frameapp.configurator.lint import check_routes, lint_routes, measure_pattern_costs
+from frameapp.exceptions import ConfigurationError
+
+from configuration import Language, configure
+
+
+def routes_of(*routes, rules=None):
+    config = configure('lint', routes, [], rules)
+    return config.routes.registry['lint']
+
+
+def kinds(findings):
+    return sorted((f.route_name, f.kind, f.is_error) for f in findings)
+
+
+def test_clean_routes_have_no_findings():
+    routes = routes_of(('item', '/items/{id:\\d+}'), ('about', '/{lang}/about'), ('file', '/files/{name:[a-z]+}.{ext}'),
+                       rules={'about': {'lang': Language}})
+    assert lint_routes('lint', routes) == []
+    assert check_routes('lint', routes, 'fail') == []
+
+
+def test_hazards_are_reported():
+    routes = routes_of(
+        ('nested', '/a/{q:(\\w+\\s?)+}'),
+        ('alternatives', '/b/{q:(a|aa)*}'),
+        ('invalid', '/c/{q:(}'),
+        ('slash', '/d/{path:.*}'),
+        ('adjacent', '/e/{a}{b}'),
+        ('separated', '/f/{a:[a-z]+}-{b}'),
+    )
+    assert kinds(lint_routes('lint', routes)) == [
+        ('adjacent', 'overlapping-placeholders', False),
+        ('alternatives', 'ambiguous-alternation', True),
+        ('invalid', 'invalid-rule', True),
+        ('nested', 'nested-quantifier', True),
+        ('slash', 'slash', False),
+    ]
+
+
+def test_fail_mode_raises_on_errors_only():
+    warnings = routes_of(('slash', '/d/{path:.*}'))
+    assert kinds(check_routes('lint', warnings, 'fail')) == [('slash', 'slash', False)]
+    with pytest.raises(ConfigurationError, match='nested'):
+        check_routes('lint', routes_of(('nested', '/a/{q:(\\w+\\s?)+}')), 'fail')
+    assert check_routes('lint', routes_of(('nested', '/a/{q:(\\w+\\s?)+}')), 'warn')
+    with pytest.raises(ConfigurationError):
+        check_routes('lint', warnings, 'strict')
+
+
+def test_exponential_patterns_are_measured_within_the_budget():
+    routes = routes_of(('slow', '/{q:(a+)+}/x'), ('fast', '/{q:[a-z]+}/x'))
+    costs = {cost.route_name: cost for cost in measure_pattern_costs('lint', routes, budget=0.001)}
+    assert costs['slow'].exceeded
+    assert costs['slow'].length < 64
+    assert not costs['fast'].exceeded
+    assert costs['fast'].length == 64
+
+
+def test_scan_lints_the_scanned_namespace():
+    from frameapp import entrypoint
+
+    config = entrypoint.setup('sampleapp', {'sampleapp': [{'entry_point': 'includeme', 'url_prefix': '/'}]},
+                              namespace='linted', lint='fail')
+    assert 'items' in config.routes.registry['linted']
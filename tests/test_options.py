@@ -0,0 +1,32 @@
+import json
+
+from django.test import Client
+
+
+def test_options_is_answered_from_the_allowed_methods():
+    response = Client().options('/counter')
+    assert response.status_code == 200
+    assert response['Allow'] == 'GET, HEAD, OPTIONS, POST'
+    assert response.content == b''
+
+
+def test_options_of_default_methods_plain_view_is_answered_by_the_route():
+    response = Client().options('/ping')
+    assert response.status_code == 200
+    assert response['Allow'] == 'DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT'
+    assert response.content == b''
+
+
+def test_options_of_default_methods_drf_view_returns_drf_metadata():
+    response = Client().options('/things')
+    assert response.status_code == 200
+    metadata = json.loads(response.content)
+    assert metadata['name'] == 'Things List'
+    assert metadata['description'] == 'Things of the sample app.'
+    assert 'application/json' in metadata['renders']
+
+
+def test_disallowed_method_is_rejected_with_allow_header():
+    response = Client().delete('/counter')
+    assert response.status_code == 405
+    assert response['Allow'] == 'GET, HEAD, OPTIONS, POST'
@@ -0,0 +1,116 @@
+import re
+
+import pytest
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from frameapp.configurator import Configurator
+from frameapp.configurator.patterns import (
+    Placeholder, Text, can_match_slash, compile_url_template, parse_route_pattern, route_segments, sum_type_rule,
+)
+from frameapp.configurator.sums import SumType
+from frameapp.exceptions import ConfigurationError
+from frameapp.ext.django_integration.url import complete_route_pattern, django_url_patterns, normalize_route_pattern
+
+from configuration import Language, routing_config
+
+
+def test_route_patterns_are_parsed_into_nodes():
+    assert parse_route_pattern('/users/{user_id:\\d{1,4}}/{lang}') == (
+        Text('/users/'), Placeholder('user_id', '\\d{1,4}'), Text('/'), Placeholder('lang', None)
+    )
+    assert parse_route_pattern('{a}{b:x}') == (Placeholder('a', None), Placeholder('b', 'x'))
+    assert parse_route_pattern('/static') == (Text('/static'),)
+    assert parse_route_pattern('') == ()
+    assert parse_route_pattern('/a') is parse_route_pattern('/a')
+
+
+@pytest.mark.parametrize('pattern', ['/users/{id', '/users/{id:\\d{2}', '{'])
+def test_unterminated_placeholders_are_rejected(pattern):
+    with pytest.raises(ConfigurationError, match='Unexpected end of a route pattern'):
+        parse_route_pattern(pattern)
+
+
+def test_patterns_are_completed_with_rules():
+    rules = {'lang': Language, 'slug': '[a-z]+'}
+    assert complete_route_pattern('/{lang}/{slug}/{id}/{n:\\d{2}}', rules) == \
+        '/{lang:(?:d(?:e|k)|en)}/{slug:[a-z]+}/{id:[^/]+}/{n:\\d{2}}'
+    assert complete_route_pattern('/{id}', {}, lambda name, rule: f'(?P<{name}>{rule})') == '/(?P<id>[^/]+)'
+
+
+def test_embedded_sum_types_become_rules():
+    assert normalize_route_pattern('/{lang:<configuration:Language>}/{id:\\d+}') == (
+        '/{lang}/{id:\\d+}', {'lang': Language}
+    )
+
+
+def test_route_segments():
+    assert route_segments('items/{id:\\d+}/x{n}', {}) == [(True, 'items'), (False, '(?:\\d+)'), (False, 'x(?:[^/]+)')]
+    assert route_segments('files/{path:.+}', {}) is None
+    assert route_segments('files/{path:[a-z/]+}', {}) is None
+    assert route_segments('v1.0/status', {}) is None
+
+
+def test_url_for_agrees_with_reverse():
+    config = routing_config()
+    resolver = URLResolver(RegexPattern('^'), django_url_patterns('routing', config))
+    for route_name, kwargs in [('home', {}), ('items', {}), ('item', {'item_id': 5}), ('user', {'user_id': 'a b;@'}),
+                               ('files', {'path': 'a/b c.txt'}), ('status', {})]:
+        assert config.url_for('routing', route_name, **kwargs) == f'/{resolver.reverse(f"routing.{route_name}", **kwargs)}'
+
+
+def test_url_for_renders_sum_type_values():
+    registry = routing_config().registry
+    assert registry.url_for('routing', 'about', lang=Language.GERMAN) == '/de/about'
+    assert registry.url_for('routing', 'about', lang='dk') == '/dk/about'
+    with pytest.raises(TypeError, match='is not a value of Language'):
+        registry.url_for('routing', 'about', lang='fr')
+
+
+def test_url_for_checks_arguments():
+    registry = routing_config().registry
+    with pytest.raises(TypeError, match=r"missing arguments \['item_id'\]"):
+        registry.url_for('routing', 'item')
+    with pytest.raises(TypeError, match=r"unexpected arguments \['page'\]"):
+        registry.url_for('routing', 'item', item_id=1, page=2)
+    with pytest.raises(KeyError):
+        registry.url_for('routing', 'nope')
+
+
+def test_leading_double_slash_is_escaped():
+    assert compile_url_template('/{path:.+}', {}).render({'path': '/evil.com'}) == '/%2Fevil.com'
+    assert compile_url_template('/{path:.+}', {}).render({'path': 'ok'}) == '/ok'
+
+
+def test_url_for_checks_arguments_against_placeholder_rules():
+    registry = routing_config().registry
+    with pytest.raises(ConfigurationError, match='does not match its rule'):
+        registry.url_for('routing', 'user', user_id='a/b')
+    with pytest.raises(ConfigurationError):
+        registry.url_for('routing', 'item', item_id='5x')
+    with pytest.raises(ConfigurationError):
+        compile_url_template('/{path}', {}).render({'path': '/evil.com'})
+    assert compile_url_template('/{id}', {'id': '[a-z]+'}).render({'id': 'abc'}) == '/abc'
+    with pytest.raises(ConfigurationError):
+        compile_url_template('/{id}', {'id': '[a-z]+'}).render({'id': 'abc1'})
+
+
+def test_url_for_requires_frozen_configuration():
+    with pytest.raises(ConfigurationError):
+        Configurator().url_for('routing', 'home')
+
+
+class Code(SumType):
+    PLUS: str = 'a+b'
+    DOT: str = 'a.b'
+    SHORT: str = 'a'
+    NUMBER: int = 10
+
+
+def test_sum_type_rule_matches_values_only():
+    assert sum_type_rule(Language) == '(?:d(?:e|k)|en)'
+    rule = re.compile(sum_type_rule(Code))
+    for value in ['a+b', 'a.b', 'a', '10']:
+        assert rule.fullmatch(value), value
+    for value in ['aab', 'a+', 'ab', '1', '100', '']:
+        assert not rule.fullmatch(value), value
+    assert not can_match_slash(sum_type_rule(Code))
@@ -0,0 +1,48 @@
+import json
+
+import jsonschema
+import pytest
+from django.test import Client
+
+
+def test_function_view_receives_django_request():
+    response = Client().get('/greetings/world')
+    assert response.status_code == 200
+    assert json.loads(response.content) == {'greeting': 'Hello, world', 'request': 'WSGIRequest'}
+
+
+def test_class_view_is_instantiated_per_request():
+    client = Client()
+    first = json.loads(client.get('/counter').content)['instances']
+    second = json.loads(client.get('/counter').content)['instances']
+    assert second == first + 1
+    assert json.loads(client.post('/counter').content) == {'posted': True}
+    assert client.delete('/counter').status_code == 405
+
+
+def test_plain_views_are_csrf_protected_next_to_drf_views():
+    client = Client(enforce_csrf_checks=True)
+    assert client.get('/mixed').status_code == 200
+    assert client.post('/mixed').status_code == 403
+    assert client.post('/counter').status_code == 403
+    # DRF views are exempt from the middleware, and enforce CSRF only for session authentication
+    assert client.post('/drf-post', data={'a': 1}, content_type='application/json').status_code == 200
+
+    token = 'a' * 32
+    client.cookies['csrftoken'] = token
+    response = client.post('/mixed', HTTP_X_CSRFTOKEN=token)
+    assert json.loads(response.content) == {'plain': True}
+
+
+def test_input_schema_validates_json_body_of_plain_requests():
+    client = Client()
+    response = client.post('/validated', data=json.dumps({'text': 'hi'}), content_type='application/json')
+    assert json.loads(response.content) == {'valid': True}
+    with pytest.raises(jsonschema.ValidationError):
+        client.post('/validated', data=json.dumps({'title': 'hi'}), content_type='application/json')
+
+
+@pytest.mark.parametrize('body', [b'{"text": ', b'\xff'])
+def test_input_schema_rejects_malformed_json_body(body):
+    response = Client().post('/validated', data=body, content_type='application/json')
+    assert response.status_code == 404
@@ -0,0 +1,131 @@
+import json
+from typing import Generator
+
+import pytest
+from django.test import RequestFactory
+
+from frameapp.codec import CONTENT_TYPE, decode_compact
+from frameapp.configurator.encoders import CompiledJSONEncoder
+from frameapp.configurator.renderers import (
+    ExtendedDjangoJSONEncoder, ExtendedJSONEncoder, JsonRendererFactory, StreamingDjangoJSONEncoder, StreamingJsonRendererFactory,
+    encode_json, iter_json_chunks, lazy_list, prefers_explicitly, resolve_type_converter,
+)
+
+
+rf = RequestFactory()
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('', False),
+    ('*/*', False),
+    ('application/json', False),
+    (CONTENT_TYPE, True),
+    (f'{CONTENT_TYPE}, application/json', True),
+    (f'application/json, {CONTENT_TYPE}', True),
+    (f'{CONTENT_TYPE};q=0, application/json', False),
+    (f'{CONTENT_TYPE}; q=0.0', False),
+    (f'{CONTENT_TYPE};q=0.5, application/json', False),
+    (f'{CONTENT_TYPE};q=0.5, application/*;q=0.4', True),
+    (f'{CONTENT_TYPE};q=0.5, */*', False),
+    (f'{CONTENT_TYPE};q=0.5, application/json;q=0.1, */*', True),
+    (f'{CONTENT_TYPE.upper()}', True),
+    (f'{CONTENT_TYPE};q=x', False),
+])
+def test_compact_format_is_selected_only_when_preferred(accept, expected):
+    assert prefers_explicitly(accept, CONTENT_TYPE, 'application/json') is expected
+
+
+def test_json_renderer_negotiates_the_format():
+    render = JsonRendererFactory('json')
+    response = render(rf.get('/', HTTP_ACCEPT=f'{CONTENT_TYPE};q=0, application/json'), {'a': [1]})
+    assert response['Content-Type'].startswith('application/json')
+    assert json.loads(response.content) == {'a': [1]}
+    assert response['Vary'] == 'Accept'
+
+    response = render(rf.get('/', HTTP_ACCEPT=CONTENT_TYPE), {'a': [1]})
+    assert response['Content-Type'] == CONTENT_TYPE
+    assert decode_compact(response.content) == {'a': [1]}
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+@pytest.fixture
+def point_converter():
+    saved = ExtendedDjangoJSONEncoder.__dict__['TYPE_CONVERTERS']
+    ExtendedDjangoJSONEncoder.add_type_converter(Point, lambda p: [p.x, p.y])
+    yield
+    ExtendedDjangoJSONEncoder.TYPE_CONVERTERS = saved
+    ExtendedDjangoJSONEncoder._resolved_converters = {}
+    StreamingDjangoJSONEncoder._resolved_converters = {}
+
+
+def test_streaming_encoder_inherits_converters_registered_later(point_converter):
+    payload = {'p': Point(1, 2), 'g': (i for i in range(3))}
+    assert json.loads(b''.join(iter_json_chunks(payload, 4))) == {'p': [1, 2], 'g': [0, 1, 2]}
+    assert StreamingDjangoJSONEncoder.TYPE_CONVERTERS[Generator] is lazy_list
+
+
+def test_streaming_renderer_output_matches_json_renderer():
+    payload = {'rows': [{'id': i, 'name': f'row {i}'} for i in range(100)], 'keys': {'a': 1}.keys()}
+    response = StreamingJsonRendererFactory('json_stream')(rf.get('/'), payload)
+    assert response.streaming
+    assert response['Content-Type'].startswith('application/json')
+    assert json.loads(b''.join(response.streaming_content)) == json.loads(
+        JsonRendererFactory('json')(rf.get('/'), payload).content
+    )
+
+
+def test_generators_are_streamed_lazily():
+    consumed = []
+
+    def rows():
+        for i in range(1000):
+            consumed.append(i)
+            yield {'id': i, 'padding': 'x' * 100}
+
+    chunks = iter_json_chunks({'rows': rows(), 'empty': (i for i in ())}, 4096)
+    first = next(chunks)
+    assert 0 < len(consumed) < 1000
+    rest = b''.join(chunks)
+    document = json.loads(first + rest)
+    assert [row['id'] for row in document['rows']] == list(range(1000))
+    assert document['empty'] == []
+
+
+def test_type_converters_are_resolved_by_json_method_mro_and_abstract_bases():
+    from collections.abc import Sized
+    from decimal import Decimal
+
+    class Sum(Decimal):
+        pass
+
+    class WithJson(Decimal):
+        def __json__(self):
+            return 'json'
+
+    class Bag:
+        def __len__(self):
+            return 0
+
+    converters = {Decimal: float, Sized: len}
+    assert resolve_type_converter(converters, Sum) is float
+    assert resolve_type_converter(converters, WithJson)(WithJson(1)) == 'json'
+    assert resolve_type_converter(converters, Bag) is len
+    assert resolve_type_converter(converters, Point) is None
+    assert json.loads(encode_json({'sum': Sum('1.5'), 'json': WithJson(1)})) == {'sum': 1.5, 'json': 'json'}
+
+
+@pytest.mark.parametrize('base', [ExtendedJSONEncoder, ExtendedDjangoJSONEncoder, CompiledJSONEncoder])
+def test_subclass_overriding_a_converter_does_not_affect_its_base(base):
+    from decimal import Decimal
+
+    class Overriding(base):
+        TYPE_CONVERTERS = {Decimal: lambda d: 'X'}
+
+    assert json.loads(Overriding().encode(Decimal('1.5'))) == 'X'
+    assert json.loads(base().encode(Decimal('1.5'))) != 'X'
+    assert json.loads(Overriding().encode(Decimal('2.5'))) == 'X'
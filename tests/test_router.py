@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from django.test import RequestFactory
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from frameapp.ext.django_integration.router import django_radix_url_pattern, literal_paths
+from frameapp.ext.django_integration.url import django_url_patterns
+
+from configuration import PATHS, Language, resolution, routing_config
+
+
+@pytest.fixture(scope='module')
+def config():
+    return routing_config()
+
+
+@pytest.mark.parametrize('expand_sum_types', [False, True])
+def test_radix_resolver_agrees_with_linear_resolution(config, expand_sum_types):
+    linear = django_url_patterns('routing', config)
+    radix = django_radix_url_pattern('routing', config, expand_sum_types=expand_sum_types)
+    for path in PATHS:
+        assert resolution(radix, path) == resolution(linear, path), path
+
+
+def test_unsplittable_routes_are_checked_for_every_path(config):
+    tree = django_radix_url_pattern('routing', config).tree
+    assert sorted(url_pattern.name for _, url_pattern in tree.fallback) == ['routing.files', 'routing.status']
+
+
+def test_reverse_uses_route_names(config):
+    resolver = URLResolver(RegexPattern('^'), [django_radix_url_pattern('routing', config)])
+    assert resolver.reverse('routing.item', item_id=5) == 'items/5'
+
+
+def test_viewset_item_paths():
+    from sample_urls import config, frameapp_urls
+
+    radix = django_radix_url_pattern('sample', config)
+    for path in ['things', 'things/1', 'things/1/2', 'items/1', 'cached/a', 'nothing']:
+        assert resolution(radix, path) == resolution(frameapp_urls, path), path
+    assert resolution(radix, 'things/1') == ('sample.things-drf_viewset',
+                                              {'__frameapp_dynamic_viewset__': '/1', 'pk': '1'})
+
+
+def test_static_paths_are_resolved_upfront(config):
+    tree = django_radix_url_pattern('routing', config).tree
+    assert sorted(tree.static_matches) == ['', 'items', 'users/me']
+    # an earlier route keeps precedence over the static one
+    assert tree.static_matches['users/me'][1].url_name == 'routing.user'
+
+    expanded = django_radix_url_pattern('routing', config, expand_sum_types=True).tree
+    assert sorted(expanded.static_matches) == ['', 'de/about', 'dk/about', 'en/about', 'items', 'users/me']
+
+
+def test_literal_paths():
+    assert list(literal_paths('{lang}/about', {'lang': Language}, expand_sum_types=True)) == \
+        ['de/about', 'dk/about', 'en/about']
+    assert list(literal_paths('{lang}/about', {'lang': Language}, expand_sum_types=False)) == []
+    assert list(literal_paths('{lang:en}/about', {'lang': Language}, expand_sum_types=True)) == []
+    assert list(literal_paths('v1.0/status', {}, expand_sum_types=True)) == []
+    assert list(literal_paths('{a}/{b}/{c}/{d}/{e}/{f}/{g}', dict.fromkeys('abcdefg', Language),
+                              expand_sum_types=True)) == []
+
+
+def test_expanded_sum_type_paths_are_dispatched_to_views(config):
+    match = django_radix_url_pattern('routing', config, expand_sum_types=True).resolve('en/about')
+    response = match.func(RequestFactory().get('/en/about'), *match.args, **match.kwargs)
+    assert json.loads(response.content) == {'lang': 'en'}
@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+
+from frameapp.configurator.renderers import encode_json
+from frameapp.structures import (
+    CompactSerializable, as_columns, as_dicts, compile_as_dict, iter_json_lines, pack_column, write_json_lines,
+)
+
+
+class Event(CompactSerializable):
+    __slots__ = ('id', 'kind', 'class')
+    IN_MODIFIERS = {'kind': {'a': 'alpha', 'b': 'beta'}.__getitem__}
+    DEFAULT_IN_MODIFIERS = {'kind': ['kind', '.upper']}
+
+    def __init__(self, id, kind, cls):
+        self.id = id
+        self.kind = kind
+        setattr(self, 'class', cls)
+
+
+def test_from_dict_applies_input_modifiers_and_ignores_extra_keys():
+    event = Event.from_dict({'id': 1, 'kind': 'a', 'class': 'x', 'extra': None})
+    assert (event.id, event.kind, getattr(event, 'class')) == (1, 'ALPHA', 'x')
+    assert [e.kind for e in Event.from_dicts([{'id': 1, 'kind': 'a', 'class': 'x'},
+                                              {'id': 2, 'kind': 'b', 'class': 'y'}])] == ['ALPHA', 'BETA']
+
+
+def test_missing_field_is_reported_as_type_error():
+    with pytest.raises(TypeError, match=r"Event.from_dict\(\) is missing a field: 'class'"):
+        Event.from_dict({'id': 1, 'kind': 'a'})
+    with pytest.raises(TypeError, match="missing a field: 'id'"):
+        Event.from_dicts([{'id': 1, 'kind': 'a', 'class': 'x'}, {'kind': 'a', 'class': 'x'}])
+
+
+def test_errors_of_input_modifiers_propagate_unchanged():
+    with pytest.raises(KeyError, match="'z'"):
+        Event.from_dict({'id': 1, 'kind': 'z', 'class': 'x'})
+
+
+def test_class_without_fields():
+    class Empty(CompactSerializable):
+        __slots__ = ()
+
+    assert isinstance(Empty.from_dict({}), Empty)
+
+
+class Account(CompactSerializable):
+    __slots__ = ('id', 'name', 'tags')
+    DEFAULT_OUT_MODIFIERS = {'tags': ['json']}
+
+    def __init__(self, id, name, tags):
+        self.id = id
+        self.name = name
+        self.tags = tags
+
+
+class ShoutingAccount(Account):
+    __slots__ = ()
+
+    def apply_modifier(self, modifier, value):
+        return f'{super().apply_modifier(modifier, value)}!'
+
+
+def test_as_dict_plans():
+    account = Account(1, 'ann', ['a'])
+    assert account.as_dict() == {'id': 1, 'name': 'ann', 'tags': '["a"]'}
+    assert account.as_dict(exclude={'tags'}) == {'id': 1, 'name': 'ann'}
+    # explicit modifiers are followed by default ones, exclude applies to the default fields only
+    assert account.as_dict(fields=['name | .upper', 'id | str', 'tags'], exclude={'name'}) == {
+        'name': 'ANN', 'id': '1', 'tags': '["a"]'
+    }
+    assert json.loads(str(account)) == account.as_dict()
+    assert compile_as_dict(Account, ('id',), frozenset()) is compile_as_dict(Account, ('id',), frozenset())
+
+
+def test_as_dict_calls_overridden_apply_modifier():
+    assert ShoutingAccount(1, 'ann', []).as_dict(fields=['name | .title']) == {'name': 'Ann!'}
+
+
+def test_bulk_dicts_and_json_lines():
+    mixed = [Account(1, 'ann', []), ShoutingAccount(2, 'bob', ['b'])]
+    assert as_dicts(mixed, fields=['id', 'name']) == [o.as_dict(fields=['id', 'name']) for o in mixed]
+    accounts = [Account(1, 'ann', []), Account(2, 'bob', ['b'])]
+    assert as_dicts(accounts, exclude={'tags'}) == [{'id': 1, 'name': 'ann'}, {'id': 2, 'name': 'bob'}]
+
+    lines = list(iter_json_lines(iter(accounts), exclude={'tags'}))
+    assert [json.loads(line) for line in lines] == as_dicts(accounts, exclude={'tags'})
+    assert all(line.endswith(b'\n') and line.count(b'\n') == 1 for line in lines)
+
+    stream = io.BytesIO()
+    assert write_json_lines(stream, accounts, fields=['id']) == 2
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [{'id': 1}, {'id': 2}]
+    assert write_json_lines(io.BytesIO(), []) == 0
+
+
+def test_columns_are_packed_when_typed():
+    accounts = [Account(1, 'ann', []), Account(2, 'bob', ['b'])]
+    columns = as_columns(accounts, fields=['id', 'name'])
+    assert list(columns['id']) == [1, 2]
+    assert not isinstance(columns['id'], list)
+    assert columns['name'] == ['ann', 'bob']
+    assert as_columns(accounts, fields=['id'], typed=False) == {'id': [1, 2]}
+    assert json.loads(encode_json(columns)) == {'id': [1, 2], 'name': ['ann', 'bob']}
+    assert as_columns([]) == {}
+
+
+def test_columns_require_the_same_fields():
+    with pytest.raises(ValueError):
+        as_columns([Account(1, 'ann', []), Event(1, 'a', 'x')])
+
+
+def test_pack_column():
+    assert pack_column([True, False]) == [True, False]
+    assert pack_column([1, 2.5]) == [1, 2.5]
+    assert pack_column([2 ** 70]) == [2 ** 70]
+    assert list(pack_column([0.5, 1.5])) == [0.5, 1.5]
@@ -0,0 +1,98 @@
+import itertools
+
+import pytest
+from django.conf import settings
+from django.test import Client, override_settings
+from django.urls import URLPattern, URLResolver
+
+from frameapp.exceptions import ConfigurationError
+from frameapp.ext.django_integration.hits import get_route_hits, load_route_hits
+from frameapp.ext.django_integration.url import django_url_patterns
+
+from configuration import PATHS, ROUTE_RULES, ROUTES, configure, endpoint, resolution, routing_config
+
+
+@pytest.fixture(scope='module')
+def config():
+    return routing_config()
+
+
+def flat_names(url_patterns):
+    rv = []
+    for p in url_patterns:
+        if isinstance(p, URLResolver):
+            rv.append([p.pattern.regex.pattern, flat_names(p.url_patterns)])
+        else:
+            rv.append(p.name)
+    return rv
+
+
+HITS = {'routing.user_me': 100, 'routing.status': 50, 'routing.item_slug': 10}
+
+
+@pytest.mark.parametrize('group_by_prefix, ordering', list(itertools.product([False, True], [None, 'specificity', 'hits'])))
+def test_arranged_patterns_resolve_paths_the_same_way(config, group_by_prefix, ordering):
+    default = django_url_patterns('routing', config)
+    arranged = django_url_patterns('routing', config, group_by_prefix=group_by_prefix, ordering=ordering, hits=HITS)
+    for path in PATHS:
+        assert resolution(arranged, path) == resolution(default, path), path
+
+
+def test_routes_are_grouped_by_static_prefix(config):
+    assert flat_names(django_url_patterns('routing', config, group_by_prefix=True)) == [
+        'routing.home',
+        'routing.items',
+        ['^items/', ['routing.item', 'routing.item_comments', 'routing.item_slug']],
+        'routing.about',
+        'routing.files',
+        'routing.status',
+        ['^users/', ['routing.user', 'routing.user_me']],
+    ]
+
+
+@pytest.fixture(scope='module')
+def splittable_config():
+    routes = [(name, pattern) for name, pattern in ROUTES if name not in ('files', 'status')]
+    return configure('ordering', routes, [(endpoint, {'route_name': name, 'request_method': 'GET'})
+                                          for name, _ in routes], ROUTE_RULES)
+
+
+def test_specific_routes_come_first_unless_they_are_shadowed(splittable_config):
+    names = flat_names(django_url_patterns('ordering', splittable_config, ordering='specificity'))
+    assert names[:3] == ['ordering.home', 'ordering.items', 'ordering.item_comments']
+    # "/users/me" may be matched by "/users/{user_id}", which is registered earlier
+    assert names[-2:] == ['ordering.user', 'ordering.user_me']
+    assert names.index('ordering.item') < names.index('ordering.item_slug')
+
+
+def test_most_requested_routes_come_first(splittable_config):
+    hits = {'ordering.user_me': 100, 'ordering.about': 50, 'ordering.user': 20}
+    url_patterns = django_url_patterns('ordering', splittable_config, ordering='hits', hits=hits)
+    names = flat_names(url_patterns)
+    # "/users/me" cannot move before "/users/{user_id}" that would shadow it
+    assert names[:3] == ['ordering.about', 'ordering.user', 'ordering.user_me']
+    default = django_url_patterns('ordering', splittable_config)
+    for path in PATHS:
+        assert resolution(url_patterns, path) == resolution(default, path), path
+
+
+def test_invalid_ordering_is_rejected(config):
+    with pytest.raises(ConfigurationError):
+        django_url_patterns('routing', config, ordering='random')
+    with pytest.raises(ConfigurationError):
+        django_url_patterns('routing', config, ordering='hits')
+
+
+def test_hits_are_recorded_by_middleware(tmp_path):
+    hits = get_route_hits()
+    hits.clear()
+    Client().get('/items')
+    assert hits.as_dict() == {}
+    with override_settings(FRAMEAPP={**settings.FRAMEAPP, 'RECORD_ROUTE_HITS': True}):
+        client = Client()
+        client.get('/items')
+        client.get('/items')
+        client.get('/report')
+    hits.dump(str(tmp_path / 'hits.json'))
+    assert load_route_hits(str(tmp_path / 'hits.json')) == {'sample.items': 2, 'sample.report': 1}
+    hits.clear()
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from django.test import RequestFactory
+from django.urls.resolvers import RegexPattern, URLResolver
+
+from frameapp.exceptions import ConfigurationError
+from frameapp.ext.django_integration.middleware import assign_api_version
+from frameapp.ext.django_integration.url import django_url_patterns
+from frameapp.ext.django_integration.versioning import (
+    VersionArgument, django_versioned_url_patterns, split_version_segment,
+)
+
+from configuration import configure, resolution
+
+
+VERSION = 'v{version:[0-9]+\\.[0-9]+}'
+
+
+def users_v1(request, **kwargs):
+    return {'api': 1, **kwargs}
+
+
+def users_v2(request, **kwargs):
+    return {'api': 2, **kwargs}
+
+
+def legacy(request, **kwargs):
+    return {'legacy': True}
+
+
+def health(request, **kwargs):
+    return {'ok': True}
+
+
+@pytest.fixture(scope='module')
+def config():
+    return configure('versioned', [
+        ('health', '/health'),
+        ('users', f'/{VERSION}/users'),
+        ('user', f'/{VERSION}/users/{{user_id:\\d+}}'),
+        ('legacy', f'/{VERSION}/legacy'),
+    ], [
+        (health, {'route_name': 'health', 'request_method': 'GET'}),
+        (users_v1, {'route_name': 'users', 'request_method': 'GET', 'api_version': '<2.0'}),
+        (users_v2, {'route_name': 'users', 'request_method': 'GET', 'api_version': '>=2.0'}),
+        (users_v1, {'route_name': 'user', 'request_method': 'GET'}),
+        (legacy, {'route_name': 'legacy', 'request_method': 'GET', 'api_version': '<2.0'}),
+    ])
+
+
+PATHS = ['health', 'v1.0/users', 'v2.0/users/5', 'v1.0/users/x', 'v1/users', 'v3.5/legacy', 'v1.0/health']
+
+
+def test_versioned_resolver_agrees_with_linear_resolution(config):
+    linear = django_url_patterns('versioned', config)
+    versioned = django_versioned_url_patterns('versioned', config)
+    assert sum(isinstance(p, URLResolver) for p in versioned) == 1
+    for path in PATHS:
+        assert resolution(versioned, path) == resolution(linear, path), path
+
+
+def test_version_argument_carries_the_parsed_version(config):
+    resolver = URLResolver(RegexPattern('^'), django_versioned_url_patterns('versioned', config))
+    first = resolver.resolve('v1.0/users').kwargs['version']
+    assert isinstance(first, VersionArgument)
+    assert first == '1.0'
+    assert resolver.resolve('v1.0/users/1').kwargs['version'] is first
+    assert str(first.api_version) == '1.0'
+    assert resolver.reverse('versioned.user', version='2.0', user_id=3) == 'v2.0/users/3'
+
+
+def call(resolver, path):
+    match = resolver.resolve(path)
+    request = RequestFactory().get(f'/{path}')
+    assert assign_api_version(request, match.kwargs) is None
+    return json.loads(match.func(request, *match.args, **match.kwargs).content)
+
+
+def test_views_are_selected_by_version(config):
+    resolver = URLResolver(RegexPattern('^'), django_versioned_url_patterns('versioned', config, versions=['1.0']))
+    assert call(resolver, 'v1.0/users')['api'] == 1
+    assert call(resolver, 'v2.0/users')['api'] == 2
+
+
+def test_version_tables_contain_only_accepted_routes(config):
+    versioned = django_versioned_url_patterns('versioned', config, versions=['1.0', '2.0'])
+    assert resolution(versioned, 'v1.0/legacy') == ('versioned.legacy', {'version': '1.0'})
+    assert resolution(versioned, 'v2.0/legacy') is None
+    # unlisted versions are resolved with the complete table
+    assert resolution(versioned, 'v3.0/legacy') == ('versioned.legacy', {'version': '3.0'})
+
+
+def test_split_version_segment():
+    assert split_version_segment('/v{version}/users/{id}') == ('[^/]+', 'users/{id}')
+    assert split_version_segment(f'/{VERSION}/users') == ('[0-9]+\\.[0-9]+', 'users')
+    assert split_version_segment('/users/v{version}/x') is None
+    assert split_version_segment('/v{api}/users') is None
+
+
+def test_version_rules_must_agree():
+    config = configure('conflict', [('a', '/v{version:\\d+}/a'), ('b', '/v{version}/b')],
+                       [(health, {'route_name': 'a'}), (health, {'route_name': 'b'})])
+    with pytest.raises(ConfigurationError):
+        django_versioned_url_patterns('conflict', config)